@@ -0,0 +1,151 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from config import POOL
+
+
+class PoolExhausted(Exception):
+    """Усі з'єднання пулу зайняті довше, ніж acquire_timeout"""
+
+
+class ConnectionPool:
+    """Пул з'єднань з перевіркою життєздатності та перепідключенням з затримкою"""
+    def __init__(self, connect, ping, size: int, errors: tuple):
+        #   connect() відкриває нове з'єднання, ping(connection) перевіряє, чи воно живе
+        self.connect = connect
+        self.ping = ping
+        self.size = size
+        #   Помилки драйвера, при яких з'єднання вважається втраченим
+        self.errors = errors
+        self.idle = queue.LifoQueue()
+        self.created = 0
+        self.lock = threading.Lock()
+        #   Коли з'єднання востаннє використовувалось (видавалось чи поверталось у пул)
+        self.last_used = {}
+
+    def open(self):
+        """Відкриття нового з'єднання з повторними спробами та експоненційною затримкою"""
+        delay = POOL["backoff_initial"]
+        for attempt in range(POOL["retries"]):
+            try:
+                connection = self.connect()
+                self.last_used[id(connection)] = time.monotonic()
+                return connection
+            except self.errors:
+                if attempt + 1 == POOL["retries"]:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, POOL["backoff_max"])
+
+    def is_alive(self, connection):
+        """Перевірка з'єднання перед використанням; сервер опитується, якщо з'єднання простоювало
+        довше idle_ping_seconds (за цей час сервер міг його розірвати)"""
+        if connection is None:
+            return False
+        now = time.monotonic()
+        if now - self.last_used.get(id(connection), 0) > POOL["idle_ping_seconds"]:
+            try:
+                alive = self.ping(connection)
+            except self.errors:
+                alive = False
+            if not alive:
+                return False
+        self.last_used[id(connection)] = now
+        return True
+
+    def reconnect(self, connection):
+        """Заміна втраченого з'єднання новим; якщо нове не відкрилось, його місце в пулі звільняється"""
+        self.discard(connection, count=False)
+        try:
+            return self.open()
+        except self.errors:
+            with self.lock:
+                self.created -= 1
+            raise
+
+    def acquire(self, timeout=None):
+        """Отримати живе з'єднання з пулу (або відкрити нове, якщо пул ще не заповнений); якщо всі з'єднання
+        зайняті довше timeout (за замовчуванням acquire_timeout) секунд, виникає PoolExhausted"""
+        try:
+            connection = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                can_create = self.created < self.size
+                if can_create:
+                    self.created += 1
+            if can_create:
+                try:
+                    return self.open()
+                except self.errors:
+                    with self.lock:
+                        self.created -= 1
+                    raise
+            timeout = POOL["acquire_timeout"] if timeout is None else timeout
+            try:
+                connection = self.idle.get(timeout=timeout)
+            except queue.Empty:
+                raise PoolExhausted(
+                    f"No free database connection after {timeout} s: all {self.size} pool connections are in use"
+                ) from None
+        if not self.is_alive(connection):
+            connection = self.reconnect(connection)
+        return connection
+
+    def release(self, connection):
+        """Повернути з'єднання в пул"""
+        self.last_used[id(connection)] = time.monotonic()
+        self.idle.put(connection)
+
+    def discard(self, connection, count=True):
+        """Закрити з'єднання без повернення в пул"""
+        self.last_used.pop(id(connection), None)
+        try:
+            connection.close()
+        except self.errors:
+            pass
+        if count:
+            with self.lock:
+                self.created -= 1
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """З'єднання з пулу на час виконання блоку with"""
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        except BaseException:
+            try:
+                connection.rollback()
+            except self.errors:
+                #   Після втрати з'єднання його не можна повертати в пул
+                self.discard(connection)
+                raise
+            self.release(connection)
+            raise
+        self.release(connection)
+
+    @contextmanager
+    def dedicated(self):
+        """Окреме з'єднання поза пулом (для паралельних розділів міграції), закривається після блоку"""
+        connection = self.open()
+        try:
+            yield connection
+        except BaseException:
+            try:
+                connection.rollback()
+            except self.errors:
+                pass
+            raise
+        finally:
+            self.discard(connection, count=False)
+
+    def close_all(self):
+        """Закрити всі вільні з'єднання пулу"""
+        while True:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                return
+            self.discard(connection)
@@ -0,0 +1,25 @@
+import logging
+import sys
+
+#   Відповідність тегів логу рівням стандартного модуля logging
+LOG_LEVELS = {
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+
+
+class ConsoleLogger:
+    """Клас для логування в консоль під час роботи без графічного інтерфейсу"""
+    def __init__(self):
+        self.python_logger = logging.getLogger("database_app")
+
+    def log(self, message, tag="INFO"):
+        """Надрукувати текст в лог з відповідним тегом"""
+        self.python_logger.log(LOG_LEVELS.get(tag, logging.INFO), message)
+
+    def error_message_box(self, text, window_title="Error", should_abort=False):
+        """Надрукувати помилку в лог (аналог Message Box графічного інтерфейсу)"""
+        self.log(text, tag="ERROR")
+        if should_abort:
+            sys.exit(1)
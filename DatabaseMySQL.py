@@ -1,212 +1,561 @@
+import os
+import shutil
+import tempfile
+
 import mysql.connector as connector
 from mysql.connector import MySQLConnection
 
-from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QPushButton
-from PyQt5.QtCore import Qt
+from ConnectionPool import ConnectionPool
+from config import MIGRATION, VERIFICATION
+from converters import mysql_kind, parse_text, copy_text, FLOAT, TEXT
+from EditSession import parse_edits, parse_pasted_rows, find_failed_edit
+from filetransfer import export_file, open_rows, import_converter
+from utils import RowFilter, page_query, like_pattern, INDEXED_COLUMNS, SEARCH_COLUMNS
+from migration import iter_chunks, prefetch, run_migration
+from QueryStats import instrument
+from SchemaCatalog import schema_catalog, ColumnInfo, TableSchema
+from schemamigration import TableDefinition, IndexInfo, ForeignKeyInfo
+from verification import HASH_DIGITS
 
-from utils import is_number, sql_query_values, sql_query_field_names
-from Logger import Logger
+#   Коди помилок, коли LOAD DATA LOCAL INFILE заборонено сервером чи клієнтом
+LOCAL_INFILE_DISABLED = (1148, 2068, 3948)
 
 
 class DatabaseMySQL:
-    def __init__(self, host, user, password, database, table_widget: QTableWidget, logger: Logger):
+    def __init__(self, host, user, password, database, logger, pool_size=3):
         #   Ініціалізація змінних
-        self.fields = self.column_names = self.column_types = []
-        self.id_index = self.table_rows = self.table_columns = 0
-        self.editable = True
-        self.db: MySQLConnection | None = None
+        self.column_names = self.column_types = self.column_kinds = []
+        self.id_index = self.table_columns = 0
+        #   Чи створено повнотекстовий індекс для пошуку
+        self.has_text_index = False
+        self._db: MySQLConnection | None = None
+        self._cursor = None
         self.table_name = "internet_store_licenses"
-        self.tableWidget = table_widget
+        #   Logger інтерфейсу або ConsoleLogger командного рядка
         self.logger = logger
+        #   LOAD DATA LOCAL INFILE дозволено лише для файлів з цього тимчасового каталогу; connect не посилається
+        #   на self, щоб об'єкт не потрапив у цикл посилань і __del__ прибрав каталог
+        self.infile_dir = infile_dir = tempfile.mkdtemp(prefix="mysql_infile_")
         #   З'єднання з базою даних
-        self.connect(host=host, user=user, password=password, database=database)
-        self.cursor = self.db.cursor()
-        self.create_sql_table()
-        self.update_table_widget()
-        #   Обробка зміни комірки в таблиці
-        self.tableWidget.itemChanged.connect(self.update_field)
+        self.pool = ConnectionPool(
+            connect=lambda: instrument(
+                connector.connect(
+                    host=host, user=user, password=password, database=database,
+                    allow_local_infile_in_path=infile_dir
+                ),
+                "MySQL"
+            ),
+            ping=lambda db: db.is_connected(),
+            size=pool_size,
+            errors=(connector.Error,)
+        )
+        #   З'єднання відкривається у фоновому потоці (MainWindow) або під час першого звернення
+        self.host = host
+        #   Ключ БД у спільному кеші схем
+        self.source = f"MySQL {host}/{database}"
 
     def __del__(self):
-        """Закриття з'єднання"""
-        self.cursor.close()
-        self.db.close()
-
-    def connect(self, host, user, password, database):
-        """З'єднання з базою MySQL"""
-        try:
-            self.db = connector.connect(
-                host=host,
-                user=user,
-                password=password,
-                database=database,
-            )
-            self.logger.log(f"Successful connection to MySQL database on host {host}")
-        except connector.Error as error:
-            self.logger.error_message_box("MySQL connection error! " + error.msg, should_abort=True)
+        """Закриття з'єднань"""
+        if self._db is not None:
+            self.pool.release(self._db)
+        self.pool.close_all()
+        shutil.rmtree(self.infile_dir, ignore_errors=True)
+
+    def connect(self, task=None):
+        """З'єднання з базою MySQL та створення таблиці, якщо її ще немає (виконується у фоновому потоці,
+        тому помилки не показуються, а передаються викликачу)"""
+        #   Після невдалої спроби з'єднання могло вже бути відкрите (наприклад, не вдалося створити таблицю)
+        if self._db is None:
+            self._db = self.pool.acquire()
+            self._cursor = None
+        self.logger.log(f"Successful connection to MySQL database on host {self.host}")
+        self.create_sql_table()
+
+    @property
+    def db(self):
+        """З'єднання для редагування в інтерфейсі; відновлюється, якщо сервер його розірвав"""
+        if self._db is None:
+            self.connect()
+        elif not self.pool.is_alive(self._db):
+            self.logger.log("MySQL connection lost, reconnecting", tag="WARNING")
+            #   Якщо перепідключення не вдасться, наступне звернення візьме нове з'єднання з пулу
+            lost_db, self._db, self._cursor = self._db, None, None
+            self._db = self.pool.reconnect(lost_db)
+        return self._db
+
+    @property
+    def cursor(self):
+        """Курсор з'єднання для редагування в інтерфейсі"""
+        db = self.db
+        if self._cursor is None:
+            self._cursor = db.cursor()
+        return self._cursor
 
     def create_sql_table(self):
         """Створення таблиці, якщо вона ще не створена"""
+        self.cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table_name} (
+                id INT PRIMARY KEY AUTO_INCREMENT,
+                price INT NOT NULL,
+                count INT,
+                rating FLOAT,
+                program_name TEXT NOT NULL,
+                program_description TEXT,
+                license_expire_year YEAR,
+                is_unlimited_license BOOLEAN NOT NULL
+            )
+        """)
+        self.db.commit()
+        schema_catalog.invalidate(self.source, self.table_name)
+
+    def introspect(self, db=None):
+        """Читання стовпців (тип, NULL, первинний ключ) та індексів таблиці з information_schema"""
+        cursor = (db if db is not None else self.db).cursor()
         try:
-            self.cursor.execute(f"""
-                CREATE TABLE IF NOT EXISTS {self.table_name} (
-                    id INT PRIMARY KEY AUTO_INCREMENT,
-                    price INT NOT NULL,
-                    count INT,
-                    rating FLOAT,
-                    program_name TEXT NOT NULL,
-                    program_description TEXT,
-                    license_expire_year YEAR,
-                    is_unlimited_license BOOLEAN NOT NULL
-                )
+            cursor.execute(
+                "SELECT COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION",
+                (self.table_name,)
+            )
+            columns = [
+                ColumnInfo(name, mysql_kind(column_type), column_type, nullable == "YES", key == "PRI")
+                for name, column_type, nullable, key in cursor.fetchall()
+            ]
+        finally:
+            cursor.close()
+        return TableSchema(columns, self.read_index_names(db))
+
+    def schema(self, db=None) -> TableSchema:
+        """Схема таблиці зі спільного кешу; з БД читається лише після DDL чи явного оновлення"""
+        return schema_catalog.get(self.source, self.table_name, lambda: self.introspect(db))
+
+    def read_database_schema(self, db=None) -> [TableDefinition]:
+        """Описи всіх таблиць бази (стовпці, первинні ключі, індекси та зовнішні ключі) з information_schema"""
+        cursor = (db if db is not None else self.db).cursor()
+        try:
+            cursor.execute(
+                "SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE' ORDER BY TABLE_NAME"
+            )
+            estimated_rows = dict(cursor.fetchall())
+            cursor.execute(
+                "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, EXTRA, COLUMN_DEFAULT "
+                "FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() "
+                "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+            )
+            columns = {}
+            for table_name, name, column_type, nullable, key, extra, default in cursor.fetchall():
+                column_type = column_type.decode() if isinstance(column_type, bytes) else column_type
+                default = default.decode() if isinstance(default, bytes) else default
+                extra = (extra or "").lower()
+                if default is not None and "default_generated" in extra \
+                        and not default.upper().startswith(("CURRENT_TIMESTAMP", "NOW(")):
+                    self.logger.log(f"Default expression of {table_name}.{name} is not migrated: {default}",
+                                    tag="WARNING")
+                    default = None
+                columns.setdefault(table_name, []).append(ColumnInfo(
+                    name, mysql_kind(column_type), column_type, nullable == "YES", key == "PRI",
+                    auto_increment="auto_increment" in extra, default=default
+                ))
+            cursor.execute(
+                "SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SUB_PART, INDEX_TYPE "
+                "FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() "
+                "ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX"
+            )
+            primary_keys, indexes = {}, {}
+            for table_name, index_name, non_unique, column_name, sub_part, index_type in cursor.fetchall():
+                if index_name == "PRIMARY":
+                    primary_keys.setdefault(table_name, []).append(column_name)
+                elif index_type in ("FULLTEXT", "SPATIAL") or column_name is None:
+                    #   Повнотекстові індекси та індекси виразів не мають прямого відповідника
+                    self.logger.log(f"{index_type} index {table_name}.{index_name} is not migrated", tag="WARNING")
+                else:
+                    index = indexes.setdefault((table_name, index_name), IndexInfo(index_name, [], not non_unique, []))
+                    index.columns.append(column_name)
+                    index.prefix_lengths.append(sub_part)
+            cursor.execute("""
+                SELECT k.TABLE_NAME, k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_SCHEMA = DATABASE(),
+                       k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME, r.UPDATE_RULE, r.DELETE_RULE
+                FROM information_schema.KEY_COLUMN_USAGE k
+                JOIN information_schema.REFERENTIAL_CONSTRAINTS r
+                    ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME
+                    AND r.TABLE_NAME = k.TABLE_NAME
+                WHERE k.TABLE_SCHEMA = DATABASE() AND k.REFERENCED_TABLE_NAME IS NOT NULL
+                ORDER BY k.TABLE_NAME, k.CONSTRAINT_NAME, k.ORDINAL_POSITION
             """)
-            self.db.commit()
+            foreign_keys = {}
+            for table_name, name, column_name, same_database, referenced_table, referenced_column, on_update, \
+                    on_delete in cursor.fetchall():
+                if not same_database:
+                    self.logger.log(f"Foreign key {table_name}.{name} references another database and is not migrated",
+                                    tag="WARNING")
+                    continue
+                foreign_key = foreign_keys.setdefault(
+                    (table_name, name), ForeignKeyInfo(name, [], referenced_table, [], on_update, on_delete)
+                )
+                foreign_key.columns.append(column_name)
+                foreign_key.referenced_columns.append(referenced_column)
+        finally:
+            cursor.close()
+        return [
+            TableDefinition(
+                table_name,
+                TableSchema(columns.get(table_name, []), [name for table, name in indexes if table == table_name]),
+                primary_keys.get(table_name, []),
+                [index for (table, _), index in indexes.items() if table == table_name],
+                [foreign_key for (table, _), foreign_key in foreign_keys.items() if table == table_name],
+                table_rows
+            )
+            for table_name, table_rows in estimated_rows.items()
+        ]
+
+    def stream_rows(self, column_names, chunk_size, db=None, id_range=None):
+        """Потокове читання таблиці (або діапазону id [low, high)) порціями через небуферизований курсор"""
+        where, params = ("", ()) if id_range is None else (" WHERE id >= %s AND id < %s", tuple(id_range))
+        yield from self.stream_query(
+            f"SELECT {', '.join(column_names)} FROM {self.table_name}{where} ORDER BY id", params, chunk_size, db
+        )
+
+    def stream_table(self, table_name, column_names, chunk_size, db=None):
+        """Потокове читання будь-якої таблиці бази (міграція всієї схеми) в порядку зберігання"""
+        yield from self.stream_query(
+            f"SELECT {', '.join(f'`{name}`' for name in column_names)} FROM `{table_name}`", (), chunk_size, db
+        )
+
+    def stream_query(self, query, params, chunk_size, db=None):
+        """Порції результату запиту через небуферизований курсор"""
+        db = db if db is not None else self.db
+        cursor = db.cursor(buffered=False)
+        try:
+            cursor.execute(query, params)
+            yield from iter_chunks(cursor, chunk_size)
+        finally:
+            if db.unread_result:
+                #   Дочитування решти таблиці тривало б стільки ж, скільки сама міграція,
+                #   тому перерване з'єднання закривається, а пул замінить його новим
+                db.close()
+            else:
+                cursor.close()
+
+    def read_id_range(self, db=None):
+        """Найменший та найбільший id таблиці для поділу міграції на розділи"""
+        cursor = (db if db is not None else self.db).cursor()
+        try:
+            cursor.execute(f"SELECT MIN(id), MAX(id) FROM {self.table_name}")
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    def chunk_checksums(self, column_names, bucket_size, db=None):
+        """Кількість рядків та контрольна сума кожного блоку id (id DIV bucket_size), обчислені на сервері"""
+        row_text = ", ".join(f"IFNULL({name}, '\\\\N')" for name in column_names)
+        cursor = (db if db is not None else self.db).cursor()
+        try:
+            cursor.execute(f"""
+                SELECT id DIV %s AS bucket, COUNT(*),
+                       BIT_XOR(CAST(CONV(LEFT(MD5(CONCAT_WS('|', {row_text})), 16), 16, 10) AS UNSIGNED))
+                FROM {self.table_name}
+                GROUP BY bucket
+            """, (bucket_size,))
+            return {bucket: (count, str(checksum)) for bucket, count, checksum in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+    def range_checksums(self, column_names, kinds, low, high, step, db=None):
+        """Кількість рядків та сума хешів блоків по step id з діапазону [low, high) для перевірки копії;
+        рядок хешується так само, як у PostgreSQL та SQLite (verification.py)"""
+        scale = 10 ** VERIFICATION["float_digits"]
+        values = []
+        for name, kind in zip(column_names, kinds):
+            if kind == FLOAT:
+                value = f"CAST(ROUND({name} * {scale}) AS SIGNED)"
+            elif kind == TEXT:
+                value = name
+            else:
+                value = f"CAST({name} AS SIGNED)"
+            values.append(f"IFNULL({value}, '\\\\N')")
+        row_hash = f"CAST(CONV(LEFT(MD5(CONCAT_WS('|', {', '.join(values)})), {HASH_DIGITS}), 16, 10) AS UNSIGNED)"
+        cursor = (db if db is not None else self.db).cursor()
+        try:
+            cursor.execute(f"""
+                SELECT (id - %s) DIV %s AS bucket, COUNT(*), SUM({row_hash})
+                FROM {self.table_name}
+                WHERE id >= %s AND id < %s
+                GROUP BY bucket
+            """, (low, step, low, high))
+            return {bucket: (count, str(checksum)) for bucket, count, checksum in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+    def read_bucket(self, column_names, bucket, bucket_size, db=None):
+        """Усі рядки одного блоку id"""
+        return [
+            row for rows in self.stream_rows(
+                column_names, bucket_size, db, id_range=(bucket * bucket_size, (bucket + 1) * bucket_size)
+            ) for row in rows
+        ]
+
+    def estimate_row_count(self, db=None):
+        """Приблизна кількість рядків таблиці за статистикою сервера"""
+        cursor = (db if db is not None else self.db).cursor()
+        try:
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                (self.table_name,)
+            )
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        return row[0] if row and row[0] else None
+
+    def export_to_file(self, filename, task=None):
+        """Потоковий експорт таблиці у файл CSV чи NDJSON через небуферизований курсор"""
+        with self.pool.connection() as db:
+            if task is not None:
+                task.total_rows = self.estimate_row_count(db)
+            column_names = self.schema(db).column_names
+            stats = export_file(
+                filename,
+                column_names,
+                prefetch(self.stream_rows(column_names, MIGRATION["chunk_size"], db), MIGRATION["prefetch_chunks"]),
+                on_chunk=task.report if task is not None else None
+            )
+            #   Знімок, в якому читалась таблиця, більше не потрібен
+            db.rollback()
+        return stats
+
+    def import_from_file(self, filename, task=None):
+        """Відновлення таблиці з файлу CSV чи NDJSON через LOAD DATA LOCAL INFILE порціями; вміст таблиці
+        замінюється в одній транзакції, тож при помилці чи скасуванні залишається попередній"""
+        chunk_size = MIGRATION["chunk_size"]
+        chunk_filename = os.path.join(self.infile_dir, "chunk.tsv")
+        with self.pool.connection() as db, open_rows(filename, chunk_size) as (column_names, chunks):
+            convert = import_converter(filename, self.table_name, column_names, self.schema(db))
+            load_query = f"LOAD DATA LOCAL INFILE %s INTO TABLE {self.table_name} CHARACTER SET utf8mb4 " \
+                         f"({', '.join(column_names)})"
+            insert_query = f"INSERT INTO {self.table_name} ({', '.join(column_names)}) " \
+                           f"VALUES ({', '.join('%s' for _ in column_names)})"
+            cursor = db.cursor()
+            local_infile = True
+
+            def write_chunk(rows):
+                """Порція завантажується сервером з тимчасового файлу в текстовому форматі LOAD DATA;
+                якщо LOCAL INFILE вимкнено, решта порцій записується багаторядковими INSERT"""
+                nonlocal local_infile
+                if local_infile:
+                    with open(chunk_filename, "w", encoding="utf-8", newline="") as file:
+                        file.write(copy_text(rows))
+                    try:
+                        cursor.execute(load_query, (chunk_filename,))
+                        return
+                    except connector.Error as error:
+                        if error.errno not in LOCAL_INFILE_DISABLED:
+                            raise
+                        local_infile = False
+                        self.logger.log(f"LOAD DATA LOCAL INFILE is not allowed, using INSERT: {error}", tag="WARNING")
+                cursor.executemany(insert_query, rows)
+
+            try:
+                cursor.execute(f"DELETE FROM {self.table_name}")
+                #   Файл читається та розпаковується в окремому потоці, поки попередня порція завантажується
+                stats = run_migration(
+                    prefetch(chunks, MIGRATION["prefetch_chunks"]),
+                    write_chunk,
+                    on_chunk=task.report if task is not None else None,
+                    convert=convert
+                )
+                with stats.phase("commit"):
+                    db.commit()
+                stats.finish()
+            finally:
+                cursor.close()
+                if os.path.exists(chunk_filename):
+                    os.remove(chunk_filename)
+        return stats
+
+    def table_exists(self):
+        """Чи створено таблицю (інакше вкладка не завантажується)"""
+        try:
+            return self.schema().exists
         except connector.Error as error:
-            self.logger.error_message_box("MySQL error creating table! " + error.msg, should_abort=True)
-
-    def init_table_widget_axis(self):
-        """Ініціалізація назв комірок у таблиці"""
-        try:
-            self.cursor.execute(f"SHOW COLUMNS FROM {self.table_name}")
-            columns = self.cursor.fetchall()
-            self.column_names = [i[0] for i in columns]
-            self.column_types = [i[1] for i in columns]
-            self.table_columns = len(self.column_names)
-            self.tableWidget.setColumnCount(self.table_columns + 1)
-            header_labels = self.column_names.copy()
-            header_labels.append("")
-            self.tableWidget.setHorizontalHeaderLabels(header_labels)
-            self.cursor.execute(f"SELECT * FROM {self.table_name} LIMIT 100")
-            self.fields = self.cursor.fetchall()
-            self.table_rows = len(self.fields)
-            self.tableWidget.setRowCount(self.table_rows + 1)
-            self.id_index = self.column_names.index("id")
-            vertical_labels = ["" for _ in self.fields]
-            vertical_labels.append("New item:")
-            self.tableWidget.setVerticalHeaderLabels(vertical_labels)
+            self.logger.log(f"MySQL error checking table: {error}", tag="WARNING")
+            return False
+
+    def load_columns(self):
+        """Назви та типи стовпців таблиці зі спільного кешу схем"""
+        try:
+            schema = self.schema()
         except connector.Error as error:
             self.logger.error_message_box("MySQL error connecting table! " + error.msg)
+            return False
+        if not schema.exists:
+            self.logger.error_message_box(f"MySQL error connecting table! Table {self.table_name} doesn't exist")
+            return False
+        self.column_names, self.column_types, self.column_kinds = \
+            schema.column_names, schema.declared_types, schema.kinds
+        self.table_columns = len(self.column_names)
+        self.id_index = schema.id_index
+        self.has_text_index = f"{self.table_name}_text_idx" in schema.indexes
+        return True
 
-    def init_table_widget_fields(self):
-        """Заповнення таблиці значеннями"""
-        for i, field in enumerate(self.fields):
-            for j, value in enumerate(field):
-                table_widget_item = QTableWidgetItem(str(value))
-                table_widget_item.setTextAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-                self.tableWidget.setItem(i, j, table_widget_item)
-            delete_button = QPushButton("Delete item")
-            delete_button.clicked.connect(self.delete_field(field[self.id_index]))
-            self.tableWidget.setCellWidget(i, len(field), delete_button)
-
-    def init_table_widget_create_item(self):
-        """Створення додаткових кнопок в таблиці"""
-        add_button = QPushButton("Create item")
-        add_button.clicked.connect(self.create_field)
-        self.tableWidget.setCellWidget(self.table_rows, self.table_columns, add_button)
-        for i in range(self.table_columns):
-            if i == self.id_index:
-                table_widget_item = QTableWidgetItem("")
-            else:
-                table_widget_item = QTableWidgetItem()
-            table_widget_item.setTextAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-            self.tableWidget.setItem(self.table_rows, i, table_widget_item)
-
-    def update_table_widget(self):
-        """Оновити PyQt віджет для зображення бази даних"""
-        try:
-            self.editable = False
-            self.init_table_widget_axis()
-            self.init_table_widget_fields()
-            self.init_table_widget_create_item()
-            self.editable = True
+    def read_index_names(self, db=None):
+        """Назви індексів таблиці"""
+        cursor = (db if db is not None else self.db).cursor()
+        try:
+            cursor.execute(
+                "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                (self.table_name,)
+            )
+            return {row[0] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+    def create_search_indexes(self, task=None):
+        """Індекси для фільтрів і сортування та повнотекстовий ngram-індекс для пошуку підрядка"""
+        with schema_catalog.changing(self.source, self.table_name), self.pool.connection() as db:
+            index_names = self.read_index_names(db)
+            cursor = db.cursor()
+            try:
+                for field in INDEXED_COLUMNS:
+                    if f"{self.table_name}_{field}_idx" not in index_names:
+                        cursor.execute(f"CREATE INDEX {self.table_name}_{field}_idx ON {self.table_name} ({field}, id)")
+                if f"{self.table_name}_text_idx" not in index_names:
+                    cursor.execute(
+                        f"CREATE FULLTEXT INDEX {self.table_name}_text_idx "
+                        f"ON {self.table_name} ({', '.join(SEARCH_COLUMNS)}) WITH PARSER ngram"
+                    )
+            finally:
+                cursor.close()
+        self.has_text_index = True
+
+    def search_condition(self, text):
+        """Умова пошуку підрядка: через повнотекстовий індекс, якщо він є, інакше повним переглядом через LIKE"""
+        if self.has_text_index and len(text) >= 2:
+            phrase = '"' + text.replace('"', " ") + '"'
+            return f"MATCH({', '.join(SEARCH_COLUMNS)}) AGAINST (%s IN BOOLEAN MODE)", (phrase,)
+        pattern = like_pattern(text)
+        return " OR ".join(f"{field} LIKE %s ESCAPE '!'" for field in SEARCH_COLUMNS), (pattern,) * len(SEARCH_COLUMNS)
+
+    def fetch_page(self, after_row, limit, row_filter: RowFilter | None = None):
+        """Наступна сторінка рядків після заданого рядка з урахуванням фільтра та сортування"""
+        sql_query, params = page_query(
+            self.table_name, self.column_names, row_filter, after_row, limit, search_condition=self.search_condition
+        )
+        try:
+            self.cursor.execute(sql_query, params)
+            return self.cursor.fetchall()
         except connector.Error as error:
-            self.logger.error_message_box("MySQL error trying to update table! " + error.msg)
+            self.logger.error_message_box("MySQL error fetching table rows! " + error.msg)
+            return []
 
     def delete_field(self, field_id):
         """Видалення значення по id"""
-        def wrap_foo():
-            sql_query = f"DELETE FROM {self.table_name} WHERE id={field_id}"
-            self.cursor.execute(sql_query)
-            try:
-                self.cursor.execute(sql_query)
-                self.db.commit()
-                self.update_table_widget()
-                self.logger.log(f"Deleted MySQL field with id={field_id}")
-            except connector.Error as error:
-                self.logger.error_message_box("MySQL error trying to delete table item! " + error.msg)
-
-        return wrap_foo
-
-    @staticmethod
-    def str_to_mysql_typo(var, _):
-        """Конвертація значення змінної у MySQL вигляд"""
-        if var == "" or var is None or str(var).lower() == "null":
-            return "NULL"
-        if is_number(var):
-            return str(var)
-        return f'"{var}"'
-
-    def mysql_query_values(self, field_values, with_id_field=True):
-        """Повертає значення змінних в MySQL форматі"""
-        return sql_query_values(
-            field_values=field_values,
-            id_index=self.id_index,
-            str_to_sql_typo=self.str_to_mysql_typo,
-            with_id_field=with_id_field,
-            column_types=self.column_types
-        )
+        return self.delete_fields([field_id])
+
+    def delete_fields(self, field_ids):
+        """Видалення рядків за списком id одним DELETE ... WHERE id IN (...) в одній транзакції"""
+        chunk_size = MIGRATION["chunk_size"]
+        try:
+            #   Дуже довгий список id ділиться на порції, щоб не перевищити ліміт параметрів запиту
+            for start in range(0, len(field_ids), chunk_size):
+                chunk = field_ids[start:start + chunk_size]
+                self.cursor.execute(
+                    f"DELETE FROM {self.table_name} WHERE id IN ({', '.join('%s' for _ in chunk)})", chunk
+                )
+            self.db.commit()
+        except connector.Error as error:
+            self.db.rollback()
+            self.logger.error_message_box("MySQL error trying to delete table items! " + error.msg)
+            return False
+        if len(field_ids) == 1:
+            self.logger.log(f"Deleted MySQL field with id={field_ids[0]}")
+        else:
+            self.logger.log(f"Deleted {len(field_ids)} MySQL fields")
+        return True
 
-    def sql_query_field_names(self, with_id_field=False):
-        """Повертає назви змінних в MySQL форматі"""
-        sql_query = ""
-        for i, column_name in enumerate(self.column_names):
-            if not with_id_field and i == self.id_index:
-                continue
-            sql_query = sql_query + column_name
-            if not i + 1 == len(self.column_names):
-                sql_query = sql_query + ", "
-        return sql_query
-
-    def create_field(self):
-        """Створення нового елемента в БД"""
-        new_field_widgets = [self.tableWidget.item(self.table_rows, i) for i in range(self.table_columns)]
-        new_field_items = [field_widget.text() if field_widget else "" for field_widget in new_field_widgets]
+    def create_field(self, new_field_items):
+        """Створення нового елемента в БД; повертає створений рядок"""
         with_id_field = False if new_field_items[self.id_index] == "" else True
-        create_field_names = sql_query_field_names(
-            column_names=self.column_names,
-            id_index=self.id_index,
-            with_id_field=with_id_field
-        )
-        create_field_values = self.mysql_query_values(
-            field_values=new_field_items,
-            with_id_field=with_id_field
-        )
+        columns = [i for i in range(self.table_columns) if with_id_field or i != self.id_index]
+        try:
+            values = [parse_text(new_field_items[i], self.column_kinds[i]) for i in columns]
+        except ValueError as error:
+            self.logger.error_message_box(f"Invalid value for new MySQL item! {error}")
+            return None
         sql_query = f"INSERT {self.table_name}" \
-                    f"({create_field_names}) " \
-                    f"VALUES ({create_field_values});"
+                    f"({', '.join(self.column_names[i] for i in columns)}) " \
+                    f"VALUES ({', '.join('%s' for _ in columns)})"
         try:
-            self.cursor.execute(sql_query)
+            self.cursor.execute(sql_query, values)
             new_field_id = self.cursor.lastrowid
             self.db.commit()
-            self.update_table_widget()
+            #   Значення нового рядка зі значеннями за замовчуванням, встановленими сервером
+            self.cursor.execute(f"SELECT * FROM {self.table_name} WHERE id=%s", (new_field_id,))
+            new_field = self.cursor.fetchone()
             self.logger.log(f"Created MySQL new field with id={new_field_id}")
+            return new_field
         except connector.Error as error:
             self.logger.error_message_box("MySQL error trying to add table item! " + error.msg)
+            return None
 
-    def update_field(self, item: QTableWidgetItem):
-        """Оновлення значення в БД"""
-        if not self.editable:
-            return
-        row, column = item.row(), item.column()
-        #   Перевірка, чи змінена комірка частина БД
-        if row == self.table_rows or column == self.table_columns:
-            return
-        field = self.column_names[column]
-        field_id = self.fields[row][self.id_index]
-        new_value = self.str_to_mysql_typo(item.text(), None)
-        try:
-            self.cursor.execute(f"UPDATE {self.table_name} SET {field}={new_value} WHERE id={field_id}")
+    def create_fields(self, pasted_text):
+        """Вставка рядків, скопійованих як TSV чи CSV, одним багаторядковим INSERT в одній транзакції;
+        повертає кількість вставлених рядків або None, якщо нічого не вставлено"""
+        columns, rows, errors = parse_pasted_rows(pasted_text, self.column_names, self.column_kinds, self.id_index)
+        if errors:
+            self.logger.error_message_box("Invalid pasted MySQL rows, nothing inserted!\n" + "\n".join(errors))
+            return None
+        if not rows:
+            return None
+        sql_query = f"INSERT INTO {self.table_name} ({', '.join(self.column_names[i] for i in columns)}) " \
+                    f"VALUES ({', '.join('%s' for _ in columns)})"
+        try:
+            #   executemany об'єднує рядки в один INSERT ... VALUES (...), (...)
+            self.cursor.executemany(sql_query, rows)
             self.db.commit()
-            self.logger.log(f"Updated MySQL cell {field} with id {field_id}. New value is {new_value}")
         except connector.Error as error:
-            self.logger.error_message_box("MySQL error trying to delete table item! " + error.msg)
-        self.update_table_widget()
+            self.db.rollback()
+            self.logger.error_message_box("MySQL error trying to add pasted table items! " + error.msg)
+            return None
+        self.logger.log(f"Created {len(rows)} MySQL fields from clipboard")
+        return len(rows)
+
+    def update_field(self, field, column, value):
+        """Оновлення значення в БД; повертає оновлений рядок або None при помилці"""
+        updated_fields = self.update_fields([(field, column, value)])
+        return updated_fields[0] if updated_fields else None
+
+    def update_fields(self, edits):
+        """Запис змінених комірок [(рядок, стовпець, текст)] однією транзакцією;
+        повертає оновлені рядки або None, якщо всі зміни відкочено"""
+        statements, field_ids, errors = parse_edits(edits, self.column_names, self.column_kinds, self.id_index)
+        if errors:
+            self.logger.error_message_box("Invalid values for MySQL cells, no changes saved!\n" + "\n".join(errors))
+            return None
+        try:
+            for field_name, params in statements:
+                self.cursor.executemany(f"UPDATE {self.table_name} SET {field_name}=%s WHERE id=%s", params)
+            #   Значення рядків після змін разом з перетвореннями, виконаними сервером
+            self.cursor.execute(
+                f"SELECT * FROM {self.table_name} WHERE id IN ({', '.join('%s' for _ in field_ids)}) ORDER BY id",
+                field_ids
+            )
+            updated_fields = self.cursor.fetchall()
+            self.db.commit()
+        except connector.Error as error:
+            self.db.rollback()
+            failed_edit = find_failed_edit(
+                statements,
+                lambda field_name, value, field_id: self.cursor.execute(
+                    f"UPDATE {self.table_name} SET {field_name}=%s WHERE id=%s", (value, field_id)
+                ),
+                connector.Error
+            )
+            self.db.rollback()
+            self.logger.error_message_box(
+                f"MySQL error trying to update table items, all changes rolled back! {failed_edit or error.msg}"
+            )
+            return None
+        self.logger.log(f"Updated {len(edits)} MySQL cells in {len(field_ids)} rows")
+        return updated_fields
@@ -1,168 +1,784 @@
+import io
 import psycopg2
 import re
-from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QLineEdit
-from Logger import Logger
+from psycopg2.extras import execute_values, execute_batch
 from DatabaseMySQL import DatabaseMySQL
-from utils import sql_query_values, is_number
-from PyQt5.QtCore import Qt
+from QueryStats import instrument
+from SchemaCatalog import schema_catalog, ColumnInfo, TableSchema
+from config import MIGRATION, VERIFICATION
+from ConnectionPool import ConnectionPool
+from EditSession import parse_edits, find_failed_edit
+from migration import run_migration, run_partitioned, run_sync, changed_buckets, split_id_range, iter_chunks, prefetch, \
+    pushed_chunks, LineChunkWriter, ConsumerStopped, UNKNOWN_CHECKSUM
+from converters import postgresql_kind, build_plan, convert_rows, parse_text, copy_line_parser, copy_text, \
+    FLOAT, TEXT, BOOLEAN
+from filetransfer import export_file, open_rows, import_converter
+from schemamigration import dependency_order, quote_identifier, postgresql_create_table, postgresql_index_statements, \
+    postgresql_foreign_key_statements, postgresql_sequence_statements
+from verification import HASH_DIGITS, VerificationStats, verify_kind, verify_ranges, combined_id_range
+from utils import RowFilter, page_query, like_pattern, INDEXED_COLUMNS, SEARCH_COLUMNS
 
 
 class DatabasePostgreSQL:
-    def __init__(self, host, user, password, database, logger: Logger, table_widget: QTableWidget):
+    def __init__(self, host, user, password, database, logger, pool_size=3):
         #   Ініціалізація змінних
-        self.tableWidget = table_widget
         self.table_name = "internet_store_licenses"
-        self.editable = True
-        self.column_names = self.fields = self.column_types = []
-        self.id_index = self.table_columns = self.table_rows = 0
+        self.column_names = self.column_kinds = []
+        self.id_index = self.table_columns = 0
         self.logger = logger
-        self.db: None | psycopg2.connection = None
+        self._db: None | psycopg2.connection = None
+        self._cursor = None
         #   З'єднання з базою даних
-        self.connect(host, user, password, database)
-        self.cursor = self.db.cursor()
-        #   Обробка зміни комірки в таблиці
-        self.tableWidget.itemChanged.connect(self.update_field)
+        self.pool = ConnectionPool(
+            connect=lambda: instrument(
+                psycopg2.connect(host=host, user=user, password=password, database=database), "PostgreSQL"
+            ),
+            ping=self.ping,
+            size=pool_size,
+            errors=(psycopg2.DatabaseError, psycopg2.InterfaceError)
+        )
+        #   З'єднання відкривається у фоновому потоці (MainWindow) або під час першого звернення
+        self.host = host
+        #   Ключ БД у спільному кеші схем
+        self.source = f"PostgreSQL {host}/{database}"
+
+    def __del__(self):
+        """Закриття з'єднань"""
+        if self._db is not None:
+            self.pool.release(self._db)
+        self.pool.close_all()
+
+    def connect(self, task=None):
+        """З'єднання з базою PostgreSQL (виконується у фоновому потоці, помилки передаються викликачу)"""
+        #   Після невдалої спроби з'єднання могло вже бути відкрите (наприклад, не вдалося створити таблицю)
+        if self._db is None:
+            self._db = self.pool.acquire()
+            self._cursor = None
+        self.logger.log(f"Successful connection to PostgreSQL database on host {self.host}")
+
+    @staticmethod
+    def ping(db):
+        """Перевірка, що з'єднання живе"""
+        if db.closed:
+            return False
+        #   Не перериваємо незавершену транзакцію, сервер опитуємо лише з вільного з'єднання
+        if db.status != psycopg2.extensions.STATUS_READY:
+            return True
+        with db.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        db.rollback()
+        return True
 
-    def connect(self, host, user, password, database):
-        """З'єднання з базою PostgreSQL"""
+    @property
+    def db(self):
+        """З'єднання для редагування в інтерфейсі; відновлюється, якщо сервер його розірвав"""
+        if self._db is None:
+            self.connect()
+        elif not self.pool.is_alive(self._db):
+            self.logger.log("PostgreSQL connection lost, reconnecting", tag="WARNING")
+            #   Якщо перепідключення не вдасться, наступне звернення візьме нове з'єднання з пулу
+            lost_db, self._db, self._cursor = self._db, None, None
+            self._db = self.pool.reconnect(lost_db)
+        return self._db
+
+    @property
+    def cursor(self):
+        """Курсор з'єднання для редагування в інтерфейсі"""
+        db = self.db
+        if self._cursor is None:
+            self._cursor = db.cursor()
+        return self._cursor
+
+    def introspect(self, db=None):
+        """Читання стовпців (тип, NOT NULL, первинний ключ) та індексів таблиці з каталогу PostgreSQL"""
+        db = db if db is not None else self.db
+        cursor = db.cursor()
         try:
-            self.db = psycopg2.connect(
-                host=host,
-                user=user,
-                password=password,
-                database=database,
-            )
-            self.logger.log(f"Successful connection to PostgreSQL database on host {host}")
+            cursor.execute("""
+                SELECT a.attname, a.atttypid::int, format_type(a.atttypid, a.atttypmod), a.attnotnull,
+                       COALESCE(a.attnum = ANY(i.indkey), FALSE)
+                FROM pg_attribute a
+                LEFT JOIN pg_index i ON i.indrelid = a.attrelid AND i.indisprimary
+                WHERE a.attrelid = to_regclass(%s) AND a.attnum > 0 AND NOT a.attisdropped
+                ORDER BY a.attnum
+            """, (self.table_name,))
+            columns = [
+                ColumnInfo(name, postgresql_kind(type_oid), declared_type, not not_null, primary_key)
+                for name, type_oid, declared_type, not_null, primary_key in cursor.fetchall()
+            ]
+            cursor.execute("""
+                SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE i.indrelid = to_regclass(%s)
+            """, (self.table_name,))
+            indexes = [row[0] for row in cursor.fetchall()]
+            db.commit()
+        finally:
+            cursor.close()
+        return TableSchema(columns, indexes)
+
+    def schema(self, db=None) -> TableSchema:
+        """Схема таблиці зі спільного кешу; з БД читається лише після DDL чи явного оновлення"""
+        return schema_catalog.get(self.source, self.table_name, lambda: self.introspect(db))
+
+    def table_exists(self):
+        """Чи створено таблицю (до першої міграції її немає, і вкладка не завантажується)"""
+        try:
+            return self.schema().exists
         except psycopg2.DatabaseError as error:
-            self.logger.error_message_box(f"Error trying to connect to PostgreSQL! {error}", should_abort=True)
+            self.db.rollback()
+            self.logger.log(f"PostgreSQL error checking table: {error}", tag="WARNING")
+            return False
 
-    def init_table_widget_axis(self):
-        """Ініціалізація назв комірок у таблиці"""
+    def load_columns(self):
+        """Назви та типи стовпців таблиці зі спільного кешу схем"""
         try:
-            self.cursor.execute(f"SELECT * FROM {self.table_name} LIMIT 0")
-            self.column_names = [i[0] for i in self.cursor.description]
-            self.table_columns = len(self.column_names)
-            self.tableWidget.setColumnCount(self.table_columns)
-            self.tableWidget.setHorizontalHeaderLabels(self.column_names)
-            self.cursor.execute(f"SELECT * FROM {self.table_name} LIMIT 100")
-            self.fields = self.cursor.fetchall()
-            self.table_rows = len(self.fields)
-            self.tableWidget.setRowCount(self.table_rows)
-            self.id_index = self.column_names.index("id")
-            self.tableWidget.setVerticalHeaderLabels("" for _ in self.fields)
+            schema = self.schema()
         except psycopg2.DatabaseError as error:
             self.logger.error_message_box(f"PostgreSQL error connecting table! {error}")
             self.db.rollback()
+            return False
+        if not schema.exists:
+            self.logger.error_message_box(f"PostgreSQL error connecting table! Table {self.table_name} doesn't exist")
+            return False
+        self.column_names = schema.column_names
+        self.column_kinds = schema.kinds
+        self.table_columns = len(self.column_names)
+        self.id_index = schema.id_index
+        return True
 
-    def init_table_widget_fields(self):
-        """Заповнення таблиці значеннями"""
-        for i, field in enumerate(self.fields):
-            for j, value in enumerate(field):
-                table_widget_item = QTableWidgetItem(str(value))
-                table_widget_item.setTextAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-                self.tableWidget.setItem(i, j, table_widget_item)
+    def search_condition(self, text):
+        """Умова пошуку підрядка; ILIKE використовує триграмний індекс, якщо він створений"""
+        pattern = like_pattern(text)
+        return " OR ".join(f"{field} ILIKE %s ESCAPE '!'" for field in SEARCH_COLUMNS), (pattern,) * len(SEARCH_COLUMNS)
 
-    def update_table_widget(self):
-        """Оновити PyQt віджет для зображення бази даних"""
+    def fetch_page(self, after_row, limit, row_filter: RowFilter | None = None):
+        """Наступна сторінка рядків після заданого рядка з урахуванням фільтра та сортування"""
+        sql_query, params = page_query(
+            self.table_name, self.column_names, row_filter, after_row, limit,
+            search_condition=self.search_condition, nulls_low=False
+        )
         try:
-            self.editable = False
-            self.init_table_widget_axis()
-            self.init_table_widget_fields()
-            self.editable = True
+            self.cursor.execute(sql_query, params)
+            rows = self.cursor.fetchall()
+            self.db.commit()
+            return rows
         except psycopg2.DatabaseError as error:
-            self.logger.error_message_box(f"PostgreSQL error trying to update table! {error}")
+            self.logger.error_message_box(f"PostgreSQL error fetching table rows! {error}")
             self.db.rollback()
+            return []
+
+    def create_indexes(self, cursor):
+        """Індекси для фільтрів і сортування та триграмний індекс для пошуку, якщо встановлено pg_trgm"""
+        for field in INDEXED_COLUMNS:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table_name}_{field}_idx ON {self.table_name} ({field}, id)"
+            )
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone() is not None:
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS {self.table_name}_text_idx ON {self.table_name}
+                USING gin ({', '.join(f"{field} gin_trgm_ops" for field in SEARCH_COLUMNS)})
+            """)
+
+    def create_search_indexes(self, task=None):
+        """Встановлення pg_trgm (потрібні права на CREATE EXTENSION) та створення індексів пошуку"""
+        with schema_catalog.changing(self.source, self.table_name), self.pool.connection() as db:
+            cursor = db.cursor()
+            try:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            except psycopg2.DatabaseError as error:
+                db.rollback()
+                self.logger.log(f"pg_trgm is not available, text search will scan the table: {error}", tag="WARNING")
+            self.create_indexes(cursor)
+            db.commit()
+
+    def stream_rows(self, column_names, chunk_size, db=None, id_range=None):
+        """Потокове читання таблиці (або діапазону id [low, high)) порціями через іменований (серверний) курсор"""
+        db = db if db is not None else self.db
+        cursor = db.cursor(name=f"{self.table_name}_stream")
+        cursor.itersize = chunk_size
+        where, params = ("", ()) if id_range is None else (" WHERE id >= %s AND id < %s", tuple(id_range))
+        try:
+            cursor.execute(f"SELECT {', '.join(column_names)} FROM {self.table_name}{where} ORDER BY id", params)
+            yield from iter_chunks(cursor, chunk_size)
+        finally:
+            cursor.close()
+            #   Завершення транзакції, в якій жив серверний курсор
+            db.commit()
+
+    def copy_rows(self, column_names, chunk_size, db=None, id_range=None):
+        """Потокове читання лише потрібних стовпців через COPY (SELECT ...) TO STDOUT порціями кортежів"""
+        db = db if db is not None else self.db
+        parse_line = copy_line_parser(self.schema(db).kinds_of(column_names))
+        cursor = db.cursor()
+        where, params = ("", ()) if id_range is None else (" WHERE id >= %s AND id < %s", tuple(id_range))
+        #   COPY не приймає параметрів, тож значення діапазону підставляються через mogrify
+        select = cursor.mogrify(f"SELECT {', '.join(column_names)} FROM {self.table_name}{where} ORDER BY id", params)
+        copy_query = f"COPY ({select.decode()}) TO STDOUT"
+
+        def produce(emit):
+            """copy_expert сам надсилає текст у файл, тож рядки розбираються та передаються порціями"""
+            writer = LineChunkWriter(parse_line, chunk_size, emit)
+            try:
+                cursor.copy_expert(copy_query, writer, size=1 << 16)
+                writer.emit_rest()
+                db.commit()
+            except psycopg2.DatabaseError:
+                db.rollback()
+                raise
+            except ConsumerStopped:
+                #   COPY не можна перервати посередині, тож з'єднання закривається і пул замінить його
+                db.close()
+                raise
+            finally:
+                cursor.close()
+
+        yield from pushed_chunks(produce, MIGRATION["prefetch_chunks"])
+
+    def read_id_range(self, db=None):
+        """Найменший та найбільший id таблиці для поділу міграції на розділи"""
+        db = db if db is not None else self.db
+        cursor = db.cursor()
+        try:
+            cursor.execute(f"SELECT MIN(id), MAX(id) FROM {self.table_name}")
+            id_range = cursor.fetchone()
+            db.commit()
+        finally:
+            cursor.close()
+        return id_range
+
+    def chunk_checksums(self, column_names, bucket_size, db=None):
+        """Кількість рядків та контрольна сума кожного блоку id (id / bucket_size), обчислені на сервері"""
+        db = db if db is not None else self.db
+        cursor = db.cursor()
+        try:
+            cursor.execute(f"""
+                SELECT id / %s AS bucket, COUNT(*),
+                       SUM(('x' || LEFT(MD5(CAST(ROW({', '.join(column_names)}) AS TEXT)), 16))::BIT(64)::BIGINT)
+                FROM {self.table_name}
+                GROUP BY bucket
+            """, (bucket_size,))
+            checksums = {bucket: (count, str(checksum)) for bucket, count, checksum in cursor.fetchall()}
+            db.commit()
+        finally:
+            cursor.close()
+        return checksums
+
+    def range_checksums(self, column_names, kinds, low, high, step, db=None):
+        """Кількість рядків та сума хешів блоків по step id з діапазону [low, high) для перевірки копії;
+        рядок хешується так само, як у MySQL та SQLite (verification.py)"""
+        db = db if db is not None else self.db
+        scale = 10 ** VERIFICATION["float_digits"]
+        schema = self.schema(db)
+        values = []
+        for name, kind in zip(column_names, kinds):
+            if kind == FLOAT:
+                value = f"ROUND({name}::float8 * {scale})::bigint"
+            elif kind == TEXT or schema.column(name).kind != BOOLEAN:
+                value = name
+            else:
+                value = f"{name}::int"
+            values.append(f"COALESCE({value}::text, '\\N')")
+        row_hash = f"('x' || LEFT(md5(concat_ws('|', {', '.join(values)})), {HASH_DIGITS}))::bit({HASH_DIGITS * 4})::bigint"
+        cursor = db.cursor()
+        try:
+            cursor.execute(f"""
+                SELECT (id - %s) / %s AS bucket, COUNT(*), SUM({row_hash})
+                FROM {self.table_name}
+                WHERE id >= %s AND id < %s
+                GROUP BY bucket
+            """, (low, step, low, high))
+            checksums = {bucket: (count, str(checksum)) for bucket, count, checksum in cursor.fetchall()}
+            db.commit()
+        finally:
+            cursor.close()
+        return checksums
+
+    def read_bucket(self, column_names, bucket, bucket_size, db=None):
+        """Усі рядки одного блоку id"""
+        return [
+            row for rows in self.copy_rows(
+                column_names, bucket_size, db, id_range=(bucket * bucket_size, (bucket + 1) * bucket_size)
+            ) for row in rows
+        ]
+
+    def estimate_row_count(self, db=None):
+        """Приблизна кількість рядків таблиці за статистикою сервера"""
+        db = db if db is not None else self.db
+        cursor = db.cursor()
+        try:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)", (self.table_name,))
+            row = cursor.fetchone()
+            db.commit()
+        finally:
+            cursor.close()
+        return row[0] if row and row[0] > 0 else None
+
+    def create_table(self, cursor, table_name):
+        """Створення порожньої таблиці для міграції з MySQL"""
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                    id SERIAL PRIMARY KEY,
+                    price INT NOT NULL,
+                    count INT,
+                    rating FLOAT,
+                    program_name TEXT NOT NULL,
+                    program_description TEXT,
+                    license_expire_year INT,
+                    is_unlimited_license BOOLEAN NOT NULL
+                )
+        """)
+
+    def build_migration_plan(self, cursor, table_name, column_names, source_kinds):
+        """План перетворень будується один раз за видами стовпців джерела та щойно створеної таблиці;
+        tinyint(1) MySQL приходить цілими 0 та 1, а boolean PostgreSQL їх не приймає"""
+        cursor.execute(f"SELECT {', '.join(column_names)} FROM {table_name} LIMIT 0")
+        return build_plan(source_kinds, [postgresql_kind(i[1]) for i in cursor.description], integer_booleans=True)
+
+    def reset_id_sequence(self, cursor):
+        """Послідовність id має продовжуватись після перенесених значень"""
+        cursor.execute(f"""
+            SELECT setval(pg_get_serial_sequence('{self.table_name}', 'id'),
+                          COALESCE(MAX(id), 1), MAX(id) IS NOT NULL)
+            FROM {self.table_name}
+        """)
+
+    def create_sync_tables(self, cursor):
+        """Таблиці стану інкрементної синхронізації: параметри та контрольні суми синхронізованих блоків id"""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                table_name TEXT PRIMARY KEY,
+                bucket_size BIGINT NOT NULL,
+                columns TEXT NOT NULL,
+                high_water_id BIGINT
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_checkpoints (
+                table_name TEXT NOT NULL,
+                bucket BIGINT NOT NULL,
+                row_count BIGINT NOT NULL,
+                checksum TEXT NOT NULL,
+                PRIMARY KEY (table_name, bucket)
+            )
+        """)
+
+    def clear_sync_state(self, cursor):
+        """Скидання стану синхронізації після повної міграції"""
+        self.create_sync_tables(cursor)
+        cursor.execute("DELETE FROM sync_checkpoints WHERE table_name = %s", (self.table_name,))
+        cursor.execute("DELETE FROM sync_state WHERE table_name = %s", (self.table_name,))
+
+    def read_checkpoints(self, cursor, column_names, bucket_size):
+        """Контрольні суми попередньої синхронізації; якщо її параметри інші, стан скидається, а блоки,
+        вже наявні в таблиці, позначаються як невідомі, щоб видалені з джерела рядки теж прибрались"""
+        cursor.execute("SELECT bucket_size, columns FROM sync_state WHERE table_name = %s", (self.table_name,))
+        state = cursor.fetchone()
+        if state == (bucket_size, ",".join(column_names)):
+            cursor.execute(
+                "SELECT bucket, row_count, checksum FROM sync_checkpoints WHERE table_name = %s", (self.table_name,)
+            )
+            return {bucket: (row_count, checksum) for bucket, row_count, checksum in cursor.fetchall()}
+        if state is not None:
+            self.logger.log(
+                f"Sync state of {self.table_name} was saved with bucket size {state[0]} and columns {state[1]}, "
+                f"resetting it: the whole table is synchronized again", tag="WARNING"
+            )
+        self.clear_sync_state(cursor)
+        cursor.execute(
+            "INSERT INTO sync_state (table_name, bucket_size, columns) VALUES (%s, %s, %s)",
+            (self.table_name, bucket_size, ",".join(column_names))
+        )
+        cursor.execute(f"SELECT DISTINCT id / %s FROM {self.table_name}", (bucket_size,))
+        return {bucket: UNKNOWN_CHECKSUM for bucket, in cursor.fetchall()}
+
+    def save_checkpoint(self, cursor, bucket, checksum, bucket_size):
+        """Запис контрольної суми синхронізованого блоку (None - блок видалено з джерела)"""
+        if checksum is None:
+            cursor.execute(
+                "DELETE FROM sync_checkpoints WHERE table_name = %s AND bucket = %s", (self.table_name, bucket)
+            )
+        else:
+            cursor.execute("""
+                INSERT INTO sync_checkpoints (table_name, bucket, row_count, checksum) VALUES (%s, %s, %s, %s)
+                ON CONFLICT (table_name, bucket) DO UPDATE SET row_count = EXCLUDED.row_count,
+                                                               checksum = EXCLUDED.checksum
+            """, (self.table_name, bucket, *checksum))
+        cursor.execute(
+            "UPDATE sync_state SET high_water_id = GREATEST(COALESCE(high_water_id, 0), %s) WHERE table_name = %s",
+            ((bucket + 1) * bucket_size - 1, self.table_name)
+        )
+
+    def sync_from_mysql(self, mysql_db: DatabaseMySQL, task=None):
+        """Інкрементна синхронізація з MySQL: переносяться лише нові, змінені та видалені рядки"""
+        bucket_size = MIGRATION["sync_bucket_size"]
+        with schema_catalog.changing(self.source, self.table_name), \
+                self.pool.connection() as db, mysql_db.pool.connection() as source_db:
+            cursor = db.cursor()
+            source_schema = mysql_db.schema(source_db)
+            column_names = source_schema.column_names
+            id_position = column_names.index("id")
+            self.create_table(cursor, self.table_name)
+            self.create_indexes(cursor)
+            self.create_sync_tables(cursor)
+            checkpoints = self.read_checkpoints(cursor, column_names, bucket_size)
+            plan = self.build_migration_plan(cursor, self.table_name, column_names, source_schema.kinds)
+            db.commit()
+            #   Контрольні суми блоків обчислює сервер, по мережі передаються лише змінені блоки
+            source_checksums = mysql_db.chunk_checksums(column_names, bucket_size, source_db)
+            buckets = changed_buckets(source_checksums, checkpoints)
+            if task is not None:
+                task.total_rows = sum(source_checksums[bucket][0] for bucket in buckets if bucket in source_checksums)
+            upsert_query = f"""
+                INSERT INTO {self.table_name} ({', '.join(column_names)}) VALUES %s
+                ON CONFLICT (id) DO UPDATE SET {', '.join(f"{name} = EXCLUDED.{name}" for name in column_names)}
+            """
+
+            def read_bucket(bucket):
+                """Рядки блоку з MySQL; знімок завершується після кожного блоку, щоб не тримати довгу транзакцію"""
+                rows = mysql_db.read_bucket(column_names, bucket, bucket_size, source_db)
+                source_db.rollback()
+                return rows
+
+            def apply_bucket(bucket, rows):
+                """Вставка та оновлення рядків блоку, видалення відсутніх у джерелі, запис контрольної точки"""
+                cursor.execute(
+                    f"SELECT id FROM {self.table_name} WHERE id >= %s AND id < %s",
+                    (bucket * bucket_size, (bucket + 1) * bucket_size)
+                )
+                deleted_ids = {row[0] for row in cursor.fetchall()} - {row[id_position] for row in rows}
+                if rows:
+                    execute_values(cursor, upsert_query, rows, page_size=bucket_size)
+                if deleted_ids:
+                    cursor.execute(f"DELETE FROM {self.table_name} WHERE id = ANY(%s)", (list(deleted_ids),))
+                self.save_checkpoint(cursor, bucket, source_checksums.get(bucket), bucket_size)
+                db.commit()
+
+            stats = run_sync(
+                buckets, read_bucket, apply_bucket,
+                on_chunk=task.report if task is not None else None,
+                convert=lambda rows: convert_rows(rows, plan)
+            )
+            self.reset_id_sequence(cursor)
+            db.commit()
+            source_db.rollback()
+        return stats
+
+    def migrate_from_mysql(self, mysql_db: DatabaseMySQL, task=None):
+        """Міграція з MySQL; при помилці чи скасуванні транзакція відкочується разом з DROP TABLE"""
+        if MIGRATION["parallel_workers"] > 1:
+            return self.migrate_from_mysql_partitioned(mysql_db, task)
+        chunk_size = MIGRATION["chunk_size"]
+        #   Фонова міграція працює на окремих з'єднаннях, не заважаючи редагуванню в інтерфейсі
+        with schema_catalog.changing(self.source, self.table_name), \
+                self.pool.connection() as db, mysql_db.pool.connection() as source_db:
+            cursor = db.cursor()
+            source_schema = mysql_db.schema(source_db)
+            column_names = source_schema.column_names
+            if task is not None:
+                task.total_rows = mysql_db.estimate_row_count(source_db)
+            #   Очистити таблицю перед міграцією
+            cursor.execute(f"DROP TABLE IF EXISTS {self.table_name}")
+            #   Створення порожньої таблиці
+            self.create_table(cursor, self.table_name)
+            self.clear_sync_state(cursor)
+            plan = self.build_migration_plan(cursor, self.table_name, column_names, source_schema.kinds)
+            insert_query = f"INSERT INTO {self.table_name} ({', '.join(column_names)}) VALUES %s"
+
+            def write_chunk(rows):
+                """Запис порції рядків одним багаторядковим INSERT"""
+                execute_values(cursor, insert_query, rows, page_size=chunk_size)
+
+            stats = run_migration(
+                prefetch(mysql_db.stream_rows(column_names, chunk_size, source_db), MIGRATION["prefetch_chunks"]),
+                write_chunk,
+                on_chunk=task.report if task is not None else None,
+                convert=lambda rows: convert_rows(rows, plan)
+            )
+            self.reset_id_sequence(cursor)
+            #   Індекси будуються вже після завантаження даних
+            with stats.phase("index"):
+                self.create_indexes(cursor)
+            with stats.phase("commit"):
+                db.commit()
+            stats.finish()
+            #   Знімок MySQL, в якому читалась таблиця, більше не потрібен
+            source_db.rollback()
+        return stats
+
+    def migrate_from_mysql_partitioned(self, mysql_db: DatabaseMySQL, task=None):
+        """Паралельна міграція з MySQL діапазонами id у проміжну таблицю, яка після успіху замінює основну"""
+        chunk_size = MIGRATION["chunk_size"]
+        workers = MIGRATION["parallel_workers"]
+        staging_table = f"{self.table_name}_migration"
+        with schema_catalog.changing(self.source, self.table_name), \
+                self.pool.connection() as db, mysql_db.pool.connection() as source_db:
+            cursor = db.cursor()
+            source_schema = mysql_db.schema(source_db)
+            column_names = source_schema.column_names
+            if task is not None:
+                task.total_rows = mysql_db.estimate_row_count(source_db)
+            #   Розділів більше, ніж потоків, щоб нерівномірно заповнені діапазони id не гальмували міграцію
+            ranges = split_id_range(*mysql_db.read_id_range(source_db), workers * MIGRATION["partitions_per_worker"])
+            source_db.rollback()
+            #   Проміжна таблиця фіксується одразу, щоб її бачили з'єднання всіх розділів
+            cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
+            self.create_table(cursor, staging_table)
+            plan = self.build_migration_plan(cursor, staging_table, column_names, source_schema.kinds)
+            db.commit()
+            insert_query = f"INSERT INTO {staging_table} ({', '.join(column_names)}) VALUES %s"
+
+            def copy_range(low, high, on_chunk):
+                """Копіювання розділу на власних з'єднаннях з обома серверами"""
+                with self.pool.dedicated() as target_db, mysql_db.pool.dedicated() as partition_source_db:
+                    target_cursor = target_db.cursor()
+                    partition_stats = run_migration(
+                        mysql_db.stream_rows(column_names, chunk_size, partition_source_db, id_range=(low, high)),
+                        lambda rows: execute_values(target_cursor, insert_query, rows, page_size=chunk_size),
+                        on_chunk=on_chunk,
+                        convert=lambda rows: convert_rows(rows, plan)
+                    )
+                    with partition_stats.phase("commit"):
+                        target_db.commit()
+                    partition_source_db.rollback()
+                return partition_stats
+
+            try:
+                stats = run_partitioned(
+                    ranges, copy_range, workers, on_chunk=task.report if task is not None else None
+                )
+                #   Заміна основної таблиці проміжною в одній транзакції
+                with stats.phase("swap"):
+                    cursor.execute(f"DROP TABLE IF EXISTS {self.table_name}")
+                    cursor.execute(f"ALTER TABLE {staging_table} RENAME TO {self.table_name}")
+                    cursor.execute(f"ALTER INDEX {staging_table}_pkey RENAME TO {self.table_name}_pkey")
+                    cursor.execute(f"ALTER SEQUENCE {staging_table}_id_seq RENAME TO {self.table_name}_id_seq")
+                    self.reset_id_sequence(cursor)
+                    self.clear_sync_state(cursor)
+                with stats.phase("index"):
+                    self.create_indexes(cursor)
+                with stats.phase("commit"):
+                    db.commit()
+            except BaseException:
+                #   Основна таблиця залишається без змін, прибираємо лише проміжну
+                db.rollback()
+                cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
+                db.commit()
+                raise
+            stats.finish()
+        return stats
 
     @staticmethod
-    def str_to_postgresql_typo(var, field_type):
-        """Конвертація значення змінної у PostgreSQL вигляд"""
-        if var == "" or var is None or str(var).lower() == "null":
-            return "NULL"
-        if field_type == b'tinyint(1)':
-            return "TRUE" if var == 1 else "FALSE"
-        if is_number(var):
-            return str(var)
-        return f"'{var}'"
-
-    def postgresql_query_values(self, field_values, column_types, with_id_field=True):
-        """Повертає значення змінних в PostgreSQL форматі"""
-        return sql_query_values(
-            field_values=field_values,
-            id_index=self.id_index,
-            str_to_sql_typo=self.str_to_postgresql_typo,
-            with_id_field=with_id_field,
-            column_types=column_types
+    def dependent_objects(cursor, table_names):
+        """Представлення та зовнішні ключі інших таблиць основної схеми, які залежать від таблиць table_names"""
+        cursor.execute(
+            "SELECT DISTINCT 'view ' || dependent.relname || ' on ' || referenced.relname "
+            "FROM pg_depend d JOIN pg_rewrite r ON r.oid = d.objid "
+            "JOIN pg_class dependent ON dependent.oid = r.ev_class "
+            "JOIN pg_class referenced ON referenced.oid = d.refobjid "
+            "WHERE d.classid = 'pg_rewrite'::regclass "
+            "AND referenced.relnamespace = (SELECT oid FROM pg_namespace WHERE nspname = current_schema()) "
+            "AND referenced.relname = ANY(%s) AND NOT dependent.relname = ANY(%s) "
+            "UNION "
+            "SELECT 'foreign key ' || c.conname || ' of ' || dependent.relname || ' on ' || referenced.relname "
+            "FROM pg_constraint c JOIN pg_class dependent ON dependent.oid = c.conrelid "
+            "JOIN pg_class referenced ON referenced.oid = c.confrelid "
+            "WHERE c.contype = 'f' "
+            "AND referenced.relnamespace = (SELECT oid FROM pg_namespace WHERE nspname = current_schema()) "
+            "AND referenced.relname = ANY(%s) AND NOT dependent.relname = ANY(%s) "
+            "ORDER BY 1",
+            (table_names,) * 4
         )
+        return [row[0] for row in cursor.fetchall()]
+
+    def migrate_schema_from_mysql(self, mysql_db: DatabaseMySQL, task=None):
+        """Міграція всіх таблиць бази MySQL. Таблиці створюються без обмежень у проміжній схемі та копіюються
+        паралельно (по одній на потік, у порядку зовнішніх ключів); первинні ключі та індекси будуються
+        після завантаження кожної таблиці, а зовнішні ключі - коли завантажені всі. Лише після цього
+        таблиці переносяться в основну схему однією транзакцією, тож при помилці база залишається без змін"""
+        chunk_size = MIGRATION["chunk_size"]
+        staging_schema = "schema_migration"
+        with schema_catalog.changing(self.source, None), \
+                self.pool.connection() as db, mysql_db.pool.connection() as source_db:
+            cursor = db.cursor()
+            tables = dependency_order(mysql_db.read_database_schema(source_db))
+            source_db.rollback()
+            if task is not None:
+                task.total_rows = sum(table.estimated_rows or 0 for table in tables) or None
+            cursor.execute("SELECT current_schema()")
+            target_schema = cursor.fetchone()[0]
+            #   Проміжна схема фіксується одразу, щоб її бачили з'єднання всіх потоків
+            cursor.execute(f"DROP SCHEMA IF EXISTS {staging_schema} CASCADE")
+            cursor.execute(f"CREATE SCHEMA {staging_schema}")
+            for table in tables:
+                cursor.execute(postgresql_create_table(staging_schema, table))
+            db.commit()
+
+            def copy_table(table, on_chunk):
+                """Копіювання таблиці через COPY FROM STDIN на власних з'єднаннях та побудова її індексів"""
+                column_names = table.schema.column_names
+                copy_query = f"COPY {staging_schema}.{quote_identifier(table.name)} " \
+                             f"({', '.join(map(quote_identifier, column_names))}) FROM STDIN"
+                with self.pool.dedicated() as target_db, mysql_db.pool.dedicated() as table_source_db:
+                    target_cursor = target_db.cursor()
+                    table_stats = run_migration(
+                        prefetch(
+                            mysql_db.stream_table(table.name, column_names, chunk_size, table_source_db),
+                            MIGRATION["prefetch_chunks"]
+                        ),
+                        lambda rows: target_cursor.copy_expert(copy_query, io.StringIO(copy_text(rows)), size=1 << 16),
+                        on_chunk=on_chunk
+                    )
+                    table_source_db.rollback()
+                    with table_stats.phase("index"):
+                        for statement in postgresql_index_statements(staging_schema, table):
+                            target_cursor.execute(statement)
+                    with table_stats.phase("commit"):
+                        target_db.commit()
+                self.logger.log(f"Table {table.name}: {table_stats}")
+                return table_stats
 
-    def migrate_from_mysql(self, mysql_db: DatabaseMySQL):
-        """Міграція з MySQL"""
-        def wrap_foo():
-            self.id_index = mysql_db.id_index
-            self.column_types = mysql_db.column_types
             try:
-                #   Очистити таблицю перед міграцією
-                self.cursor.execute(f"DROP TABLE IF EXISTS {self.table_name}")
-                #   Створення порожньої таблиці
-                self.cursor.execute(f"""
-                    CREATE TABLE IF NOT EXISTS {self.table_name} (
-                            id SERIAL PRIMARY KEY,
-                            price INT NOT NULL,
-                            count INT,
-                            rating FLOAT,
-                            program_name TEXT NOT NULL,
-                            program_description TEXT,
-                            license_expire_year INT,
-                            is_unlimited_license BOOLEAN NOT NULL
+                stats = run_partitioned(
+                    [(table,) for table in tables], copy_table, MIGRATION["table_workers"],
+                    on_chunk=task.report if task is not None else None
+                )
+                #   Заміна таблиць основної схеми завантаженими в одній транзакції
+                with stats.phase("swap"):
+                    #   CASCADE видаляє і представлення та зовнішні ключі інших таблиць, що посилаються на замінені
+                    for dependent in self.dependent_objects(cursor, [table.name for table in tables]):
+                        self.logger.log(f"Dropping {dependent} together with the replaced table", tag="WARNING")
+                    for table in reversed(tables):
+                        cursor.execute(f"DROP TABLE IF EXISTS {quote_identifier(table.name)} CASCADE")
+                    for table in tables:
+                        cursor.execute(
+                            f"ALTER TABLE {staging_schema}.{quote_identifier(table.name)} "
+                            f"SET SCHEMA {quote_identifier(target_schema)}"
                         )
-                """)
-                for field in mysql_db.fields:
-                    query_field_names = mysql_db.sql_query_field_names(with_id_field=True)
-                    query_field_values = self.postgresql_query_values(
-                        field_values=field,
-                        column_types=mysql_db.column_types,
-                    )
-                    sql_query = f"""
-                        INSERT INTO {self.table_name} 
-                        ({query_field_names}) 
-                        VALUES ({query_field_values});
-                    """
-                    self.cursor.execute(sql_query)
-                self.db.commit()
-                self.update_table_widget()
-                self.logger.log("Successfully exported MySQL table data to PostgreSQL")
-            except psycopg2.DatabaseError as error:
-                self.logger.error_message_box(f"Error trying to export to PostgreSQL! {error}", should_abort=True)
-                self.db.rollback()
-
-        return wrap_foo
-
-    def update_field(self, item: QTableWidgetItem):
-        """Оновлення значення в БД"""
-        if not self.editable:
-            return
-        row, column = item.row(), item.column()
-        field = self.column_names[column]
-        field_id = self.fields[row][self.id_index]
-        new_value = self.str_to_postgresql_typo(item.text(), self.column_types[column])
+                        for statement in postgresql_sequence_statements(table):
+                            cursor.execute(statement)
+                with stats.phase("constraints"):
+                    for table in tables:
+                        for statement in postgresql_foreign_key_statements(table):
+                            cursor.execute(statement)
+                    if any(table.name == self.table_name for table in tables):
+                        self.clear_sync_state(cursor)
+                        self.create_indexes(cursor)
+                cursor.execute(f"DROP SCHEMA {staging_schema}")
+                with stats.phase("commit"):
+                    db.commit()
+            except BaseException:
+                #   Основна схема залишається без змін, прибираємо лише проміжну
+                db.rollback()
+                cursor.execute(f"DROP SCHEMA IF EXISTS {staging_schema} CASCADE")
+                db.commit()
+                raise
+            stats.finish()
+        self.logger.log(f"Migrated {len(tables)} MySQL tables: {stats}")
+        return stats
+
+    def verify_against_mysql(self, mysql_db: DatabaseMySQL, task=None) -> VerificationStats:
+        """Перевірка, що таблиця PostgreSQL збігається з таблицею MySQL: суми хешів діапазонів id обчислюються
+        на обох серверах, і лише діапазони з відмінностями діляться далі до окремих рядків"""
+        with self.pool.connection() as db, mysql_db.pool.connection() as source_db:
+            source_schema = mysql_db.schema(source_db)
+            target_schema = self.schema(db)
+            column_names = [name for name in target_schema.column_names if name in source_schema.column_names]
+            kinds = list(map(verify_kind, source_schema.kinds_of(column_names), target_schema.kinds_of(column_names)))
+            if task is not None:
+                task.total_rows = mysql_db.estimate_row_count(source_db)
+            stats = verify_ranges(
+                lambda low, high, step: mysql_db.range_checksums(column_names, kinds, low, high, step, source_db),
+                lambda low, high, step: self.range_checksums(column_names, kinds, low, high, step, db),
+                combined_id_range(mysql_db.read_id_range(source_db), self.read_id_range(db)),
+                on_chunk=task.report if task is not None else None
+            )
+            source_db.rollback()
+        return stats
+
+    def export_to_file(self, filename, task=None):
+        """Потоковий експорт таблиці у файл CSV чи NDJSON через COPY TO STDOUT"""
+        with self.pool.connection() as db:
+            if task is not None:
+                task.total_rows = self.estimate_row_count(db)
+            column_names = self.schema(db).column_names
+            return export_file(
+                filename,
+                column_names,
+                self.copy_rows(column_names, MIGRATION["chunk_size"], db),
+                on_chunk=task.report if task is not None else None
+            )
+
+    def import_from_file(self, filename, task=None):
+        """Відновлення таблиці з файлу CSV чи NDJSON через COPY FROM STDIN; вміст таблиці замінюється
+        в одній транзакції, тож при помилці чи скасуванні залишається попередній"""
+        chunk_size = MIGRATION["chunk_size"]
+        with self.pool.connection() as db, open_rows(filename, chunk_size) as (column_names, chunks):
+            convert = import_converter(filename, self.table_name, column_names, self.schema(db))
+            copy_query = f"COPY {self.table_name} ({', '.join(column_names)}) FROM STDIN"
+            cursor = db.cursor()
+            try:
+                cursor.execute(f"TRUNCATE {self.table_name}")
+                self.clear_sync_state(cursor)
+                #   Файл читається та розпаковується в окремому потоці, поки попередня порція копіюється
+                stats = run_migration(
+                    prefetch(chunks, MIGRATION["prefetch_chunks"]),
+                    lambda rows: cursor.copy_expert(copy_query, io.StringIO(copy_text(rows)), size=1 << 16),
+                    on_chunk=task.report if task is not None else None,
+                    convert=convert
+                )
+                self.reset_id_sequence(cursor)
+                with stats.phase("commit"):
+                    db.commit()
+                stats.finish()
+            finally:
+                cursor.close()
+        return stats
+
+    def update_field(self, field, column, value):
+        """Оновлення значення в БД; повертає оновлений рядок або None при помилці"""
+        updated_fields = self.update_fields([(field, column, value)])
+        return updated_fields[0] if updated_fields else None
+
+    def update_fields(self, edits):
+        """Запис змінених комірок [(рядок, стовпець, текст)] однією транзакцією;
+        повертає оновлені рядки або None, якщо всі зміни відкочено"""
+        statements, field_ids, errors = parse_edits(edits, self.column_names, self.column_kinds, self.id_index)
+        if errors:
+            self.logger.error_message_box(
+                "Invalid values for PostgreSQL cells, no changes saved!\n" + "\n".join(errors)
+            )
+            return None
         try:
-            self.cursor.execute(f"UPDATE {self.table_name} SET {field}={new_value} WHERE id={field_id}")
+            for field_name, params in statements:
+                #   execute_batch надсилає кілька UPDATE за один обмін з сервером
+                execute_batch(self.cursor, f"UPDATE {self.table_name} SET {field_name}=%s WHERE id=%s", params)
+            self.cursor.execute(f"SELECT * FROM {self.table_name} WHERE id = ANY(%s) ORDER BY id", (field_ids,))
+            updated_fields = self.cursor.fetchall()
             self.db.commit()
-            self.logger.log(f"Updated PostgreSQL cell {field} with id {field_id}. New value is {new_value}")
         except psycopg2.DatabaseError as error:
-            self.logger.error_message_box(f"PostgreSQL error trying to update table item! {error}")
             self.db.rollback()
-        self.update_table_widget()
-
-    def export_to_sqlite(self, export_fields_lineedit: QLineEdit, db_sqlite):
-        """Експорт в SQLite"""
-        def wrap_foo():
-            export_fields_text = export_fields_lineedit.text()
-            export_fields = re.split(",\\s*|\\s+", export_fields_text)
-            for export_field in export_fields:
-                if export_field not in self.column_names:
-                    self.logger.error_message_box(f"{export_field} is not a valid field name.\n"
-                                                  f"Valid field names are: {self.column_names}")
-                    return
-            db_sqlite.migrate_from_postgresql(self, export_fields)
-
-        return wrap_foo
+            failed_edit = find_failed_edit(
+                statements,
+                lambda field_name, value, field_id: self.cursor.execute(
+                    f"UPDATE {self.table_name} SET {field_name}=%s WHERE id=%s", (value, field_id)
+                ),
+                psycopg2.DatabaseError
+            )
+            self.db.rollback()
+            self.logger.error_message_box(
+                f"PostgreSQL error trying to update table items, all changes rolled back! {failed_edit or error}"
+            )
+            return None
+        self.logger.log(f"Updated {len(edits)} PostgreSQL cells in {len(field_ids)} rows")
+        return updated_fields
+
+    def parse_export_fields(self, export_fields_text: str):
+        """Розбір назв полів для експорту в SQLite; повертає None, якщо є невідомі поля"""
+        export_fields = re.split(",\\s*|\\s+", export_fields_text)
+        for export_field in export_fields:
+            if export_field not in self.column_names:
+                self.logger.error_message_box(f"{export_field} is not a valid field name.\n"
+                                              f"Valid field names are: {self.column_names}")
+                return None
+        return export_fields
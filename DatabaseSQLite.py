@@ -1,22 +1,80 @@
+import os
 import sqlite3
-
-from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem
-from PyQt5.QtCore import Qt
+import threading
+from contextlib import contextmanager, closing
 
 from DatabasePostgreSQL import DatabasePostgreSQL
-from Logger import Logger
-from utils import is_number
+from QueryStats import instrument
+from SchemaCatalog import schema_catalog, ColumnInfo, TableSchema
+from config import MIGRATION, VERIFICATION
+from filetransfer import export_file, open_rows, import_converter
+from migration import run_migration, run_partitioned, run_sync, changed_buckets, split_id_range, iter_chunks, prefetch
+from converters import sqlite_kind, build_plan, convert_rows, SQLITE_TYPES
+from utils import RowFilter, page_query, like_pattern, INDEXED_COLUMNS, SEARCH_COLUMNS
+from verification import HashSum, VerificationStats, row_hash, verify_kind, verify_ranges, combined_id_range
+
+
+def read_sqlite_schema(cursor, table_name) -> TableSchema:
+    """Стовпці (PRAGMA table_info) та індекси таблиці SQLite, включно з таблицею FTS5 {table_name}_fts"""
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    columns = [
+        ColumnInfo(name, sqlite_kind(declared_type), declared_type, not not_null, primary_key > 0)
+        for _, name, declared_type, not_null, _, primary_key in cursor.fetchall()
+    ]
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE (type = 'index' AND tbl_name = ?) OR (type = 'table' AND name = ?)",
+        (table_name, f"{table_name}_fts")
+    )
+    return TableSchema(columns, [row[0] for row in cursor.fetchall()])
+
+
+def sqlite_range_checksums(db, table_name, column_names, kinds, low, high, step):
+    """Кількість рядків та сума хешів блоків по step id з діапазону [low, high) для перевірки копії;
+    у SQLite немає MD5, тож хеш рядка обчислює функція Python, зареєстрована в з'єднанні"""
+    float_digits = VERIFICATION["float_digits"]
+    db.create_function(
+        "verify_row_hash", len(column_names), lambda *values: row_hash(values, kinds, float_digits), deterministic=True
+    )
+    db.create_aggregate("verify_hash_sum", 1, HashSum)
+    cursor = db.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT (id - ?) / ? AS bucket, COUNT(*), verify_hash_sum(verify_row_hash({', '.join(column_names)}))
+            FROM {table_name}
+            WHERE id >= ? AND id < ?
+            GROUP BY bucket
+        """, (low, step, low, high))
+        return {bucket: (count, checksum) for bucket, count, checksum in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def open_database(filename):
+    """З'єднання з файлом SQLite; використовується і фоновими задачами, доступ до нього впорядковує MainWindow"""
+    return instrument(sqlite3.connect(filename, check_same_thread=False), "SQLite")
+
+
+def remove_database_file(filename):
+    """Видалення тимчасового файлу БД разом з файлами журналу"""
+    if filename == ":memory:":
+        return
+    for path in (filename, f"{filename}-journal", f"{filename}-wal", f"{filename}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
 
 
 class DatabaseSQLite:
-    def __init__(self, filename: str, table_widget: QTableWidget, logger: Logger):
+    def __init__(self, filename: str, logger):
         #   Ініціалізація змінних
-        self.tableWidget = table_widget
         self.table_name = "internet_store_licenses"
-        self.editable = True
-        self.export_indexes = self.column_names = self.fields = []
-        self.table_columns = self.table_rows = self.id_index = 0
+        self.column_names = []
+        self.table_columns = self.id_index = 0
+        #   Чи створено повнотекстовий індекс FTS5 для пошуку
+        self.has_text_index = False
         self.logger = logger
+        #   Ключ схем цієї БД у спільному каталозі
+        self.source = f"SQLite {filename}"
+        self.filename = filename
         self.db: None | sqlite3.Connection = None
         self.cursor = None
         #   З'єднання з базою даних
@@ -25,118 +83,512 @@ class DatabaseSQLite:
     def connect(self, filename: str):
         """З'єднання з базою SQLite"""
         try:
-            self.db = sqlite3.connect(filename)
+            self.db = open_database(filename)
             self.cursor = self.db.cursor()
             self.logger.log(f"Successful connection to SQLite database filename {filename}")
         except sqlite3.DatabaseError as error:
             self.logger.error_message_box(f"Error connecting to SQLite database! {error}")
 
-    def init_table_widget_axis(self):
-        """Ініціалізація назв комірок у таблиці"""
+    def introspect(self):
+        """Читання стовпців та індексів таблиці з каталогу SQLite"""
+        return read_sqlite_schema(self.db.cursor(), self.table_name)
+
+    def schema(self) -> TableSchema:
+        """Схема таблиці зі спільного кешу; з БД читається лише після DDL чи явного оновлення"""
+        return schema_catalog.get(self.source, self.table_name, self.introspect)
+
+    def table_exists(self):
+        """Чи створено таблицю (до першого експорту її немає, і вкладка не завантажується)"""
         try:
-            self.cursor.execute(f"SELECT * FROM {self.table_name} LIMIT 0")
-            columns = self.cursor.description
-            self.column_names = [i[0] for i in columns]
-            self.tableWidget.setColumnCount(len(self.column_names))
-            self.id_index = self.column_names.index("id")
-            self.tableWidget.setHorizontalHeaderLabels(self.column_names)
-            self.table_columns = len(self.column_names)
-            self.tableWidget.setColumnCount(self.table_columns)
-            self.cursor.execute(f"SELECT * FROM {self.table_name} LIMIT 100")
-            self.fields = self.cursor.fetchall()
-            self.table_rows = len(self.fields)
-            self.tableWidget.setRowCount(self.table_rows)
-            self.tableWidget.setVerticalHeaderLabels("" for _ in self.fields)
+            return self.schema().exists
+        except sqlite3.DatabaseError as error:
+            self.logger.log(f"SQLite error checking table: {error}", tag="WARNING")
+            return False
+
+    def load_columns(self):
+        """Назви стовпців таблиці та наявність індексу FTS5 зі схеми"""
+        try:
+            schema = self.schema()
         except sqlite3.DatabaseError as error:
             self.logger.error_message_box(f"SQLite error connecting table! {error}")
+            return False
+        if not schema.exists:
+            self.logger.error_message_box(f"SQLite error connecting table! Table {self.table_name} does not exist")
+            return False
+        self.column_names = schema.column_names
+        self.id_index = schema.id_index
+        self.table_columns = len(self.column_names)
+        self.has_text_index = f"{self.table_name}_fts" in schema.indexes
+        return True
+
+    def search_condition(self, text):
+        """Умова пошуку підрядка: через триграмний індекс FTS5, якщо він є, інакше повним переглядом через LIKE"""
+        search_fields = [field for field in SEARCH_COLUMNS if field in self.column_names]
+        if not search_fields:
+            #   Текстові поля не експортовано, тож жоден рядок не відповідає пошуку
+            return "0", ()
+        if self.has_text_index and len(text) >= 3:
+            phrase = '"' + text.replace('"', '""') + '"'
+            return f"id IN (SELECT rowid FROM {self.table_name}_fts WHERE {self.table_name}_fts MATCH ?)", (phrase,)
+        pattern = like_pattern(text)
+        return " OR ".join(f"{field} LIKE ? ESCAPE '!'" for field in search_fields), (pattern,) * len(search_fields)
 
-    def init_table_widget_fields(self):
-        """Заповнення таблиці значеннями"""
-        for i, field in enumerate(self.fields):
-            for j, value in enumerate(field):
-                table_widget_item = QTableWidgetItem(str(value))
-                table_widget_item.setFlags(table_widget_item.flags() & ~Qt.ItemIsEditable)
-                table_widget_item.setTextAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-                self.tableWidget.setItem(i, j, table_widget_item)
-
-    def update_table_widget(self):
-        """Оновити PyQt віджет для зображення бази даних"""
+    def fetch_page(self, after_row, limit, row_filter: RowFilter | None = None):
+        """Наступна сторінка рядків після заданого рядка з урахуванням фільтра та сортування"""
+        sql_query, params = page_query(
+            self.table_name, self.column_names, row_filter, after_row, limit, placeholder="?",
+            search_condition=self.search_condition
+        )
         try:
-            self.editable = False
-            self.init_table_widget_axis()
-            self.init_table_widget_fields()
-            self.editable = True
+            self.cursor.execute(sql_query, params)
+            return self.cursor.fetchall()
         except sqlite3.DatabaseError as error:
-            self.logger.error_message_box(f"PostgreSQL error trying to update table! {error}")
-
-    @staticmethod
-    def query_field_names(columns: [str]):
-        """Повертає назви змінних в SQLite форматі"""
-        sql_query = ""
-        for i, column_name in enumerate(columns):
-            comma = ", " if not i == 0 else ""
-            sql_query = sql_query + comma + column_name
-        return sql_query
-
-    def query_field_values(self, field_values):
-        """Повертає значення змінних в SQLite форматі"""
-        sql_query = ""
-        for i, export_index in enumerate(self.export_indexes):
-            comma = ", " if not i == 0 else ""
-            sql_query = sql_query + comma + self.str_to_sqlite_typo(field_values[export_index])
-        return sql_query
-
-    @staticmethod
-    def str_to_sqlite_typo(var):
-        """Конвертація значення змінної у SQLite вигляд"""
-        if var == "" or var is None or str(var).lower() == "null":
-            return "NULL"
-        if is_number(var):
-            return str(var)
-        return f'"{var}"'
-
-    def migrate_from_postgresql(self, db_postgresql: DatabasePostgreSQL, export_fields: [str]):
-        """Міграція з PostgreSQL"""
-        def field_statement(value, statement):
-            """Додаємо відповідне поле, якщо справджується задана умова"""
-            return f", {value}" if statement else ""
+            self.logger.error_message_box(f"SQLite error fetching table rows! {error}")
+            return []
+
+    def stream_rows(self, column_names, chunk_size):
+        """Потокове читання таблиці порціями окремим курсором"""
+        cursor = self.db.cursor()
+        try:
+            cursor.execute(f"SELECT {', '.join(column_names)} FROM {self.table_name} ORDER BY id")
+            yield from iter_chunks(cursor, chunk_size)
+        finally:
+            cursor.close()
+
+    def read_id_range(self):
+        """Найменший та найбільший id таблиці"""
+        self.cursor.execute(f"SELECT MIN(id), MAX(id) FROM {self.table_name}")
+        return self.cursor.fetchone()
+
+    def range_checksums(self, column_names, kinds, low, high, step):
+        """Кількість рядків та сума хешів блоків по step id з діапазону [low, high) для перевірки копії"""
+        return sqlite_range_checksums(self.db, self.table_name, column_names, kinds, low, high, step)
+
+    def verify_against_postgresql(self, db_postgresql: DatabasePostgreSQL, task=None) -> VerificationStats:
+        """Перевірка, що експортовані в SQLite поля збігаються з таблицею PostgreSQL; рядки зіставляються за id"""
+        target_schema = self.schema()
+        if not target_schema.exists:
+            raise ValueError(f"Table {self.table_name} does not exist")
+        with db_postgresql.pool.connection() as source_db:
+            source_schema = db_postgresql.schema(source_db)
+            column_names = [name for name in target_schema.column_names if name in source_schema.column_names]
+            kinds = list(map(verify_kind, source_schema.kinds_of(column_names), target_schema.kinds_of(column_names)))
+            if task is not None:
+                task.total_rows = db_postgresql.estimate_row_count(source_db)
+            return verify_ranges(
+                lambda low, high, step: db_postgresql.range_checksums(column_names, kinds, low, high, step, source_db),
+                lambda low, high, step: self.range_checksums(column_names, kinds, low, high, step),
+                combined_id_range(db_postgresql.read_id_range(source_db), self.read_id_range()),
+                on_chunk=task.report if task is not None else None
+            )
+
+    @contextmanager
+    def bulk_load_mode(self):
+        """Режим масового завантаження: полегшений журнал, без fsync та з великим кешем сторінок.
+        Після завантаження відновлюються попередні налаштування з'єднання та режим журналу файлу"""
+        journal_mode = MIGRATION["sqlite_journal_mode"]
+        if journal_mode.upper() == "OFF":
+            #   Без журналу ROLLBACK скасованого чи невдалого експорту може зіпсувати файл
+            raise ValueError("SQLite journal mode OFF is not supported: cancelled exports are rolled back")
+        previous = {}
+        for pragma in ("journal_mode", "synchronous", "cache_size", "temp_store"):
+            self.cursor.execute(f"PRAGMA {pragma}")
+            previous[pragma] = self.cursor.fetchone()[0]
+        self.cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        self.cursor.execute("PRAGMA synchronous=OFF")
+        self.cursor.execute(f"PRAGMA cache_size=-{MIGRATION['sqlite_cache_size_kib']}")
+        self.cursor.execute("PRAGMA temp_store=MEMORY")
+        try:
+            yield
+        finally:
+            self.cursor.execute(f"PRAGMA synchronous={previous['synchronous']}")
+            self.cursor.execute(f"PRAGMA cache_size={previous['cache_size']}")
+            self.cursor.execute(f"PRAGMA temp_store={previous['temp_store']}")
+            try:
+                self.cursor.execute(f"PRAGMA journal_mode={previous['journal_mode']}")
+                #   Незавершений запит PRAGMA заважав би VACUUM під час публікації
+                self.cursor.fetchall()
+            except sqlite3.OperationalError as error:
+                #   Вийти з WAL не можна, поки файл відкрито в інших програмах
+                self.logger.log(f"SQLite journal mode was not restored to {previous['journal_mode']}: {error}",
+                                tag="WARNING")
+
+    @contextmanager
+    def staging(self):
+        """Повний експорт у проміжну БД (MIGRATION["sqlite_staging"]): на час блоку self.db та self.cursor
+        ведуть у БД у пам'яті чи тимчасовий файл, куди спершу копіюється вміст файлу з іншими таблицями.
+        Повертає функцію публікації, що після фіксації атомарно замінює вміст файлу, тож інші програми
+        бачать або попередню, або готову таблицю з індексами. Без публікації файл залишається незмінним"""
+        mode = MIGRATION["sqlite_staging"]
+        if not mode:
+            yield lambda: None
+            return
+        staging_filename = ":memory:" if mode == "memory" else f"{self.filename}-staging"
+        remove_database_file(staging_filename)
+        target_db, target_cursor = self.db, self.cursor
+        staging_db = sqlite3.connect(staging_filename, check_same_thread=False)
+
+        def publish():
+            nonlocal target_db, target_cursor
+            if MIGRATION["sqlite_publish"] == "vacuum":
+                #   Перед заміною файлу з'єднання з ним закривається і відкривається вже з новим файлом
+                target_db.close()
+                try:
+                    replaced = self.replace_file(staging_db)
+                finally:
+                    target_db = open_database(self.filename)
+                    target_cursor = target_db.cursor()
+                if replaced:
+                    return
+            #   Сторінки видаленої старої таблиці не переносяться у файл
+            if staging_db.execute("PRAGMA freelist_count").fetchone()[0]:
+                staging_db.execute("VACUUM")
+            #   Копіювання всіх сторінок одним кроком - одна транзакція запису у файлі
+            with closing(sqlite3.connect(self.filename)) as published_db:
+                staging_db.backup(published_db)
 
         try:
-            #   Очищення таблиці перед міграцією
-            self.cursor.execute(f"DROP TABLE IF EXISTS {self.table_name}")
-            #   Створення порожньої таблиці з необхідними полями
-            sql_query_create_table = f"""
-            CREATE TABLE IF NOT EXISTS {self.table_name} (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT
-                        {field_statement("price INT NOT NULL",
-                                         "price" in export_fields)}
-                        {field_statement("count INT",
-                                         "count" in export_fields)}
-                        {field_statement("rating FLOAT",
-                                         "rating" in export_fields)}
-                        {field_statement("program_name TEXT NOT NULL",
-                                         "program_name" in export_fields)}
-                        {field_statement("program_description TEXT",
-                                         "program_description" in export_fields)}
-                        {field_statement("license_expire_year INT",
-                                         "license_expire_year" in export_fields)}
-                        {field_statement("is_unlimited_license BOOLEAN NOT NULL",
-                                         "is_unlimited_license" in export_fields)}
+            target_db.backup(staging_db)
+            self.db = instrument(staging_db, "SQLite")
+            self.cursor = self.db.cursor()
+            yield publish
+        finally:
+            self.db, self.cursor = target_db, target_cursor
+            staging_db.close()
+            remove_database_file(staging_filename)
+            #   Каталог міг закешувати схему проміжної БД
+            schema_catalog.invalidate(self.source)
+
+    def replace_file(self, staging_db):
+        """Публікація перейменуванням: VACUUM INTO тимчасового файлу поруч і заміна ним закритого файлу БД.
+        Журнал WAL, який тримають інші програми, належить старому файлу, тож тоді файл не замінюється"""
+        published_filename = f"{self.filename}-publish"
+        remove_database_file(published_filename)
+        try:
+            staging_db.execute("VACUUM INTO ?", (published_filename,))
+            if os.path.exists(f"{self.filename}-wal"):
+                self.logger.log("SQLite database file is open in another program, publishing with backup instead",
+                                tag="WARNING")
+                return False
+            os.replace(published_filename, self.filename)
+            return True
+        finally:
+            remove_database_file(published_filename)
+
+    def drop_table(self):
+        """Видалення таблиці разом з її повнотекстовим індексом"""
+        self.cursor.execute(f"DROP TABLE IF EXISTS {self.table_name}_fts")
+        self.cursor.execute(f"DROP TABLE IF EXISTS {self.table_name}")
+
+    def create_indexes(self, export_fields: [str]):
+        """Індекси для фільтрів і сортування та триграмний індекс FTS5 для пошуку після завантаження даних"""
+        for field in INDEXED_COLUMNS:
+            if field in export_fields:
+                self.cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self.table_name}_{field}_idx ON {self.table_name} ({field}, id)"
+                )
+        search_fields = [field for field in SEARCH_COLUMNS if field in export_fields]
+        if not search_fields:
+            return
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{self.table_name}_fts",))
+        if self.cursor.fetchone() is not None:
+            return
+        fts = f"{self.table_name}_fts"
+        fields = ", ".join(search_fields)
+        new_values = ", ".join(f"new.{field}" for field in search_fields)
+        old_values = ", ".join(f"old.{field}" for field in search_fields)
+        try:
+            self.cursor.execute(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5({fields}, content='{self.table_name}', content_rowid='id', "
+                f"tokenize='trigram')"
+            )
+        except sqlite3.OperationalError as error:
+            #   Триграмний токенізатор з'явився в SQLite 3.34
+            self.logger.log(f"SQLite FTS5 trigram index is not available, text search will scan the table: {error}",
+                            tag="WARNING")
+            return
+        #   Тригери підтримують індекс актуальним під час редагування та синхронізації
+        self.cursor.execute(f"""
+            CREATE TRIGGER {fts}_insert AFTER INSERT ON {self.table_name} BEGIN
+                INSERT INTO {fts} (rowid, {fields}) VALUES (new.id, {new_values});
+            END
+        """)
+        self.cursor.execute(f"""
+            CREATE TRIGGER {fts}_delete AFTER DELETE ON {self.table_name} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {fields}) VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        self.cursor.execute(f"""
+            CREATE TRIGGER {fts}_update AFTER UPDATE ON {self.table_name} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {fields}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts} (rowid, {fields}) VALUES (new.id, {new_values});
+            END
+        """)
+        self.cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+        self.has_text_index = True
+
+    def create_search_indexes(self, task=None):
+        """Створення індексів пошуку для вже експортованої таблиці"""
+        schema = self.schema()
+        if not schema.exists:
+            return
+        with schema_catalog.changing(self.source, self.table_name):
+            try:
+                self.create_indexes(schema.column_names)
+                self.db.commit()
+            except BaseException:
+                self.db.rollback()
+                raise
+
+    def copy_partitioned(self, db_postgresql: DatabasePostgreSQL, source_db, columns, insert_query, plan, on_chunk):
+        """Паралельне читання діапазонів id з PostgreSQL; SQLite має одного записувача, тому запис впорядковано"""
+        chunk_size = MIGRATION["chunk_size"]
+        workers = MIGRATION["parallel_workers"]
+        write_lock = threading.Lock()
+
+        def write_chunk(rows):
+            """Запис порції в SQLite лише з одного потоку одночасно"""
+            with write_lock:
+                self.cursor.executemany(insert_query, rows)
+
+        def copy_range(low, high, on_partition_chunk):
+            """Читання та перетворення розділу на власному з'єднанні з PostgreSQL"""
+            with db_postgresql.pool.dedicated() as partition_source_db:
+                return run_migration(
+                    db_postgresql.copy_rows(columns, chunk_size, partition_source_db, id_range=(low, high)),
+                    write_chunk,
+                    on_chunk=on_partition_chunk,
+                    convert=lambda rows: convert_rows(rows, plan)
+                )
+
+        ranges = split_id_range(*db_postgresql.read_id_range(source_db), workers * MIGRATION["partitions_per_worker"])
+        return run_partitioned(ranges, copy_range, workers, on_chunk=on_chunk)
+
+    def create_table(self, export_fields: [str], source_schema: TableSchema):
+        """Створення порожньої таблиці з необхідними полями; типи та NOT NULL беруться зі схеми PostgreSQL"""
+        fields = "".join(
+            f", {field} {SQLITE_TYPES[source_schema.column(field).kind]}"
+            f"{'' if source_schema.column(field).nullable else ' NOT NULL'}"
+            for field in export_fields if field != "id"
+        )
+        self.cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table_name} (id INTEGER PRIMARY KEY AUTOINCREMENT{fields})"
+        )
+
+    def create_sync_tables(self):
+        """Таблиці стану інкрементної синхронізації: параметри та контрольні суми синхронізованих блоків id"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                table_name TEXT PRIMARY KEY,
+                bucket_size INTEGER NOT NULL,
+                columns TEXT NOT NULL,
+                high_water_id INTEGER
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_checkpoints (
+                table_name TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                row_count INTEGER NOT NULL,
+                checksum TEXT NOT NULL,
+                PRIMARY KEY (table_name, bucket)
+            )
+        """)
+
+    def clear_sync_state(self):
+        """Скидання стану синхронізації після повної міграції"""
+        self.create_sync_tables()
+        self.cursor.execute("DELETE FROM sync_checkpoints WHERE table_name = ?", (self.table_name,))
+        self.cursor.execute("DELETE FROM sync_state WHERE table_name = ?", (self.table_name,))
+
+    def read_checkpoints(self, export_fields: [str], source_schema: TableSchema, columns: [str], bucket_size):
+        """Контрольні суми попередньої синхронізації; якщо її параметри інші, таблиця створюється заново"""
+        self.create_sync_tables()
+        self.cursor.execute("SELECT bucket_size, columns FROM sync_state WHERE table_name = ?", (self.table_name,))
+        state = self.cursor.fetchone()
+        if state == (bucket_size, ",".join(columns)):
+            self.cursor.execute(
+                "SELECT bucket, row_count, checksum FROM sync_checkpoints WHERE table_name = ?", (self.table_name,)
+            )
+            return {bucket: (row_count, checksum) for bucket, row_count, checksum in self.cursor.fetchall()}
+        if state is not None:
+            self.logger.log(
+                f"Sync state of {self.table_name} was saved with bucket size {state[0]} and columns {state[1]}, "
+                f"recreating the table: the whole table is synchronized again", tag="WARNING"
+            )
+        #   Таблиця могла бути створена повною міграцією з іншими id чи полями
+        self.drop_table()
+        self.create_table(export_fields, source_schema)
+        self.clear_sync_state()
+        self.cursor.execute(
+            "INSERT INTO sync_state (table_name, bucket_size, columns) VALUES (?, ?, ?)",
+            (self.table_name, bucket_size, ",".join(columns))
+        )
+        self.db.commit()
+        return {}
+
+    def save_checkpoint(self, bucket, checksum, bucket_size):
+        """Запис контрольної суми синхронізованого блоку (None - блок видалено з джерела)"""
+        if checksum is None:
+            self.cursor.execute(
+                "DELETE FROM sync_checkpoints WHERE table_name = ? AND bucket = ?", (self.table_name, bucket)
+            )
+        else:
+            self.cursor.execute(
+                "INSERT OR REPLACE INTO sync_checkpoints (table_name, bucket, row_count, checksum) VALUES (?, ?, ?, ?)",
+                (self.table_name, bucket, *checksum)
+            )
+        self.cursor.execute(
+            "UPDATE sync_state SET high_water_id = MAX(COALESCE(high_water_id, 0), ?) WHERE table_name = ?",
+            ((bucket + 1) * bucket_size - 1, self.table_name)
+        )
+
+    def sync_from_postgresql(self, db_postgresql: DatabasePostgreSQL, export_fields: [str], task=None):
+        """Інкрементна синхронізація з PostgreSQL: переносяться лише нові, змінені та видалені рядки"""
+        bucket_size = MIGRATION["sync_bucket_size"]
+        #   Для зіставлення рядків id переносяться з PostgreSQL
+        columns = export_fields if "id" in export_fields else ["id"] + export_fields
+        id_position = columns.index("id")
+        with db_postgresql.pool.connection() as source_db, schema_catalog.changing(self.source, self.table_name):
+            try:
+                source_schema = db_postgresql.schema(source_db)
+                checkpoints = self.read_checkpoints(export_fields, source_schema, columns, bucket_size)
+                self.create_indexes(export_fields)
+                self.db.commit()
+                #   Таблицю могло бути щойно створено, тому її схема читається з БД, а не з кешу
+                plan = build_plan(source_schema.kinds_of(columns), self.introspect().kinds_of(columns))
+                #   Контрольні суми блоків обчислює сервер, по мережі передаються лише змінені блоки
+                source_checksums = db_postgresql.chunk_checksums(columns, bucket_size, source_db)
+                buckets = changed_buckets(source_checksums, checkpoints)
+                if task is not None:
+                    task.total_rows = sum(
+                        source_checksums[bucket][0] for bucket in buckets if bucket in source_checksums
                     )
-            """
-            self.cursor.execute(sql_query_create_table)
-            self.export_indexes = [db_postgresql.column_names.index(export_field)
-                                   for export_field in export_fields]
-            #   Додаємо дані з PostgreSQL
-            for field in db_postgresql.fields:
-                sql_query = f"""
-                        INSERT INTO {self.table_name} 
-                        ({self.query_field_names(export_fields)}) 
-                        VALUES ({self.query_field_values(field)});
-                    """
-                self.cursor.execute(sql_query)
-            self.db.commit()
-            self.update_table_widget()
-            self.logger.log(f"Successfully migrated fields {export_fields} to SQLite")
-        except sqlite3.DatabaseError as error:
-            self.logger.error_message_box(f"Error migrating to SQLite database! {error}")
+                upsert_query = f"INSERT INTO {self.table_name} ({', '.join(columns)}) " \
+                               f"VALUES ({', '.join('?' for _ in columns)}) " \
+                               f"ON CONFLICT(id) DO UPDATE SET " \
+                               f"{', '.join(f'{name} = excluded.{name}' for name in columns if name != 'id')}"
+
+                def apply_bucket(bucket, rows):
+                    """Вставка та оновлення рядків блоку, видалення відсутніх у джерелі, запис контрольної точки"""
+                    self.cursor.execute(
+                        f"SELECT id FROM {self.table_name} WHERE id >= ? AND id < ?",
+                        (bucket * bucket_size, (bucket + 1) * bucket_size)
+                    )
+                    deleted_ids = {row[0] for row in self.cursor.fetchall()} - {row[id_position] for row in rows}
+                    self.cursor.executemany(upsert_query, rows)
+                    self.cursor.executemany(
+                        f"DELETE FROM {self.table_name} WHERE id = ?", [(field_id,) for field_id in deleted_ids]
+                    )
+                    self.save_checkpoint(bucket, source_checksums.get(bucket), bucket_size)
+                    self.db.commit()
+
+                stats = run_sync(
+                    buckets,
+                    lambda bucket: db_postgresql.read_bucket(columns, bucket, bucket_size, source_db),
+                    apply_bucket,
+                    on_chunk=task.report if task is not None else None,
+                    convert=lambda rows: convert_rows(rows, plan)
+                )
+            except BaseException:
+                #   Відкочується лише незавершений блок, вже синхронізовані блоки збережені
+                self.db.rollback()
+                raise
+        return stats
+
+    def migrate_from_postgresql(self, db_postgresql: DatabasePostgreSQL, export_fields: [str], task=None):
+        """Міграція з PostgreSQL; при помилці чи скасуванні транзакція відкочується разом з DROP TABLE"""
+        chunk_size = MIGRATION["chunk_size"]
+        with db_postgresql.pool.connection() as source_db, self.staging() as publish:
+            with self.bulk_load_mode(), schema_catalog.changing(self.source, self.table_name):
+                if task is not None:
+                    task.total_rows = db_postgresql.estimate_row_count(source_db)
+                #   Явна транзакція, щоб DROP TABLE також відкотився при помилці
+                self.cursor.execute("BEGIN")
+                try:
+                    #   Очищення таблиці перед міграцією
+                    self.drop_table()
+                    source_schema = db_postgresql.schema(source_db)
+                    self.create_table(export_fields, source_schema)
+                    self.clear_sync_state()
+                    workers = MIGRATION["parallel_workers"]
+                    #   id завжди переносяться з PostgreSQL: розділи записуються в довільному порядку, а синхронізація
+                    #   та перевірка копій зіставляють рядки за id, тож будь-який режим дає ту саму таблицю
+                    columns = export_fields if "id" in export_fields else ["id"] + export_fields
+                    #   Схема нової таблиці читається в транзакції міграції, тому не кешується
+                    plan = build_plan(source_schema.kinds_of(columns), self.introspect().kinds_of(columns))
+                    insert_query = f"INSERT INTO {self.table_name} ({', '.join(columns)}) " \
+                                   f"VALUES ({', '.join('?' for _ in columns)})"
+                    on_chunk = task.report if task is not None else None
+                    if workers > 1:
+                        stats = self.copy_partitioned(db_postgresql, source_db, columns, insert_query, plan, on_chunk)
+                    else:
+                        #   Додаємо дані з PostgreSQL великими порціями; COPY читається в окремому потоці
+                        stats = run_migration(
+                            db_postgresql.copy_rows(columns, chunk_size, source_db),
+                            lambda rows: self.cursor.executemany(insert_query, rows),
+                            on_chunk=on_chunk,
+                            convert=lambda rows: convert_rows(rows, plan)
+                        )
+                    #   Індекси будуються вже після завантаження даних
+                    with stats.phase("index"):
+                        self.create_indexes(export_fields)
+                    #   Статистика індексів для планувальника запитів фільтрів та сортування
+                    with stats.phase("analyze"):
+                        self.cursor.execute(f"ANALYZE {self.table_name}")
+                    with stats.phase("commit"):
+                        self.db.commit()
+                except BaseException:
+                    self.db.rollback()
+                    raise
+            #   Проміжна БД публікується вже з відновленим режимом журналу
+            with stats.phase("publish"):
+                publish()
+            stats.finish()
+        return stats
+
+    def export_to_file(self, filename, task=None):
+        """Потоковий експорт таблиці у файл CSV чи NDJSON"""
+        schema = self.schema()
+        if not schema.exists:
+            raise ValueError(f"Table {self.table_name} does not exist")
+        return export_file(
+            filename,
+            schema.column_names,
+            prefetch(self.stream_rows(schema.column_names, MIGRATION["chunk_size"]), MIGRATION["prefetch_chunks"]),
+            on_chunk=task.report if task is not None else None
+        )
+
+    def import_from_file(self, filename, task=None):
+        """Відновлення таблиці з файлу CSV чи NDJSON пакетними executemany в одній транзакції; таблиця
+        створюється заново за її ж оголошенням, а індекси будуються вже після завантаження"""
+        chunk_size = MIGRATION["chunk_size"]
+        with open_rows(filename, chunk_size) as (column_names, chunks), self.bulk_load_mode(), \
+                schema_catalog.changing(self.source, self.table_name):
+            schema = self.schema()
+            convert = import_converter(filename, self.table_name, column_names, schema)
+            insert_query = f"INSERT INTO {self.table_name} ({', '.join(column_names)}) " \
+                           f"VALUES ({', '.join('?' for _ in column_names)})"
+            self.cursor.execute("BEGIN")
+            try:
+                self.cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (self.table_name,))
+                create_query = self.cursor.fetchone()[0]
+                self.drop_table()
+                self.cursor.execute(create_query)
+                #   Контрольні точки синхронізації не відповідають відновленому вмісту
+                self.clear_sync_state()
+                stats = run_migration(
+                    prefetch(chunks, MIGRATION["prefetch_chunks"]),
+                    lambda rows: self.cursor.executemany(insert_query, rows),
+                    on_chunk=task.report if task is not None else None,
+                    convert=convert
+                )
+                with stats.phase("index"):
+                    self.create_indexes(schema.column_names)
+                with stats.phase("commit"):
+                    self.db.commit()
+                stats.finish()
+            except BaseException:
+                self.db.rollback()
+                raise
+        return stats
@@ -0,0 +1,73 @@
+from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QPlainTextEdit, QPushButton, QFileDialog
+from PyQt5.QtCore import Qt
+
+from QueryStats import QueryStats
+
+#   Стовпці таблиці статистики: заголовок та ключ зі знімка QueryStats
+COLUMNS = (
+    ("БД", "backend"),
+    ("Тип", "type"),
+    ("Кількість", "count"),
+    ("Сумарно, мс", "total_ms"),
+    ("Середнє, мс", "avg_ms"),
+    ("p50, мс", "p50_ms"),
+    ("p95, мс", "p95_ms"),
+    ("Макс., мс", "max_ms"),
+    ("Читання, мс", "fetch_ms"),
+    ("Змінено рядків", "rows_affected"),
+    ("Прочитано рядків", "rows_fetched"),
+    ("Помилки", "errors"),
+    ("Запит", "sql"),
+)
+
+
+class DiagnosticsPanel:
+    """Вкладка діагностики: статистика запитів, журнал повільних запитів та експорт у JSON"""
+    def __init__(self, stats: QueryStats, table: QTableWidget, slow_queries_view: QPlainTextEdit,
+                 refresh_button: QPushButton, reset_button: QPushButton, export_button: QPushButton, logger):
+        self.stats = stats
+        self.table = table
+        self.slow_queries_view = slow_queries_view
+        self.logger = logger
+        self.table.setColumnCount(len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in COLUMNS])
+        self.table.horizontalHeader().setStretchLastSection(True)
+        refresh_button.clicked.connect(self.refresh)
+        reset_button.clicked.connect(self.reset)
+        export_button.clicked.connect(self.export_json)
+
+    def refresh(self):
+        """Зображення поточного знімка статистики"""
+        snapshot = self.stats.snapshot()
+        statements = snapshot["statements"]
+        self.table.setRowCount(len(statements))
+        for row, statement in enumerate(statements):
+            for column, (_, key) in enumerate(COLUMNS):
+                item = QTableWidgetItem(str(statement[key]))
+                if key != "sql":
+                    item.setTextAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
+        self.slow_queries_view.setPlainText("\n".join(
+            f"{query['time']} [{query['backend']}] {query['duration_ms']:.0f} ms"
+            f"{' FAILED' if query['failed'] else ''}: {query['sql']}"
+            for query in reversed(snapshot["slow_queries"])
+        ))
+
+    def reset(self):
+        """Очищення статистики"""
+        self.stats.reset()
+        self.refresh()
+
+    def export_json(self):
+        """Збереження знімка статистики у файл JSON"""
+        filename, _ = QFileDialog.getSaveFileName(
+            self.table, "Export query statistics", "query_stats.json", "JSON (*.json)"
+        )
+        if not filename:
+            return
+        try:
+            self.stats.export_json(filename)
+            self.logger.log(f"Query statistics exported to {filename}")
+        except OSError as error:
+            self.logger.error_message_box(f"Error exporting query statistics! {error}")
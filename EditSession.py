@@ -0,0 +1,110 @@
+import csv
+import io
+
+from converters import parse_text
+
+
+class EditSession:
+    """Буфер змінених комірок: повторні зміни тієї ж комірки об'єднуються, запис виконується однією транзакцією"""
+    def __init__(self):
+        #   (id рядка, стовпець) -> останній введений текст; порядок словника - порядок першої зміни
+        self.edits = {}
+        #   id рядка -> рядок до першої зміни, щоб повернути його, якщо транзакцію відкочено
+        self.original_rows = {}
+
+    def __len__(self):
+        return len(self.edits)
+
+    def add(self, row, id_index, column, value):
+        """Додати зміну комірки (нова зміна тієї ж комірки замінює попередню)"""
+        field_id = row[id_index]
+        self.original_rows.setdefault(field_id, row)
+        self.edits[(field_id, column)] = value
+
+    def discard(self, field_id):
+        """Відкинути зміни рядка (наприклад, якщо його видалено)"""
+        self.edits = {key: value for key, value in self.edits.items() if key[0] != field_id}
+        self.original_rows.pop(field_id, None)
+
+    def take(self):
+        """Забрати всі зміни для запису: список (рядок, стовпець, текст) та початкові рядки"""
+        edits = [
+            (self.original_rows[field_id], column, value) for (field_id, column), value in self.edits.items()
+        ]
+        original_rows = self.original_rows
+        self.edits = {}
+        self.original_rows = {}
+        return edits, original_rows
+
+
+def parse_edits(edits, column_names, column_kinds, id_index):
+    """Перетворення тексту змінених комірок у значення та групування за стовпцями для executemany.
+    Повертає [(назва стовпця, [(значення, id), ...])], id рядків після змін та список помилок"""
+    updates = {}
+    new_ids = {}
+    errors = []
+    for field, column, value in edits:
+        field_id = field[id_index]
+        try:
+            new_value = parse_text(value, column_kinds[column])
+        except ValueError as error:
+            errors.append(f"id {field_id}, {column_names[column]}: {error}")
+            continue
+        updates.setdefault(column, []).append((new_value, field_id))
+        new_ids.setdefault(field_id, field_id)
+        if column == id_index:
+            new_ids[field_id] = new_value
+    #   id змінюється останнім, бо решта оновлень шукає рядки за старим id
+    statements = [
+        (column_names[column], params)
+        for column, params in sorted(updates.items(), key=lambda item: item[0] == id_index)
+    ]
+    return statements, list(new_ids.values()), errors
+
+
+def parse_pasted_rows(text, column_names, column_kinds, id_index):
+    """Рядки з буфера обміну (TSV з таблиць та Excel чи CSV) для вставки. Стовпці задає заголовок з назвами
+    стовпців, якщо він є, інакше кількість полів: усі стовпці або всі, крім id (його призначить сервер).
+    Повертає індекси стовпців, кортежі значень та список помилок"""
+    delimiter = "\t" if "\t" in text else ","
+    records = [record for record in csv.reader(io.StringIO(text), delimiter=delimiter) if any(map(str.strip, record))]
+    if not records:
+        return [], [], []
+    header = [field.strip() for field in records[0]]
+    if all(name in column_names for name in header):
+        columns = [column_names.index(name) for name in header]
+        records = records[1:]
+    elif len(header) == len(column_names):
+        columns = list(range(len(column_names)))
+    elif len(header) == len(column_names) - 1:
+        columns = [i for i in range(len(column_names)) if i != id_index]
+    else:
+        return [], [], [f"expected {len(column_names)} or {len(column_names) - 1} fields per row, got {len(header)}"]
+    rows = []
+    errors = []
+    for line, record in enumerate(records, 1):
+        if len(record) != len(columns):
+            errors.append(f"row {line}: expected {len(columns)} fields, got {len(record)}")
+            continue
+        values = []
+        for field, column in zip(record, columns):
+            try:
+                values.append(parse_text(field, column_kinds[column]))
+            except ValueError as error:
+                errors.append(f"row {line}, {column_names[column]}: {error}")
+                break
+        else:
+            rows.append(tuple(values))
+    return columns, rows, errors
+
+
+def find_failed_edit(statements, execute_one, errors):
+    """Пошук зміни, яку відхилив сервер: зміни виконуються по одній до першої помилки.
+    Після виклику транзакцію потрібно відкотити"""
+    for field_name, params in statements:
+        for value, field_id in params:
+            try:
+                execute_one(field_name, value, field_id)
+            except errors as error:
+                return f"id {field_id}, {field_name}={value}: {error}"
+    return None
@@ -1,16 +1,50 @@
+import logging
 import sys
+import threading
+from collections import deque
 
-from PyQt5.QtWidgets import QLabel, QMessageBox
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QPlainTextEdit, QMessageBox
+
+from config import LOGGING
+from ConsoleLogger import LOG_LEVELS
 
 
 class Logger:
     """Клас для логування"""
-    def __init__(self, label: QLabel):
-        self.label = label
+    def __init__(self, view: QPlainTextEdit):
+        self.view = view
+        #   Віджет зберігає лише останні buffer_size рядків
+        self.view.setMaximumBlockCount(LOGGING["buffer_size"])
+        #   Черга ще не зображених записів (обмежена, як і віджет)
+        self.pending = deque(maxlen=LOGGING["buffer_size"])
+        #   Записувати в лог можуть і фонові потоки, а зображає записи лише головний потік
+        self.lock = threading.Lock()
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(LOGGING["flush_interval_ms"])
+        self.python_logger = logging.getLogger("database_app")
+        if LOGGING["filename"]:
+            file_handler = logging.FileHandler(LOGGING["filename"], encoding="utf-8")
+            file_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] - %(message)s"))
+            self.python_logger.addHandler(file_handler)
+            self.python_logger.setLevel(logging.INFO)
 
     def log(self, message, tag="INFO"):
         """Надрукувати текст в лог з відповідним тегом"""
-        self.label.setText(f"{self.label.text()}[{tag}] - {message}<br/>")
+        entry = f"[{tag}] - {message}"
+        with self.lock:
+            self.pending.append(entry)
+        self.python_logger.log(LOG_LEVELS.get(tag, logging.INFO), message)
+
+    def flush(self):
+        """Дописати накопичені записи у віджет одним оновленням"""
+        with self.lock:
+            if not self.pending:
+                return
+            entries = list(self.pending)
+            self.pending.clear()
+        self.view.appendPlainText("\n".join(entries))
 
     def error_message_box(self, text, window_title="Error", should_abort=False):
         """Надрукувати текст в лог та зобразити Message Box про помилку"""
@@ -21,4 +55,5 @@ class Logger:
         message_box.exec_()
         self.log(text, tag="ERROR")
         if should_abort:
+            self.flush()
             sys.exit(1)
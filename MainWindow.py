@@ -1,46 +1,358 @@
-from PyQt5 import QtWidgets, uic
+import time
+
+from PyQt5 import QtWidgets
+from PyQt5.QtCore import QThreadPool
 
 from DatabaseMySQL import DatabaseMySQL
 from DatabasePostgreSQL import DatabasePostgreSQL
 from DatabaseSQLite import DatabaseSQLite
-from config import MYSQL, POSTGRESQL, SQLITE
+from DiagnosticsPanel import DiagnosticsPanel
+from QueryStats import query_stats
+from config import MYSQL, POSTGRESQL, SQLITE, LOGGING
 from Logger import Logger
+from MainWindowForm import Ui_MainWindow
+from TableTab import TableTab
+from Worker import Worker
 
 
-class MainWindow(QtWidgets.QMainWindow):
-    def __init__(self):
+class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
+    def __init__(self, started=None):
         super(MainWindow, self).__init__()
-        #   Завантаження файлу інтерфейсу
-        uic.loadUi('MainWindowForm.ui', self)
+        #   started - час запуску програми (time.perf_counter) для звіту про швидкість запуску
+        self.started = started if started is not None else time.perf_counter()
+        #   Інтерфейс, попередньо згенерований з MainWindowForm.ui командою pyuic5
+        self.setupUi(self)
         self.setWindowTitle("Лабораторна робота №1")
-        self.logger = Logger(self.label_log)
-        #   Створення баз даних
+        self.logger = Logger(self.log_view)
+        #   Фонові задачі виконуються в пулі потоків, одночасно лише одна міграція
+        self.thread_pool = QThreadPool.globalInstance()
+        self.worker: Worker | None = None
+        self.busy_tabs = []
+        self.changed_tabs = []
+        #   Створення баз даних; з'єднання з серверами відкриваються у фоні вже після показу вікна
         self.dbMySql = DatabaseMySQL(
             host=MYSQL["host"],
             user=MYSQL["user"],
             password=MYSQL["password"],
             database=MYSQL["database"],
-            table_widget=self.mysql_table,
-            logger=self.logger
+            logger=self.logger,
+            pool_size=MYSQL["pool_size"]
         )
         self.dbPostgreSQL = DatabasePostgreSQL(
             host=POSTGRESQL["host"],
             user=POSTGRESQL["user"],
             password=POSTGRESQL["password"],
             database=POSTGRESQL["database"],
-            table_widget=self.postgresql_table,
-            logger=self.logger
+            logger=self.logger,
+            pool_size=POSTGRESQL["pool_size"]
         )
         self.dbSQLite = DatabaseSQLite(
             filename=SQLITE["filename"],
-            table_widget=self.sqlite_table,
             logger=self.logger
         )
+        #   Вкладки з таблицями: MySQL редагується повністю, PostgreSQL - лише зміна комірок
+        self.mysqlTab = TableTab(self.dbMySql, self.mysql_table, editable=True, create_row=True, delete_column=True,
+                                 apply_button=self.mysql_apply_button)
+        self.postgresqlTab = TableTab(self.dbPostgreSQL, self.postgresql_table, editable=True,
+                                      apply_button=self.postgresql_apply_button)
+        self.sqliteTab = TableTab(self.dbSQLite, self.sqlite_table)
+        self.mysqlTab.connect_filter(self.mysql_price_min, self.mysql_price_max, self.mysql_search,
+                                     self.mysql_filter_button)
+        self.postgresqlTab.connect_filter(self.postgresql_price_min, self.postgresql_price_max, self.postgresql_search,
+                                          self.postgresql_filter_button)
+        self.sqliteTab.connect_filter(self.sqlite_price_min, self.sqlite_price_max, self.sqlite_search,
+                                      self.sqlite_filter_button)
+        self.diagnostics = DiagnosticsPanel(
+            query_stats, self.diagnostics_table, self.slow_queries_view, self.diagnostics_refresh_button,
+            self.diagnostics_reset_button, self.diagnostics_export_button, self.logger
+        )
+        #   Таблиця завантажується під час першого показу її вкладки, статистика - щоразу
+        self.tabWidget.currentChanged.connect(self.on_tab_changed)
         #   З'єднання кнопок з UI та відповідних функцій
-        self.export_to_postgres_button.clicked.connect(
-            self.dbPostgreSQL.migrate_from_mysql(self.dbMySql)
+        self.export_to_postgres_button.clicked.connect(self.migrate_to_postgresql)
+        self.export_fields_button.clicked.connect(self.export_to_sqlite)
+        self.cancel_migration_button.clicked.connect(self.cancel_migration)
+        self.create_indexes_button.clicked.connect(self.create_search_indexes)
+        self.verify_button.clicked.connect(self.verify_copies)
+        self.show()
+        self.report_startup("window shown")
+        #   Вкладка, її таблиця та назва БД для повідомлень
+        self.table_tabs = {
+            self.tab: (self.mysqlTab, "MySQL"),
+            self.tab_2: (self.postgresqlTab, "PostgreSQL"),
+            self.tab_3: (self.sqliteTab, "SQLite"),
+        }
+        self.tab_titles = {page: self.tabWidget.tabText(self.tabWidget.indexOf(page)) for page in self.table_tabs}
+        #   Фонові задачі з'єднання; посилання зберігаються, поки задача не завершиться
+        self.connect_workers = {}
+        #   SQLite - локальний файл, він відкривається одразу в конструкторі
+        self.sqliteTab.connected = True
+        self.start_connect(self.tab, self.dbMySql)
+        self.start_connect(self.tab_2, self.dbPostgreSQL)
+        self.on_tab_changed(self.tabWidget.currentIndex())
+
+    def report_startup(self, event):
+        """Запис у лог часу від запуску програми до події (якщо увімкнено LOGGING["startup_timing"])"""
+        if LOGGING["startup_timing"]:
+            self.logger.log(f"Startup: {event} after {time.perf_counter() - self.started:.3f}s")
+
+    def set_tab_state(self, page, state=None):
+        """Стан з'єднання вкладки в її назві (None - з'єднання відкрите)"""
+        title = self.tab_titles[page]
+        self.tabWidget.setTabText(self.tabWidget.indexOf(page), f"{title} ({state})" if state else title)
+
+    def start_connect(self, page, database):
+        """Фонове з'єднання з сервером; вкладки з'єднуються одночасно і не затримують показ вікна"""
+        if page in self.connect_workers:
+            return
+        worker = Worker(database.connect)
+        worker.signals.finished.connect(lambda result: self.on_connected(page))
+        worker.signals.failed.connect(lambda error: self.on_connect_failed(page, error))
+        self.connect_workers[page] = worker
+        self.set_tab_state(page, "connecting...")
+        self.thread_pool.start(worker)
+
+    def on_connected(self, page):
+        """Позначення вкладки з'єднаною та завантаження її таблиці, якщо вона вже показана"""
+        del self.connect_workers[page]
+        tab, name = self.table_tabs[page]
+        tab.connected = True
+        self.set_tab_state(page)
+        self.report_startup(f"{name} connected")
+        if self.tabWidget.currentWidget() is page:
+            self.load_tab(page)
+
+    def on_connect_failed(self, page, error):
+        """Повідомлення про невдале з'єднання; повторна спроба - під час наступного показу вкладки"""
+        del self.connect_workers[page]
+        _, name = self.table_tabs[page]
+        self.set_tab_state(page, "connection failed")
+        self.logger.error_message_box(f"{name} connection error! {error}")
+
+    def load_tab(self, page):
+        """Завантаження таблиці вкладки під час її першого показу"""
+        tab, name = self.table_tabs[page]
+        if tab.loaded:
+            return
+        if tab in self.busy_tabs:
+            #   З'єднання таблиці зараз використовує фонова задача (під час експорту в SQLite - проміжна БД),
+            #   таблиця завантажиться після її завершення
+            self.set_tab_state(page, "waiting for task...")
+            return
+        self.set_tab_state(page, "loading...")
+        tab.ensure_loaded()
+        self.set_tab_state(page)
+        if tab.loaded:
+            self.report_startup(f"{name} table loaded")
+
+    def on_tab_changed(self, index):
+        """Завантаження таблиці під час першого показу вкладки та оновлення панелі діагностики"""
+        page = self.tabWidget.widget(index)
+        if page is self.tab_4:
+            self.diagnostics.refresh()
+            return
+        tab, _ = self.table_tabs[page]
+        if tab.connected:
+            self.load_tab(page)
+        else:
+            self.start_connect(page, tab.database)
+
+    def require_connected(self, *tabs):
+        """Перевірка, що з'єднання з усіма БД задачі вже відкриті"""
+        for page, (tab, name) in self.table_tabs.items():
+            if tab in tabs and not tab.connected:
+                self.logger.log(f"{name} is not connected yet", tag="WARNING")
+                self.start_connect(page, tab.database)
+                return False
+        return True
+
+    def closeEvent(self, event):
+        """Запис відкладених змін перед закриттям вікна"""
+        self.mysqlTab.apply_edits()
+        self.postgresqlTab.apply_edits()
+        super(MainWindow, self).closeEvent(event)
+
+    def migrate_to_postgresql(self):
+        """Фонова міграція таблиці MySQL у PostgreSQL"""
+        if not self.require_connected(self.mysqlTab, self.postgresqlTab):
+            return
+        self.mysqlTab.apply_edits()
+        self.start_migration(
+            Worker(
+                self.dbPostgreSQL.sync_from_mysql if self.incremental_sync_checkbox.isChecked()
+                else self.dbPostgreSQL.migrate_from_mysql,
+                self.dbMySql
+            ),
+            tabs=[self.postgresqlTab],
+            on_finished=lambda stats: self.on_migration_finished(
+                self.postgresqlTab, f"Successfully exported MySQL table data to PostgreSQL: {stats}"
+            )
         )
-        self.export_fields_button.clicked.connect(
-            self.dbPostgreSQL.export_to_sqlite(self.export_fields_lineedit, self.dbSQLite)
+
+    def export_to_sqlite(self):
+        """Фоновий експорт вибраних полів таблиці PostgreSQL у SQLite"""
+        if not self.require_connected(self.postgresqlTab, self.sqliteTab):
+            return
+        #   Поля для експорту перевіряються за стовпцями таблиці PostgreSQL
+        self.postgresqlTab.ensure_loaded()
+        self.postgresqlTab.apply_edits()
+        export_fields = self.dbPostgreSQL.parse_export_fields(self.export_fields_lineedit.text())
+        if export_fields is None:
+            return
+        self.start_migration(
+            Worker(
+                self.dbSQLite.sync_from_postgresql if self.incremental_sync_checkbox.isChecked()
+                else self.dbSQLite.migrate_from_postgresql,
+                self.dbPostgreSQL, export_fields
+            ),
+            tabs=[self.sqliteTab],
+            on_finished=lambda stats: self.on_migration_finished(
+                self.sqliteTab, f"Successfully migrated fields {export_fields} to SQLite: {stats}"
+            )
         )
-        self.show()
+
+    def create_search_indexes(self):
+        """Фонове створення індексів для фільтрів, сортування та пошуку в усіх трьох БД"""
+        if not self.require_connected(self.mysqlTab, self.postgresqlTab, self.sqliteTab):
+            return
+
+        def create_all(task=None):
+            self.dbMySql.create_search_indexes(task)
+            self.dbPostgreSQL.create_search_indexes(task)
+            self.dbSQLite.create_search_indexes(task)
+
+        tabs = [self.mysqlTab, self.postgresqlTab, self.sqliteTab]
+        self.start_migration(
+            Worker(create_all),
+            tabs=tabs,
+            on_finished=lambda result: self.on_indexes_created(tabs),
+            changes_data=False
+        )
+
+    def on_indexes_created(self, tabs):
+        """Оновлення таблиць після створення індексів"""
+        #   Відкладені вкладки завантажує finish_migration, оновлюються лише вже завантажені
+        loaded_tabs = [tab for tab in tabs if tab.loaded]
+        self.finish_migration("Done")
+        self.migration_progress.setValue(100)
+        for tab in loaded_tabs:
+            tab.refresh()
+        self.logger.log("Search indexes created")
+
+    def verify_copies(self):
+        """Фонова перевірка копій MySQL -> PostgreSQL та PostgreSQL -> SQLite за контрольними сумами"""
+        if not self.require_connected(self.mysqlTab, self.postgresqlTab):
+            return
+
+        def verify_all(task=None):
+            results = [("MySQL -> PostgreSQL", self.dbPostgreSQL.verify_against_mysql(self.dbMySql, task))]
+            if self.dbSQLite.table_exists():
+                results.append(
+                    ("PostgreSQL -> SQLite", self.dbSQLite.verify_against_postgresql(self.dbPostgreSQL, task))
+                )
+            return results
+
+        self.start_migration(
+            Worker(verify_all),
+            tabs=[self.mysqlTab, self.postgresqlTab, self.sqliteTab],
+            on_finished=self.on_verified,
+            changes_data=False
+        )
+
+    def on_verified(self, results):
+        """Запис результатів перевірки копій у лог"""
+        matched = all(stats.ok for _, stats in results)
+        self.finish_migration("Tables match" if matched else "Tables differ")
+        self.migration_progress.setValue(100)
+        for name, stats in results:
+            self.logger.log(f"Verification {name}: {stats}", tag="INFO" if stats.ok else "WARNING")
+
+    def start_migration(self, worker: Worker, tabs, on_finished, changes_data=True):
+        """Запуск міграції у фоновому потоці; цільова таблиця блокується до її завершення"""
+        if self.worker is not None:
+            self.logger.log("Another migration is already running", tag="WARNING")
+            return
+        self.worker = worker
+        #   Кеш сторінок скидається і після помилки, бо синхронізація фіксує блоки окремими транзакціями
+        self.changed_tabs = tabs if changes_data else []
+        self.set_busy(tabs, True)
+        worker.signals.progress.connect(self.on_migration_progress)
+        worker.signals.finished.connect(on_finished)
+        worker.signals.failed.connect(self.on_migration_failed)
+        worker.signals.cancelled.connect(self.on_migration_cancelled)
+        self.migration_progress.setRange(0, 0)
+        self.migration_status.setText("Migration started...")
+        self.cancel_migration_button.setEnabled(True)
+        self.thread_pool.start(worker)
+
+    def set_busy(self, tabs, busy):
+        """Блокування таблиць, які перестворює фонова задача"""
+        for tab in tabs:
+            if busy:
+                #   Відкладені зміни записуються до того, як таблицю перестворить міграція
+                tab.apply_edits()
+            tab.model.suspended = busy
+            tab.tableView.setEnabled(not busy)
+        self.export_to_postgres_button.setEnabled(not busy)
+        self.export_fields_button.setEnabled(not busy)
+        self.create_indexes_button.setEnabled(not busy)
+        self.verify_button.setEnabled(not busy)
+        self.incremental_sync_checkbox.setEnabled(not busy)
+        self.busy_tabs = tabs if busy else []
+
+    def finish_migration(self, status):
+        """Розблокування інтерфейсу після завершення фонової задачі"""
+        for tab in self.changed_tabs:
+            tab.invalidate_cache()
+        self.changed_tabs = []
+        busy_pages = [page for page, (tab, _) in self.table_tabs.items() if tab in self.busy_tabs]
+        self.set_busy(self.busy_tabs, False)
+        #   Завантаження вкладок, показ яких було відкладено до завершення задачі
+        for page in busy_pages:
+            tab, _ = self.table_tabs[page]
+            if tab.loaded or not tab.connected:
+                continue
+            self.set_tab_state(page)
+            if self.tabWidget.currentWidget() is page:
+                self.load_tab(page)
+        self.worker = None
+        self.migration_progress.setRange(0, 100)
+        self.migration_status.setText(status)
+        self.cancel_migration_button.setEnabled(False)
+
+    def cancel_migration(self):
+        """Скасування поточної міграції з відкатом транзакції"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.migration_status.setText("Cancelling...")
+            self.cancel_migration_button.setEnabled(False)
+
+    def on_migration_progress(self, rows, rows_per_second, eta):
+        """Зображення прогресу міграції"""
+        total_rows = self.worker.total_rows if self.worker is not None else None
+        if total_rows:
+            self.migration_progress.setRange(0, 100)
+            self.migration_progress.setValue(min(int(rows * 100 / total_rows), 99))
+        eta_text = f", ETA {eta:.0f}s" if eta >= 0 else ""
+        self.migration_status.setText(f"{rows} rows, {rows_per_second:.0f} rows/s{eta_text}")
+
+    def on_migration_finished(self, tab: TableTab, message):
+        """Оновлення цільової таблиці після успішної міграції"""
+        was_loaded = tab.loaded
+        self.finish_migration("Done")
+        self.migration_progress.setValue(100)
+        if was_loaded:
+            tab.refresh()
+        self.logger.log(message)
+
+    def on_migration_failed(self, error):
+        """Повідомлення про помилку міграції"""
+        self.finish_migration("Failed")
+        self.migration_progress.setValue(0)
+        self.logger.error_message_box(f"Migration error! {error}")
+
+    def on_migration_cancelled(self):
+        """Повідомлення про скасування міграції"""
+        self.finish_migration("Cancelled")
+        self.migration_progress.setValue(0)
+        self.logger.log("Migration cancelled, changes rolled back", tag="WARNING")
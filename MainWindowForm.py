@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'MainWindowForm.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1500, 900)
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.tabWidget = QtWidgets.QTabWidget(self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.tabWidget.sizePolicy().hasHeightForWidth())
+        self.tabWidget.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.tabWidget.setFont(font)
+        self.tabWidget.setObjectName("tabWidget")
+        self.tab = QtWidgets.QWidget()
+        self.tab.setObjectName("tab")
+        self.gridLayout = QtWidgets.QGridLayout(self.tab)
+        self.gridLayout.setObjectName("gridLayout")
+        self.mysql_table = QtWidgets.QTableView(self.tab)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(1)
+        sizePolicy.setVerticalStretch(1)
+        sizePolicy.setHeightForWidth(self.mysql_table.sizePolicy().hasHeightForWidth())
+        self.mysql_table.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.mysql_table.setFont(font)
+        self.mysql_table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.mysql_table.setObjectName("mysql_table")
+        self.mysql_table.horizontalHeader().setDefaultSectionSize(150)
+        self.gridLayout.addWidget(self.mysql_table, 0, 0, 1, 1)
+        self.export_to_postgres_button = QtWidgets.QPushButton(self.tab)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.export_to_postgres_button.sizePolicy().hasHeightForWidth())
+        self.export_to_postgres_button.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.export_to_postgres_button.setFont(font)
+        self.export_to_postgres_button.setObjectName("export_to_postgres_button")
+        self.gridLayout.addWidget(self.export_to_postgres_button, 1, 0, 1, 1)
+        self.mysql_apply_button = QtWidgets.QPushButton(self.tab)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.mysql_apply_button.sizePolicy().hasHeightForWidth())
+        self.mysql_apply_button.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.mysql_apply_button.setFont(font)
+        self.mysql_apply_button.setObjectName("mysql_apply_button")
+        self.gridLayout.addWidget(self.mysql_apply_button, 2, 0, 1, 1)
+        self.mysql_filter_layout = QtWidgets.QHBoxLayout()
+        self.mysql_filter_layout.setObjectName("mysql_filter_layout")
+        self.mysql_price_label = QtWidgets.QLabel(self.tab)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.mysql_price_label.setFont(font)
+        self.mysql_price_label.setObjectName("mysql_price_label")
+        self.mysql_filter_layout.addWidget(self.mysql_price_label)
+        self.mysql_price_min = QtWidgets.QLineEdit(self.tab)
+        self.mysql_price_min.setMaximumSize(QtCore.QSize(100, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.mysql_price_min.setFont(font)
+        self.mysql_price_min.setObjectName("mysql_price_min")
+        self.mysql_filter_layout.addWidget(self.mysql_price_min)
+        self.mysql_price_to_label = QtWidgets.QLabel(self.tab)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.mysql_price_to_label.setFont(font)
+        self.mysql_price_to_label.setObjectName("mysql_price_to_label")
+        self.mysql_filter_layout.addWidget(self.mysql_price_to_label)
+        self.mysql_price_max = QtWidgets.QLineEdit(self.tab)
+        self.mysql_price_max.setMaximumSize(QtCore.QSize(100, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.mysql_price_max.setFont(font)
+        self.mysql_price_max.setObjectName("mysql_price_max")
+        self.mysql_filter_layout.addWidget(self.mysql_price_max)
+        self.mysql_search_label = QtWidgets.QLabel(self.tab)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.mysql_search_label.setFont(font)
+        self.mysql_search_label.setObjectName("mysql_search_label")
+        self.mysql_filter_layout.addWidget(self.mysql_search_label)
+        self.mysql_search = QtWidgets.QLineEdit(self.tab)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.mysql_search.setFont(font)
+        self.mysql_search.setObjectName("mysql_search")
+        self.mysql_filter_layout.addWidget(self.mysql_search)
+        self.mysql_filter_button = QtWidgets.QPushButton(self.tab)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.mysql_filter_button.setFont(font)
+        self.mysql_filter_button.setObjectName("mysql_filter_button")
+        self.mysql_filter_layout.addWidget(self.mysql_filter_button)
+        self.gridLayout.addLayout(self.mysql_filter_layout, 3, 0, 1, 1)
+        self.tabWidget.addTab(self.tab, "")
+        self.tab_2 = QtWidgets.QWidget()
+        self.tab_2.setObjectName("tab_2")
+        self.gridLayout_3 = QtWidgets.QGridLayout(self.tab_2)
+        self.gridLayout_3.setObjectName("gridLayout_3")
+        self.postgresql_table = QtWidgets.QTableView(self.tab_2)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(1)
+        sizePolicy.setVerticalStretch(1)
+        sizePolicy.setHeightForWidth(self.postgresql_table.sizePolicy().hasHeightForWidth())
+        self.postgresql_table.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.postgresql_table.setFont(font)
+        self.postgresql_table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.postgresql_table.setObjectName("postgresql_table")
+        self.postgresql_table.horizontalHeader().setDefaultSectionSize(150)
+        self.gridLayout_3.addWidget(self.postgresql_table, 0, 0, 1, 1)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setSizeConstraint(QtWidgets.QLayout.SetFixedSize)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.label = QtWidgets.QLabel(self.tab_2)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label.sizePolicy().hasHeightForWidth())
+        self.label.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.label.setFont(font)
+        self.label.setObjectName("label")
+        self.horizontalLayout.addWidget(self.label)
+        self.export_fields_lineedit = QtWidgets.QLineEdit(self.tab_2)
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.export_fields_lineedit.setFont(font)
+        self.export_fields_lineedit.setObjectName("export_fields_lineedit")
+        self.horizontalLayout.addWidget(self.export_fields_lineedit)
+        self.export_fields_button = QtWidgets.QPushButton(self.tab_2)
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.export_fields_button.setFont(font)
+        self.export_fields_button.setObjectName("export_fields_button")
+        self.horizontalLayout.addWidget(self.export_fields_button)
+        self.gridLayout_3.addLayout(self.horizontalLayout, 1, 0, 1, 1)
+        self.postgresql_apply_button = QtWidgets.QPushButton(self.tab_2)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.postgresql_apply_button.sizePolicy().hasHeightForWidth())
+        self.postgresql_apply_button.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.postgresql_apply_button.setFont(font)
+        self.postgresql_apply_button.setObjectName("postgresql_apply_button")
+        self.gridLayout_3.addWidget(self.postgresql_apply_button, 2, 0, 1, 1)
+        self.postgresql_filter_layout = QtWidgets.QHBoxLayout()
+        self.postgresql_filter_layout.setObjectName("postgresql_filter_layout")
+        self.postgresql_price_label = QtWidgets.QLabel(self.tab_2)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.postgresql_price_label.setFont(font)
+        self.postgresql_price_label.setObjectName("postgresql_price_label")
+        self.postgresql_filter_layout.addWidget(self.postgresql_price_label)
+        self.postgresql_price_min = QtWidgets.QLineEdit(self.tab_2)
+        self.postgresql_price_min.setMaximumSize(QtCore.QSize(100, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.postgresql_price_min.setFont(font)
+        self.postgresql_price_min.setObjectName("postgresql_price_min")
+        self.postgresql_filter_layout.addWidget(self.postgresql_price_min)
+        self.postgresql_price_to_label = QtWidgets.QLabel(self.tab_2)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.postgresql_price_to_label.setFont(font)
+        self.postgresql_price_to_label.setObjectName("postgresql_price_to_label")
+        self.postgresql_filter_layout.addWidget(self.postgresql_price_to_label)
+        self.postgresql_price_max = QtWidgets.QLineEdit(self.tab_2)
+        self.postgresql_price_max.setMaximumSize(QtCore.QSize(100, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.postgresql_price_max.setFont(font)
+        self.postgresql_price_max.setObjectName("postgresql_price_max")
+        self.postgresql_filter_layout.addWidget(self.postgresql_price_max)
+        self.postgresql_search_label = QtWidgets.QLabel(self.tab_2)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.postgresql_search_label.setFont(font)
+        self.postgresql_search_label.setObjectName("postgresql_search_label")
+        self.postgresql_filter_layout.addWidget(self.postgresql_search_label)
+        self.postgresql_search = QtWidgets.QLineEdit(self.tab_2)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.postgresql_search.setFont(font)
+        self.postgresql_search.setObjectName("postgresql_search")
+        self.postgresql_filter_layout.addWidget(self.postgresql_search)
+        self.postgresql_filter_button = QtWidgets.QPushButton(self.tab_2)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.postgresql_filter_button.setFont(font)
+        self.postgresql_filter_button.setObjectName("postgresql_filter_button")
+        self.postgresql_filter_layout.addWidget(self.postgresql_filter_button)
+        self.gridLayout_3.addLayout(self.postgresql_filter_layout, 3, 0, 1, 1)
+        self.tabWidget.addTab(self.tab_2, "")
+        self.tab_3 = QtWidgets.QWidget()
+        self.tab_3.setObjectName("tab_3")
+        self.gridLayout_4 = QtWidgets.QGridLayout(self.tab_3)
+        self.gridLayout_4.setObjectName("gridLayout_4")
+        self.sqlite_table = QtWidgets.QTableView(self.tab_3)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(1)
+        sizePolicy.setVerticalStretch(1)
+        sizePolicy.setHeightForWidth(self.sqlite_table.sizePolicy().hasHeightForWidth())
+        self.sqlite_table.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.sqlite_table.setFont(font)
+        self.sqlite_table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.sqlite_table.setObjectName("sqlite_table")
+        self.sqlite_table.horizontalHeader().setDefaultSectionSize(150)
+        self.gridLayout_4.addWidget(self.sqlite_table, 0, 0, 1, 1)
+        self.sqlite_filter_layout = QtWidgets.QHBoxLayout()
+        self.sqlite_filter_layout.setObjectName("sqlite_filter_layout")
+        self.sqlite_price_label = QtWidgets.QLabel(self.tab_3)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.sqlite_price_label.setFont(font)
+        self.sqlite_price_label.setObjectName("sqlite_price_label")
+        self.sqlite_filter_layout.addWidget(self.sqlite_price_label)
+        self.sqlite_price_min = QtWidgets.QLineEdit(self.tab_3)
+        self.sqlite_price_min.setMaximumSize(QtCore.QSize(100, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.sqlite_price_min.setFont(font)
+        self.sqlite_price_min.setObjectName("sqlite_price_min")
+        self.sqlite_filter_layout.addWidget(self.sqlite_price_min)
+        self.sqlite_price_to_label = QtWidgets.QLabel(self.tab_3)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.sqlite_price_to_label.setFont(font)
+        self.sqlite_price_to_label.setObjectName("sqlite_price_to_label")
+        self.sqlite_filter_layout.addWidget(self.sqlite_price_to_label)
+        self.sqlite_price_max = QtWidgets.QLineEdit(self.tab_3)
+        self.sqlite_price_max.setMaximumSize(QtCore.QSize(100, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.sqlite_price_max.setFont(font)
+        self.sqlite_price_max.setObjectName("sqlite_price_max")
+        self.sqlite_filter_layout.addWidget(self.sqlite_price_max)
+        self.sqlite_search_label = QtWidgets.QLabel(self.tab_3)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.sqlite_search_label.setFont(font)
+        self.sqlite_search_label.setObjectName("sqlite_search_label")
+        self.sqlite_filter_layout.addWidget(self.sqlite_search_label)
+        self.sqlite_search = QtWidgets.QLineEdit(self.tab_3)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.sqlite_search.setFont(font)
+        self.sqlite_search.setObjectName("sqlite_search")
+        self.sqlite_filter_layout.addWidget(self.sqlite_search)
+        self.sqlite_filter_button = QtWidgets.QPushButton(self.tab_3)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.sqlite_filter_button.setFont(font)
+        self.sqlite_filter_button.setObjectName("sqlite_filter_button")
+        self.sqlite_filter_layout.addWidget(self.sqlite_filter_button)
+        self.gridLayout_4.addLayout(self.sqlite_filter_layout, 1, 0, 1, 1)
+        self.tabWidget.addTab(self.tab_3, "")
+        self.tab_4 = QtWidgets.QWidget()
+        self.tab_4.setObjectName("tab_4")
+        self.gridLayout_5 = QtWidgets.QGridLayout(self.tab_4)
+        self.gridLayout_5.setObjectName("gridLayout_5")
+        self.diagnostics_table = QtWidgets.QTableWidget(self.tab_4)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(1)
+        sizePolicy.setVerticalStretch(2)
+        sizePolicy.setHeightForWidth(self.diagnostics_table.sizePolicy().hasHeightForWidth())
+        self.diagnostics_table.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.diagnostics_table.setFont(font)
+        self.diagnostics_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.diagnostics_table.setObjectName("diagnostics_table")
+        self.diagnostics_table.setColumnCount(0)
+        self.diagnostics_table.setRowCount(0)
+        self.gridLayout_5.addWidget(self.diagnostics_table, 0, 0, 1, 1)
+        self.slow_queries_view = QtWidgets.QPlainTextEdit(self.tab_4)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(1)
+        sizePolicy.setVerticalStretch(1)
+        sizePolicy.setHeightForWidth(self.slow_queries_view.sizePolicy().hasHeightForWidth())
+        self.slow_queries_view.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.slow_queries_view.setFont(font)
+        self.slow_queries_view.setReadOnly(True)
+        self.slow_queries_view.setObjectName("slow_queries_view")
+        self.gridLayout_5.addWidget(self.slow_queries_view, 1, 0, 1, 1)
+        self.diagnostics_buttons_layout = QtWidgets.QHBoxLayout()
+        self.diagnostics_buttons_layout.setObjectName("diagnostics_buttons_layout")
+        self.diagnostics_refresh_button = QtWidgets.QPushButton(self.tab_4)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.diagnostics_refresh_button.setFont(font)
+        self.diagnostics_refresh_button.setObjectName("diagnostics_refresh_button")
+        self.diagnostics_buttons_layout.addWidget(self.diagnostics_refresh_button)
+        self.diagnostics_reset_button = QtWidgets.QPushButton(self.tab_4)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.diagnostics_reset_button.setFont(font)
+        self.diagnostics_reset_button.setObjectName("diagnostics_reset_button")
+        self.diagnostics_buttons_layout.addWidget(self.diagnostics_reset_button)
+        self.diagnostics_export_button = QtWidgets.QPushButton(self.tab_4)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.diagnostics_export_button.setFont(font)
+        self.diagnostics_export_button.setObjectName("diagnostics_export_button")
+        self.diagnostics_buttons_layout.addWidget(self.diagnostics_export_button)
+        self.gridLayout_5.addLayout(self.diagnostics_buttons_layout, 2, 0, 1, 1)
+        self.tabWidget.addTab(self.tab_4, "")
+        self.gridLayout_2.addWidget(self.tabWidget, 0, 0, 1, 1)
+        self.progressLayout = QtWidgets.QHBoxLayout()
+        self.progressLayout.setObjectName("progressLayout")
+        self.create_indexes_button = QtWidgets.QPushButton(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.create_indexes_button.setFont(font)
+        self.create_indexes_button.setObjectName("create_indexes_button")
+        self.progressLayout.addWidget(self.create_indexes_button)
+        self.verify_button = QtWidgets.QPushButton(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.verify_button.setFont(font)
+        self.verify_button.setObjectName("verify_button")
+        self.progressLayout.addWidget(self.verify_button)
+        self.incremental_sync_checkbox = QtWidgets.QCheckBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.incremental_sync_checkbox.setFont(font)
+        self.incremental_sync_checkbox.setObjectName("incremental_sync_checkbox")
+        self.progressLayout.addWidget(self.incremental_sync_checkbox)
+        self.migration_progress = QtWidgets.QProgressBar(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.migration_progress.setFont(font)
+        self.migration_progress.setProperty("value", 0)
+        self.migration_progress.setObjectName("migration_progress")
+        self.progressLayout.addWidget(self.migration_progress)
+        self.migration_status = QtWidgets.QLabel(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.migration_status.setFont(font)
+        self.migration_status.setText("")
+        self.migration_status.setObjectName("migration_status")
+        self.progressLayout.addWidget(self.migration_status)
+        self.cancel_migration_button = QtWidgets.QPushButton(self.centralwidget)
+        self.cancel_migration_button.setEnabled(False)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.cancel_migration_button.setFont(font)
+        self.cancel_migration_button.setObjectName("cancel_migration_button")
+        self.progressLayout.addWidget(self.cancel_migration_button)
+        self.gridLayout_2.addLayout(self.progressLayout, 1, 0, 1, 1)
+        self.log_view = QtWidgets.QPlainTextEdit(self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(1)
+        sizePolicy.setHeightForWidth(self.log_view.sizePolicy().hasHeightForWidth())
+        self.log_view.setSizePolicy(sizePolicy)
+        self.log_view.setMinimumSize(QtCore.QSize(0, 200))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.log_view.setFont(font)
+        self.log_view.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.log_view.setReadOnly(True)
+        self.log_view.setTextInteractionFlags(QtCore.Qt.TextSelectableByKeyboard|QtCore.Qt.TextSelectableByMouse)
+        self.log_view.setObjectName("log_view")
+        self.gridLayout_2.addWidget(self.log_view, 2, 0, 1, 1)
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+        self.tabWidget.setCurrentIndex(0)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "MainWindow"))
+        self.export_to_postgres_button.setText(_translate("MainWindow", "Експорт таблиці у БД 2"))
+        self.mysql_apply_button.setText(_translate("MainWindow", "Застосувати зміни"))
+        self.mysql_price_label.setText(_translate("MainWindow", "Ціна від"))
+        self.mysql_price_min.setPlaceholderText(_translate("MainWindow", "min"))
+        self.mysql_price_to_label.setText(_translate("MainWindow", "до"))
+        self.mysql_price_max.setPlaceholderText(_translate("MainWindow", "max"))
+        self.mysql_search_label.setText(_translate("MainWindow", "Пошук"))
+        self.mysql_search.setPlaceholderText(_translate("MainWindow", "назва чи опис"))
+        self.mysql_filter_button.setText(_translate("MainWindow", "Знайти"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab), _translate("MainWindow", "БД 1"))
+        self.label.setText(_translate("MainWindow", "Вкажіть назви полів для експортування в БД 3 (через кому чи пробіл)"))
+        self.export_fields_button.setText(_translate("MainWindow", "Експортувати в БД 3"))
+        self.postgresql_apply_button.setText(_translate("MainWindow", "Застосувати зміни"))
+        self.postgresql_price_label.setText(_translate("MainWindow", "Ціна від"))
+        self.postgresql_price_min.setPlaceholderText(_translate("MainWindow", "min"))
+        self.postgresql_price_to_label.setText(_translate("MainWindow", "до"))
+        self.postgresql_price_max.setPlaceholderText(_translate("MainWindow", "max"))
+        self.postgresql_search_label.setText(_translate("MainWindow", "Пошук"))
+        self.postgresql_search.setPlaceholderText(_translate("MainWindow", "назва чи опис"))
+        self.postgresql_filter_button.setText(_translate("MainWindow", "Знайти"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_2), _translate("MainWindow", "БД 2"))
+        self.sqlite_price_label.setText(_translate("MainWindow", "Ціна від"))
+        self.sqlite_price_min.setPlaceholderText(_translate("MainWindow", "min"))
+        self.sqlite_price_to_label.setText(_translate("MainWindow", "до"))
+        self.sqlite_price_max.setPlaceholderText(_translate("MainWindow", "max"))
+        self.sqlite_search_label.setText(_translate("MainWindow", "Пошук"))
+        self.sqlite_search.setPlaceholderText(_translate("MainWindow", "назва чи опис"))
+        self.sqlite_filter_button.setText(_translate("MainWindow", "Знайти"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_3), _translate("MainWindow", "БД 3"))
+        self.slow_queries_view.setPlaceholderText(_translate("MainWindow", "Повільні запити"))
+        self.diagnostics_refresh_button.setText(_translate("MainWindow", "Оновити"))
+        self.diagnostics_reset_button.setToolTip(_translate("MainWindow", "Почати збір статистики запитів заново"))
+        self.diagnostics_reset_button.setText(_translate("MainWindow", "Скинути"))
+        self.diagnostics_export_button.setText(_translate("MainWindow", "Експорт у JSON"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_4), _translate("MainWindow", "Діагностика"))
+        self.create_indexes_button.setToolTip(_translate("MainWindow", "Створити індекси для фільтра за ціною, сортування та пошуку в усіх БД"))
+        self.create_indexes_button.setText(_translate("MainWindow", "Створити індекси"))
+        self.verify_button.setToolTip(_translate("MainWindow", "Порівняти таблиці MySQL, PostgreSQL та SQLite за контрольними сумами діапазонів id"))
+        self.verify_button.setText(_translate("MainWindow", "Перевірити копії"))
+        self.incremental_sync_checkbox.setToolTip(_translate("MainWindow", "Переносити лише нові, змінені та видалені рядки з моменту попередньої синхронізації"))
+        self.incremental_sync_checkbox.setText(_translate("MainWindow", "Інкрементна синхронізація"))
+        self.cancel_migration_button.setText(_translate("MainWindow", "Скасувати"))
@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from copy import copy
+
+from columnar import ColumnBatch
+
+
+class PageCache:
+    """Кеш сторінок рядків таблиць з витісненням найдавніше використаних (LRU) при перевищенні бюджету пам'яті.
+    Ключ сторінки - (таблиця, фільтр та сортування, останній рядок попередньої сторінки, розмір сторінки)"""
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        #   ключ -> (рядки ColumnBatch, розмір у байтах, фільтр сторінки); порядок словника - порядок використання
+        self.pages = OrderedDict()
+        self.size = 0
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.pages)
+
+    @staticmethod
+    def page_key(table_name, row_filter, column_names, after_row, limit):
+        """Ключ сторінки: попередня сторінка задається значенням стовпця сортування та id її останнього рядка"""
+        after_key = None
+        if after_row is not None:
+            after_key = (after_row[column_names.index(row_filter.sort_column)], after_row[column_names.index("id")])
+        return table_name, tuple(column_names), row_filter.key, after_key, limit
+
+    def fetch(self, table_name, row_filter, column_names, after_row, limit, load):
+        """Сторінка ColumnBatch з кешу або з БД через load(); порожні сторінки не кешуються,
+        бо так виглядає і помилка запиту. Модель таблиці зберігає ту саму сторінку без копіювання"""
+        key = self.page_key(table_name, row_filter, column_names, after_row, limit)
+        entry = self.pages.get(key)
+        if entry is not None:
+            self.pages.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        rows = load()
+        if not rows:
+            return rows
+        rows = ColumnBatch.from_rows(rows)
+        if self.budget_bytes:
+            #   Фільтр вкладки змінюється, тому зберігається його копія
+            self.put(key, rows, copy(row_filter))
+        return rows
+
+    def put(self, key, rows, row_filter):
+        """Додавання сторінки та витіснення найдавніше використаних сторінок понад бюджет"""
+        if not isinstance(rows, ColumnBatch):
+            rows = ColumnBatch.from_rows(rows)
+        size = rows.nbytes
+        if size > self.budget_bytes:
+            return
+        self.drop(key)
+        self.pages[key] = (rows, size, row_filter)
+        self.size += size
+        while self.size > self.budget_bytes:
+            self.drop(next(iter(self.pages)))
+
+    def drop(self, key):
+        """Видалення однієї сторінки з кешу"""
+        entry = self.pages.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def drop_where(self, predicate):
+        """Видалення сторінок, для яких predicate(ключ, рядки, фільтр) істинний"""
+        for key in [key for key, (rows, _, row_filter) in self.pages.items() if predicate(key, rows, row_filter)]:
+            self.drop(key)
+
+    def invalidate(self, table_name):
+        """Скидання всіх сторінок таблиці (наприклад, після міграції)"""
+        self.drop_where(lambda key, rows, row_filter: key[0] == table_name)
+
+    def clear(self):
+        self.pages.clear()
+        self.size = 0
+
+    def update_rows(self, table_name, id_index, fields, changed_columns):
+        """Заміна змінених рядків у сторінках; сторінки фільтрів та сортувань за зміненими стовпцями скидаються,
+        бо рядок міг перейти на іншу сторінку чи перестати відповідати фільтру"""
+        fields = {field[id_index]: tuple(field) for field in fields}
+        changed_columns = set(changed_columns)
+        for key, (rows, size, row_filter) in list(self.pages.items()):
+            if key[0] != table_name:
+                continue
+            if row_filter.columns & changed_columns:
+                self.drop(key)
+                continue
+            changes = {position: fields[field_id] for position, field_id in enumerate(rows.column(id_index))
+                       if field_id in fields}
+            if changes:
+                #   Сторінка незмінна (її ділить модель таблиці), тому замінюється перебудованою
+                self.pages[key] = (rows.replace(changes), size, row_filter)
+
+    def remove_rows(self, table_name, id_index, field_ids):
+        """Скидання сторінок з видаленими рядками; наступні сторінки не змінюються, бо їх ключ - рядок перед ними"""
+        field_ids = set(field_ids)
+        self.drop_where(
+            lambda key, rows, row_filter: key[0] == table_name and not field_ids.isdisjoint(rows.column(id_index))
+        )
+
+    def insert_row(self, table_name, id_index, field):
+        """Скидання сторінок, між межами яких потрапляє новий рядок. Місце рядка відоме лише при впорядкуванні
+        за id без фільтра, сторінки інших фільтрів скидаються повністю"""
+        field_id = field[id_index]
+
+        def contains(key, rows, row_filter):
+            if key[0] != table_name:
+                return False
+            if not row_filter.is_default:
+                return True
+            after_key, limit = key[3], key[4]
+            if after_key is not None and after_key[1] >= field_id:
+                return False
+            #   Неповна сторінка - остання, новий рядок з більшим id додається в її кінець
+            return len(rows) < limit or rows.value(len(rows) - 1, id_index) >= field_id
+
+        self.drop_where(contains)
@@ -0,0 +1,323 @@
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from config import DIAGNOSTICS
+
+#   Верхні межі інтервалів гістограми затримок у мс (останній інтервал - все, що довше)
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+NUMBER_PATTERN = re.compile(r"(?<![\w.])-?\d+(\.\d+)?([eE][-+]?\d+)?\b")
+STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+#   Логічні значення та NULL як елементи списку значень (але не IS NULL чи DEFAULT NULL)
+KEYWORD_LITERAL_PATTERN = re.compile(r"(?<=[(,])(\s*)(?:TRUE|FALSE|NULL)\b", re.IGNORECASE)
+VALUE_LIST_PATTERN = re.compile(r"\(\s*\?(\s*,\s*\?)*\s*\)")
+ROW_LIST_PATTERN = re.compile(r"\(\.\.\.\)(\s*,\s*\(\.\.\.\))+")
+PARAMETER_PATTERN = re.compile(r"%s|%\(\w+\)s")
+SPACE_PATTERN = re.compile(r"\s+")
+VALUES_PATTERN = re.compile(r"\bVALUES\s*\(", re.IGNORECASE)
+#   Частина запиту після списку значень, яку треба зберегти в ключі
+SUFFIX_PATTERN = re.compile(r"\)\s*(?:ON\s+CONFLICT|ON\s+DUPLICATE\s+KEY|RETURNING)\b", re.IGNORECASE)
+
+#   Довші запити скорочуються до нормалізації; з довгого запиту розбираються лише початок та кінець такої довжини
+LONG_SQL_CHARS = 1000
+SQL_SCAN_CHARS = 4000
+#   Найбільша довжина нормалізованого запиту (ключа статистики)
+MAX_KEY_CHARS = 1000
+
+
+#   Типи запитів, для яких rowcount - кількість вибраних, а не змінених рядків
+READ_STATEMENTS = ("SELECT", "WITH", "SHOW", "PRAGMA")
+
+
+def normalize_sql(sql):
+    """Запит без конкретних значень: літерали та параметри замінюються на ?, списки значень згортаються"""
+    #   Довгі запити (вставка сторінки значень через execute_values) не кешуються, щоб не тримати їх у пам'яті
+    if len(sql) > LONG_SQL_CHARS:
+        return _normalize_sql(shorten_sql(sql))
+    return _cached_normalize_sql(sql)
+
+
+def shorten_sql(sql):
+    """Довгий запит без списку значень: регулярні вирази не проходять мегабайти сторінки execute_values
+    чи багаторядкового INSERT, а всі сторінки одного запиту зводяться до одного ключа"""
+    head, tail = sql[:SQL_SCAN_CHARS], sql[-SQL_SCAN_CHARS:]
+    if isinstance(sql, bytes):
+        head, tail = head.decode(errors="replace"), tail.decode(errors="replace")
+    values = VALUES_PATTERN.search(head)
+    if values is None:
+        return head
+    suffix = None
+    for suffix in SUFFIX_PATTERN.finditer(tail):
+        pass
+    return head[:values.start()] + "VALUES (...), (...)" + (tail[suffix.start() + 1:] if suffix else "")
+
+
+@lru_cache(maxsize=1024)
+def _cached_normalize_sql(sql):
+    return _normalize_sql(sql)
+
+
+def _normalize_sql(sql):
+    if isinstance(sql, bytes):
+        sql = sql.decode(errors="replace")
+    sql = STRING_PATTERN.sub("?", sql)
+    sql = NUMBER_PATTERN.sub("?", sql)
+    sql = PARAMETER_PATTERN.sub("?", sql)
+    sql = KEYWORD_LITERAL_PATTERN.sub(r"\1?", sql)
+    sql = VALUE_LIST_PATTERN.sub("(...)", sql)
+    sql = ROW_LIST_PATTERN.sub("(...), ...", sql)
+    return SPACE_PATTERN.sub(" ", sql).strip()[:MAX_KEY_CHARS]
+
+
+def statement_type(normalized_sql):
+    """Тип запиту за першим ключовим словом (SELECT, INSERT, COPY, ...)"""
+    return normalized_sql.lstrip("(").split(" ", 1)[0].upper()
+
+
+class StatementStats:
+    """Зведена статистика одного нормалізованого запиту"""
+    def __init__(self, backend, sql):
+        self.backend = backend
+        self.sql = sql
+        self.type = statement_type(sql)
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        #   Час читання результату (fetch*) окремо від виконання, він важливий для потокового читання
+        self.fetch_seconds = 0.0
+        self.rows_affected = 0
+        self.rows_fetched = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, seconds, rows_affected, failed):
+        self.count += 1
+        self.errors += failed
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if rows_affected is not None and rows_affected > 0 and self.type not in READ_STATEMENTS:
+            self.rows_affected += rows_affected
+        milliseconds = seconds * 1000
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS_MS) and milliseconds > LATENCY_BUCKETS_MS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+
+    def percentile_ms(self, fraction):
+        """Наближений перцентиль затримки: верхня межа інтервалу гістограми (для останнього - максимум)"""
+        if not self.count:
+            return 0.0
+        threshold = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= threshold:
+                break
+        if bucket < len(LATENCY_BUCKETS_MS):
+            return min(LATENCY_BUCKETS_MS[bucket], self.max_seconds * 1000)
+        return self.max_seconds * 1000
+
+    def to_dict(self):
+        return {
+            "backend": self.backend,
+            "type": self.type,
+            "sql": self.sql,
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "avg_ms": round(self.total_seconds * 1000 / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile_ms(0.5), 3),
+            "p95_ms": round(self.percentile_ms(0.95), 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "fetch_ms": round(self.fetch_seconds * 1000, 3),
+            "rows_affected": self.rows_affected,
+            "rows_fetched": self.rows_fetched,
+            "histogram": dict(zip([f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + ["slower"], self.histogram)),
+        }
+
+
+class QueryStats:
+    """Статистика запитів усіх БД: гістограми затримок за запитами та журнал повільних запитів"""
+    def __init__(self, slow_query_ms, slow_log_size):
+        self.slow_query_ms = slow_query_ms
+        #   Записувати можуть фонові потоки міграції, читає панель діагностики в головному потоці
+        self.lock = threading.Lock()
+        self.statements = {}
+        self.slow_queries = deque(maxlen=slow_log_size)
+        self.started = time.time()
+        self.python_logger = logging.getLogger("database_app")
+
+    def record(self, backend, sql, seconds, rows_affected, failed=False):
+        """Запис одного виконання запиту; повертає ключ статистики для подальшого підрахунку прочитаних рядків"""
+        normalized_sql = normalize_sql(sql)
+        key = (backend, normalized_sql)
+        with self.lock:
+            statement = self.statements.get(key)
+            if statement is None:
+                statement = self.statements[key] = StatementStats(backend, normalized_sql)
+            statement.add(seconds, rows_affected, failed)
+            slow = self.slow_query_ms is not None and seconds * 1000 >= self.slow_query_ms
+            if slow:
+                self.slow_queries.append({
+                    "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "backend": backend,
+                    "type": statement.type,
+                    "sql": normalized_sql,
+                    "duration_ms": round(seconds * 1000, 3),
+                    "rows_affected": rows_affected,
+                    "failed": failed,
+                })
+        if slow:
+            self.python_logger.warning(f"Slow {backend} query ({seconds * 1000:.0f} ms): {normalized_sql[:200]}")
+        return key
+
+    def record_fetch(self, key, seconds, rows):
+        """Підрахунок рядків та часу читання результату запиту"""
+        with self.lock:
+            statement = self.statements.get(key)
+            if statement is not None:
+                statement.fetch_seconds += seconds
+                statement.rows_fetched += rows
+
+    def reset(self):
+        with self.lock:
+            self.statements = {}
+            self.slow_queries.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """Знімок статистики: запити впорядковані за сумарним часом, від найдовших"""
+        with self.lock:
+            statements = [statement.to_dict() for statement in self.statements.values()]
+            slow_queries = list(self.slow_queries)
+            started = self.started
+        statements.sort(key=lambda statement: statement["total_ms"] + statement["fetch_ms"], reverse=True)
+        return {
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started)),
+            "slow_query_ms": self.slow_query_ms,
+            "statements": statements,
+            "slow_queries": slow_queries,
+        }
+
+    def export_json(self, filename):
+        """Запис знімка статистики у файл JSON"""
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, ensure_ascii=False, indent=2)
+
+
+class InstrumentedCursor:
+    """Обгортка курсора будь-якого драйвера, що вимірює час виконання запитів та рахує рядки"""
+    def __init__(self, cursor, backend, stats: QueryStats):
+        self._cursor = cursor
+        self._backend = backend
+        self._stats = stats
+        self._key = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        #   Параметри курсора (наприклад, itersize) встановлюються курсору драйвера
+        if name.startswith("_"):
+            super().__setattr__(name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._cursor.__exit__(*exc_info)
+
+    def __iter__(self):
+        return self._timed_iter()
+
+    def _timed_call(self, method, sql, *args, **kwargs):
+        """Виконання запиту з вимірюванням часу; помилки також потрапляють у статистику"""
+        start = time.perf_counter()
+        try:
+            result = method(sql, *args, **kwargs)
+        except Exception:
+            self._key = self._stats.record(self._backend, sql, time.perf_counter() - start, None, failed=True)
+            raise
+        self._key = self._stats.record(
+            self._backend, sql, time.perf_counter() - start, getattr(self._cursor, "rowcount", None)
+        )
+        return result
+
+    def _timed_fetch(self, method, *args, single=False):
+        start = time.perf_counter()
+        rows = method(*args)
+        if self._key is not None:
+            count = (rows is not None) if single else len(rows)
+            self._stats.record_fetch(self._key, time.perf_counter() - start, count)
+        return rows
+
+    def _timed_iter(self):
+        #   Ітерація курсора драйвера (для серверного курсора - порціями itersize), час рахується сумарно
+        start = time.perf_counter()
+        count = 0
+        try:
+            for row in self._cursor:
+                count += 1
+                yield row
+        finally:
+            if self._key is not None:
+                self._stats.record_fetch(self._key, time.perf_counter() - start, count)
+
+    def execute(self, sql, *args, **kwargs):
+        result = self._timed_call(self._cursor.execute, sql, *args, **kwargs)
+        #   sqlite3 повертає курсор, щоб виклики можна було ланцюжити
+        return self if result is self._cursor else result
+
+    def executemany(self, sql, *args, **kwargs):
+        result = self._timed_call(self._cursor.executemany, sql, *args, **kwargs)
+        return self if result is self._cursor else result
+
+    def copy_expert(self, sql, *args, **kwargs):
+        return self._timed_call(self._cursor.copy_expert, sql, *args, **kwargs)
+
+    def fetchone(self):
+        return self._timed_fetch(self._cursor.fetchone, single=True)
+
+    def fetchmany(self, *args):
+        return self._timed_fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed_fetch(self._cursor.fetchall)
+
+
+class InstrumentedConnection:
+    """Обгортка з'єднання, курсори якого вимірюються; решта атрибутів передається з'єднанню драйвера"""
+    def __init__(self, connection, backend, stats: QueryStats):
+        self._connection = connection
+        self._backend = backend
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            super().__setattr__(name, value)
+        else:
+            setattr(self._connection, name, value)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._backend, self._stats)
+
+
+def instrument(connection, backend):
+    """З'єднання з вимірюванням запитів (або саме з'єднання, якщо статистику вимкнено)"""
+    if not DIAGNOSTICS["enabled"]:
+        return connection
+    return InstrumentedConnection(connection, backend, query_stats)
+
+
+query_stats = QueryStats(DIAGNOSTICS["slow_query_ms"], DIAGNOSTICS["slow_log_size"])
@@ -0,0 +1,82 @@
+import threading
+from contextlib import contextmanager
+
+
+class ColumnInfo:
+    """Опис стовпця таблиці: вид значень (converters), тип у БД, NULL та первинний ключ;
+    автоінкремент та значення за замовчуванням потрібні лише для міграції схеми"""
+    def __init__(self, name, kind, declared_type, nullable=True, primary_key=False, auto_increment=False,
+                 default=None):
+        self.name = name
+        self.kind = kind
+        self.declared_type = declared_type
+        self.nullable = nullable
+        self.primary_key = primary_key
+        self.auto_increment = auto_increment
+        self.default = default
+
+
+class TableSchema:
+    """Стовпці та індекси таблиці, прочитані з каталогу БД"""
+    def __init__(self, columns: [ColumnInfo], indexes=()):
+        self.columns = columns
+        self.column_names = [column.name for column in columns]
+        self.kinds = [column.kind for column in columns]
+        self.declared_types = [column.declared_type for column in columns]
+        self.indexes = set(indexes)
+        self._by_name = {column.name: column for column in columns}
+
+    @property
+    def exists(self):
+        return bool(self.columns)
+
+    @property
+    def id_index(self):
+        return self.column_names.index("id")
+
+    def column(self, name) -> ColumnInfo:
+        return self._by_name[name]
+
+    def kinds_of(self, names):
+        """Види значень заданих стовпців у заданому порядку"""
+        return [self._by_name[name].kind for name in names]
+
+
+class SchemaCatalog:
+    """Спільний кеш схем таблиць усіх БД. Схема читається з БД один раз і скидається лише після DDL
+    (міграції, створення індексів) або явного оновлення"""
+    def __init__(self):
+        #   Схеми читають і фонові міграції, і інтерфейс
+        self.lock = threading.Lock()
+        #   (БД, таблиця) -> TableSchema
+        self.tables = {}
+
+    def get(self, source, table_name, introspect) -> TableSchema:
+        """Схема з кешу або з БД через introspect(); відсутня таблиця не кешується"""
+        key = (source, table_name)
+        with self.lock:
+            schema = self.tables.get(key)
+        if schema is not None:
+            return schema
+        schema = introspect()
+        if schema.exists:
+            with self.lock:
+                self.tables[key] = schema
+        return schema
+
+    def invalidate(self, source, table_name=None):
+        """Скидання схеми таблиці (або всіх таблиць БД, якщо таблицю не вказано)"""
+        with self.lock:
+            for key in [key for key in self.tables if key[0] == source and table_name in (None, key[1])]:
+                del self.tables[key]
+
+    @contextmanager
+    def changing(self, source, table_name):
+        """Блок з DDL: схема скидається після нього, навіть після відкату, бо частину DDL могло бути зафіксовано"""
+        try:
+            yield
+        finally:
+            self.invalidate(source, table_name)
+
+
+schema_catalog = SchemaCatalog()
@@ -0,0 +1,217 @@
+from bisect import bisect_left
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush, QColor
+
+from columnar import PagedRows
+
+
+class TableModel(QAbstractTableModel):
+    """Модель таблиці БД з посторінковим (keyset) завантаженням рядків під час прокрутки"""
+    def __init__(self, fetch_page, page_size: int, update_field=None, create_row=False, delete_column=False,
+                 sort_rows=None):
+        super(TableModel, self).__init__()
+        #   fetch_page(after_row, limit) повертає наступну сторінку рядків після останнього завантаженого рядка
+        self.fetch_page = fetch_page
+        #   sort_rows(column, descending) перезавантажує таблицю з сортуванням на сервері
+        self.sort_rows = sort_rows
+        self.page_size = page_size
+        #   update_field(field_id, column, value) записує змінене значення комірки в БД
+        self.update_field = update_field
+        self.create_row = create_row
+        self.delete_column = delete_column
+        self.column_names = []
+        self.id_index = 0
+        #   Рядки впорядковані за зростанням id (можна шукати бінарним пошуком та вставляти на місце)
+        self.ordered_by_id = True
+        #   Завантажені сторінки зберігаються по стовпцях (ColumnBatch), кортеж рядка створюється при зверненні
+        self.rows = PagedRows()
+        self.has_more = False
+        self.new_item = []
+        self.row_offset = 1 if create_row else 0
+        #   Поки з'єднання зайняте фоновою задачею, нові сторінки не завантажуються
+        self.suspended = False
+        #   Комірки зі змінами, що ще не записані в БД: (id рядка, стовпець)
+        self.pending_cells = set()
+        self.pending_brush = QBrush(QColor(255, 244, 200))
+
+    def reset(self, column_names, id_index, ordered_by_id=True):
+        """Скидання моделі та завантаження першої сторінки"""
+        self.beginResetModel()
+        self.column_names = column_names
+        self.id_index = id_index
+        self.ordered_by_id = ordered_by_id
+        self.rows = PagedRows()
+        self.pending_cells = set()
+        self.new_item = ["" for _ in column_names]
+        self.has_more = True
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def is_create_row(self, row):
+        """Перевірка, чи є рядок рядком створення нового елемента"""
+        return self.create_row and row == 0
+
+    def is_delete_column(self, column):
+        """Перевірка, чи є стовпець стовпцем видалення елемента"""
+        return self.delete_column and column == len(self.column_names)
+
+    def field_id(self, row):
+        """id елемента, що зображений у заданому рядку"""
+        return self.rows.value(row - self.row_offset, self.id_index)
+
+    def find_row(self, field_id):
+        """Позиція рядка з заданим id серед завантажених"""
+        if not self.ordered_by_id:
+            ids = self.rows.column(self.id_index)
+            return ids.index(field_id) if field_id in ids else None
+        position = bisect_left(self.rows, field_id, key=lambda row: row[self.id_index])
+        if position < len(self.rows) and self.rows.value(position, self.id_index) == field_id:
+            return position
+        return None
+
+    def replace_row(self, field_id, values):
+        """Заміна значень одного рядка без перезавантаження таблиці"""
+        position = self.find_row(field_id)
+        if position is None:
+            return
+        self.rows[position] = tuple(values)
+        row = position + self.row_offset
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.column_names) - 1))
+
+    def set_cell(self, field_id, column, value):
+        """Зміна значення однієї комірки без перезавантаження таблиці"""
+        position = self.find_row(field_id)
+        if position is None:
+            return
+        values = list(self.rows[position])
+        values[column] = value
+        self.rows[position] = tuple(values)
+        index = self.index(position + self.row_offset, column)
+        self.dataChanged.emit(index, index)
+
+    def clear_pending(self):
+        """Зняття позначки з комірок, зміни яких записано або відкочено"""
+        pending_cells, self.pending_cells = self.pending_cells, set()
+        for field_id, column in pending_cells:
+            position = self.find_row(field_id)
+            if position is not None:
+                index = self.index(position + self.row_offset, column)
+                self.dataChanged.emit(index, index)
+
+    def insert_row(self, values):
+        """Вставка нового рядка на його місце за id (при іншому сортуванні таблицю перезавантажує TableTab)"""
+        if not self.ordered_by_id:
+            return
+        field_id = values[self.id_index]
+        position = bisect_left(self.rows, field_id, key=lambda row: row[self.id_index])
+        #   Рядок за межами завантаженої частини з'явиться під час наступного fetchMore
+        if position == len(self.rows) and self.has_more:
+            return
+        row = position + self.row_offset
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.insert(position, tuple(values))
+        self.endInsertRows()
+
+    def remove_rows(self, field_ids):
+        """Видалення кількох рядків: суцільні діапазони видаляються разом, починаючи з останнього"""
+        field_ids = set(field_ids)
+        positions = [position for position, field_id in enumerate(self.rows.column(self.id_index))
+                     if field_id in field_ids]
+        runs = []
+        for position in positions:
+            if runs and runs[-1][1] == position:
+                runs[-1][1] = position + 1
+            else:
+                runs.append([position, position + 1])
+        for start, stop in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), start + self.row_offset, stop - 1 + self.row_offset)
+            del self.rows[start:stop]
+            self.endRemoveRows()
+
+    def clear_new_item(self):
+        """Очищення рядка створення нового елемента"""
+        if not self.create_row:
+            return
+        self.new_item = ["" for _ in self.column_names]
+        self.dataChanged.emit(self.index(0, 0), self.index(0, len(self.column_names) - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows) + self.row_offset
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.column_names) + (1 if self.delete_column else 0)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignHCenter | Qt.AlignVCenter
+        if role == Qt.BackgroundRole:
+            if self.pending_cells and not self.is_create_row(index.row()) \
+                    and (self.field_id(index.row()), index.column()) in self.pending_cells:
+                return self.pending_brush
+            return None
+        if role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        row, column = index.row(), index.column()
+        if self.is_delete_column(column):
+            return "" if self.is_create_row(row) else "Delete item"
+        if self.is_create_row(row):
+            return self.new_item[column]
+        return str(self.rows.value(row - self.row_offset, column))
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.column_names[section] if section < len(self.column_names) else ""
+        return "New item:" if self.is_create_row(section) else ""
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if self.is_delete_column(index.column()):
+            return flags
+        if self.is_create_row(index.row()) or self.update_field is not None:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, column = index.row(), index.column()
+        if self.is_create_row(row):
+            self.new_item[column] = value
+            self.dataChanged.emit(index, index)
+            return True
+        if self.update_field is None:
+            return False
+        return bool(self.update_field(self.field_id(row), column, value))
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if self.sort_rows is None or column < 0 or column >= len(self.column_names):
+            return
+        self.sort_rows(self.column_names[column], order == Qt.DescendingOrder)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more and not self.suspended
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        #   Сторінка читається синхронно: fetch_page працює на курсорі вкладки, яким GUI-потік користується
+        #   і для змін, а помилку показує вікном повідомлення. Запит сторінки - індексований keyset на page_size
+        #   рядків (або з кешу), тож він короткий; довгі задачі виконуються у фоні, поки вкладка призупинена
+        page =self.fetch_page(self.rows[-1] if self.rows else None, self.page_size)
+        if len(page) < self.page_size:
+            self.has_more = False
+        if not page:
+            return
+        first_row = len(self.rows) + self.row_offset
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(page) - 1)
+        self.rows.extend(page)
+        self.endInsertRows()
@@ -0,0 +1,249 @@
+from PyQt5.QtWidgets import QTableView, QPushButton, QLineEdit, QShortcut, QAction, QApplication, QMessageBox
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import QModelIndex, QTimer, Qt
+
+from config import TABLE_VIEW
+from converters import INTEGER, parse_text
+from EditSession import EditSession
+from PageCache import PageCache
+from SchemaCatalog import schema_catalog
+from TableModel import TableModel
+from utils import RowFilter
+
+
+class TableTab:
+    """Вкладка з таблицею БД: зв'язує модель з посторінковим завантаженням з операціями бази даних"""
+    def __init__(self, database, table_view: QTableView, editable=False, create_row=False, delete_column=False,
+                 apply_button: QPushButton | None = None):
+        self.database = database
+        self.tableView = table_view
+        #   З'єднання з БД відкривається у фоні, а дані завантажуються, коли вкладку вперше показано
+        self.connected = False
+        self.loaded = False
+        #   Змінені комірки записуються пакетом після паузи в редагуванні або кнопкою застосування
+        self.edits = EditSession()
+        self.edit_timer = QTimer()
+        self.edit_timer.setSingleShot(True)
+        self.edit_timer.timeout.connect(self.apply_edits)
+        self.apply_button = apply_button
+        if apply_button is not None:
+            apply_button.clicked.connect(self.apply_edits)
+            apply_button.setEnabled(False)
+        #   Фільтр, пошук та сортування виконуються на сервері
+        self.row_filter = RowFilter()
+        self.price_min_edit = self.price_max_edit = self.search_edit = None
+        #   Прочитані сторінки; записи з цієї вкладки та міграції скидають лише змінені сторінки
+        self.page_cache = PageCache(TABLE_VIEW["page_cache_mib"] * 1024 * 1024)
+        self.model = TableModel(
+            fetch_page=self.fetch_page,
+            page_size=TABLE_VIEW["page_size"],
+            update_field=self.update_field if editable else None,
+            create_row=create_row,
+            delete_column=delete_column,
+            sort_rows=self.sort_rows
+        )
+        self.tableView.setModel(self.model)
+        #   Натискання на заголовок стовпця сортує таблицю на сервері
+        self.tableView.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.tableView.setSortingEnabled(True)
+        #   Обробка натискання на комірку видалення елемента
+        if delete_column:
+            self.tableView.clicked.connect(self.on_table_clicked)
+            self.add_action("Delete selected rows", QKeySequence.Delete, self.delete_selected)
+        #   Рядки, скопійовані з іншої таблиці чи Excel, вставляються одним пакетом
+        if create_row:
+            self.add_action("Paste rows", QKeySequence.Paste, self.paste_rows)
+        #   Схема таблиці кешується, тож зміни, зроблені поза програмою, підхоплюються явним оновленням (F5)
+        self.refresh_shortcut = QShortcut(QKeySequence.Refresh, self.tableView, self.reload)
+        self.refresh_shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+
+    def add_action(self, text, shortcut, slot):
+        """Дія в контекстному меню таблиці з комбінацією клавіш, що діє, поки фокус у таблиці"""
+        action = QAction(text, self.tableView)
+        action.setShortcut(shortcut)
+        action.setShortcutContext(Qt.WidgetWithChildrenShortcut)
+        action.triggered.connect(slot)
+        self.tableView.addAction(action)
+        self.tableView.setContextMenuPolicy(Qt.ActionsContextMenu)
+
+    def update_table_widget(self):
+        """Оновити PyQt віджет для зображення бази даних"""
+        self.apply_edits()
+        if not self.database.load_columns():
+            return
+        self.loaded = True
+        #   Після міграції вибраного для сортування стовпця може вже не бути
+        if self.row_filter.sort_column not in self.database.column_names:
+            self.row_filter.sort_column, self.row_filter.descending = "id", False
+            self.tableView.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.model.reset(
+            self.database.column_names,
+            self.database.id_index,
+            ordered_by_id=self.row_filter.sort_column == "id" and not self.row_filter.descending
+        )
+        if self.model.create_row:
+            self.init_table_widget_create_item()
+
+    def ensure_loaded(self):
+        """Завантаження таблиці під час першого показу вкладки, якщо з'єднання вже відкрите і таблиця існує"""
+        if self.connected and not self.loaded and self.database.table_exists():
+            self.update_table_widget()
+
+    def refresh(self):
+        """Оновлення завантаженої чи показаної таблиці; інша вкладка завантажиться під час показу"""
+        if self.loaded:
+            self.update_table_widget()
+        elif self.tableView.isVisible():
+            self.ensure_loaded()
+
+    def fetch_page(self, after_row, limit):
+        """Сторінка рядків з кешу або з БД з поточним фільтром та сортуванням"""
+        return self.page_cache.fetch(
+            self.database.table_name, self.row_filter, self.database.column_names, after_row, limit,
+            lambda: self.database.fetch_page(after_row, limit, self.row_filter)
+        )
+
+    def invalidate_cache(self):
+        """Скидання кешованих сторінок таблиці, яку змінили поза вкладкою (міграцією)"""
+        self.page_cache.invalidate(self.database.table_name)
+
+    def reload(self):
+        """Повне оновлення: схема та сторінки таблиці читаються з БД заново"""
+        if not self.connected:
+            return
+        schema_catalog.invalidate(self.database.source, self.database.table_name)
+        self.invalidate_cache()
+        self.loaded = False
+        self.ensure_loaded()
+
+    def sort_rows(self, column_name, descending):
+        """Перезавантаження таблиці з сортуванням за вибраним стовпцем"""
+        if (column_name, descending) == (self.row_filter.sort_column, self.row_filter.descending):
+            return
+        self.row_filter.sort_column = column_name
+        self.row_filter.descending = descending
+        self.update_table_widget()
+
+    def connect_filter(self, price_min_edit: QLineEdit, price_max_edit: QLineEdit, search_edit: QLineEdit,
+                       filter_button: QPushButton):
+        """Під'єднання полів фільтра за ціною та пошуку за назвою чи описом"""
+        self.price_min_edit = price_min_edit
+        self.price_max_edit = price_max_edit
+        self.search_edit = search_edit
+        filter_button.clicked.connect(self.apply_filter)
+        for line_edit in (price_min_edit, price_max_edit, search_edit):
+            line_edit.returnPressed.connect(self.apply_filter)
+
+    def apply_filter(self):
+        """Застосування фільтра з полів введення"""
+        try:
+            range_min = parse_text(self.price_min_edit.text().strip(), INTEGER)
+            range_max = parse_text(self.price_max_edit.text().strip(), INTEGER)
+        except ValueError as error:
+            self.database.logger.error_message_box(f"Invalid price filter! {error}")
+            return
+        if (range_min is not None or range_max is not None) \
+                and self.row_filter.range_column not in self.database.column_names:
+            self.database.logger.error_message_box(f"Table has no {self.row_filter.range_column} field to filter by")
+            return
+        self.row_filter.range_min = range_min
+        self.row_filter.range_max = range_max
+        self.row_filter.search = self.search_edit.text().strip()
+        self.update_table_widget()
+
+    def init_table_widget_create_item(self):
+        """Створення додаткових кнопок в таблиці"""
+        add_button = QPushButton("Create item")
+        add_button.clicked.connect(self.create_field)
+        self.tableView.setIndexWidget(self.model.index(0, self.database.table_columns), add_button)
+
+    def on_table_clicked(self, index: QModelIndex):
+        """Видалення елемента при натисканні на комірку видалення"""
+        if self.model.is_delete_column(index.column()) and not self.model.is_create_row(index.row()):
+            self.delete_fields([self.model.field_id(index.row())])
+
+    def delete_selected(self):
+        """Видалення всіх рядків з виділеними комірками одним запитом після підтвердження"""
+        rows = sorted({index.row() for index in self.tableView.selectionModel().selectedIndexes()})
+        field_ids = [self.model.field_id(row) for row in rows if not self.model.is_create_row(row)]
+        if not field_ids:
+            return
+        answer = QMessageBox.question(
+            self.tableView, "Delete items", f"Delete {len(field_ids)} selected item(s) from {self.database.table_name}?"
+        )
+        if answer == QMessageBox.Yes:
+            self.delete_fields(field_ids)
+
+    def delete_fields(self, field_ids):
+        """Видалення рядків з БД однією транзакцією та з моделі без перезавантаження таблиці"""
+        if not self.database.delete_fields(field_ids):
+            return
+        for field_id in field_ids:
+            self.edits.discard(field_id)
+        self.page_cache.remove_rows(self.database.table_name, self.database.id_index, field_ids)
+        self.model.remove_rows(field_ids)
+
+    def paste_rows(self):
+        """Вставка рядків з буфера обміну (TSV чи CSV) одним пакетом в одній транзакції"""
+        text = QApplication.clipboard().text()
+        if not text.strip() or self.database.create_fields(text) is None:
+            return
+        #   id нових рядків призначає сервер, тож їх місця в сторінках визначаються перезавантаженням
+        self.invalidate_cache()
+        self.update_table_widget()
+
+    def create_field(self):
+        """Створення нового елемента зі значень рядка створення"""
+        new_field = self.database.create_field(self.model.new_item)
+        if new_field is None:
+            return
+        self.model.clear_new_item()
+        self.page_cache.insert_row(self.database.table_name, self.database.id_index, new_field)
+        if self.row_filter.is_default:
+            self.model.insert_row(new_field)
+        else:
+            #   Місце нового рядка та його відповідність фільтру визначає сервер
+            self.update_table_widget()
+
+    def update_field(self, field_id, column, value):
+        """Буферизація зміненої комірки; у БД зміни записуються пакетом однією транзакцією"""
+        position = self.model.find_row(field_id)
+        if position is None:
+            return False
+        self.edits.add(self.model.rows[position], self.database.id_index, column, value)
+        if column == self.database.id_index:
+            #   Зміна id змінює порядок рядків, тому вона записується одразу разом з іншими змінами
+            return self.apply_edits()
+        self.model.set_cell(field_id, column, value)
+        self.model.pending_cells.add((field_id, column))
+        if self.apply_button is not None:
+            self.apply_button.setEnabled(True)
+        if TABLE_VIEW["edit_debounce_ms"] is not None:
+            self.edit_timer.start(TABLE_VIEW["edit_debounce_ms"])
+        return True
+
+    def apply_edits(self):
+        """Запис усіх відкладених змін; при помилці відкочуються всі зміни пакета"""
+        self.edit_timer.stop()
+        if self.apply_button is not None:
+            self.apply_button.setEnabled(False)
+        if not self.edits:
+            return True
+        edits, original_rows = self.edits.take()
+        self.model.clear_pending()
+        updated_fields = self.database.update_fields(edits)
+        if updated_fields is None:
+            for field_id, field in original_rows.items():
+                self.model.replace_row(field_id, field)
+            return False
+        if any(column == self.database.id_index for _, column, _ in edits):
+            self.invalidate_cache()
+            self.update_table_widget()
+        else:
+            self.page_cache.update_rows(
+                self.database.table_name, self.database.id_index, updated_fields,
+                {self.database.column_names[column] for _, column, _ in edits}
+            )
+            for field in updated_fields:
+                self.model.replace_row(field[self.database.id_index], field)
+        return True
@@ -0,0 +1,63 @@
+import threading
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class TaskCancelled(Exception):
+    """Виконання фонової задачі скасовано користувачем"""
+
+
+class WorkerSignals(QObject):
+    """Сигнали фонової задачі (QRunnable не є QObject і не може мати власних сигналів)"""
+    #   Перенесено рядків, рядків за секунду, очікуваний час до завершення (-1, якщо невідомий)
+    progress = pyqtSignal(int, float, float)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """Фонова задача з повідомленнями про прогрес та можливістю скасування"""
+    def __init__(self, function, *args, **kwargs):
+        super(Worker, self).__init__()
+        #   function отримує саму задачу в аргументі task, щоб повідомляти прогрес
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.total_rows = None
+        self._cancel_event = threading.Event()
+        self._last_report = 0.0
+
+    def cancel(self):
+        """Запит на скасування задачі; задача зупиниться на найближчій порції"""
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def report(self, stats, report_interval=0.2):
+        """Повідомлення про прогрес міграції; викидає TaskCancelled, якщо задачу скасовано"""
+        if self.is_cancelled:
+            raise TaskCancelled()
+        now = time.perf_counter()
+        if now - self._last_report < report_interval:
+            return
+        self._last_report = now
+        rate = stats.rows_per_second
+        eta = -1.0
+        if self.total_rows and rate > 0:
+            eta = max(self.total_rows - stats.rows, 0) / rate
+        self.signals.progress.emit(stats.rows, rate, eta)
+
+    def run(self):
+        try:
+            result = self.function(*self.args, task=self, **self.kwargs)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as error:
+            self.signals.failed.emit(str(error))
+        else:
+            self.signals.finished.emit(result)
@@ -0,0 +1,413 @@
+#   Вимірювання швидкодії шляхів міграції на синтетичних даних:
+#       python -m benchmark --rows 10000 100000 1000000
+#       python -m benchmark --rows 100000 --servers --output benchmark_results.json
+#   Без --servers використовуються лише локальні файли SQLite; з --servers додатково
+#   вимірюються MySQL та PostgreSQL з config.py на окремій таблиці benchmark_internet_store_licenses
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from config import MYSQL, POSTGRESQL, MIGRATION
+from ConsoleLogger import ConsoleLogger
+from migration import iter_chunks, prefetch
+from SchemaCatalog import schema_catalog
+from utils import page_query
+
+BENCHMARK_TABLE = "benchmark_internet_store_licenses"
+COLUMN_NAMES = ["id", "price", "count", "rating", "program_name", "program_description",
+                "license_expire_year", "is_unlimited_license"]
+PRODUCTS = ["Office", "Antivirus", "Photo Editor", "IDE", "VPN", "Backup", "Video Studio", "CAD", "Mail", "Firewall"]
+EDITIONS = ["Home", "Pro", "Business", "Enterprise", "Student", "Ultimate"]
+WORDS = ["license", "cloud", "support", "update", "device", "user", "annual", "premium", "secure", "sync",
+         "storage", "team", "priority", "offline", "mobile", "desktop", "server", "seat", "renewal", "bundle"]
+
+
+def generate_rows(count: int, text_size=200, seed=0, start_id=1):
+    """Генерація реалістичних рядків internet_store_licenses"""
+    rng = random.Random(seed)
+    for field_id in range(start_id, start_id + count):
+        description_words = []
+        length = 0
+        target_length = rng.randint(text_size // 2, text_size)
+        while length < target_length:
+            word = rng.choice(WORDS)
+            description_words.append(word)
+            length += len(word) + 1
+        yield (
+            field_id,
+            rng.randint(5, 2000),
+            rng.randint(0, 10000) if rng.random() > 0.05 else None,
+            round(rng.uniform(1, 5), 1) if rng.random() > 0.1 else None,
+            f"{rng.choice(PRODUCTS)} {rng.choice(EDITIONS)} {field_id}",
+            " ".join(description_words) if rng.random() > 0.02 else None,
+            rng.randint(2024, 2040) if rng.random() > 0.3 else None,
+            rng.random() < 0.2,
+        )
+
+
+def generate_chunks(count: int, chunk_size: int, text_size=200, seed=0):
+    """Генерація рядків порціями для заповнення таблиць"""
+    chunk = []
+    for row in generate_rows(count, text_size, seed):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def peak_rss_kb():
+    """Пікове використання пам'яті процесом у KiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #   На macOS ru_maxrss повертається в байтах
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class SQLiteSource:
+    """Локальна заміна PostgreSQL як джерела експорту: той самий інтерфейс, дані у файлі SQLite"""
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.db = sqlite3.connect(filename, check_same_thread=False)
+        self.table_name = BENCHMARK_TABLE
+        self.source = f"SQLite {filename}"
+        self.pool = self
+        schema = self.schema()
+        self.column_names = schema.column_names
+        self.column_kinds = schema.kinds
+        self.id_index = schema.id_index
+
+    @contextmanager
+    def connection(self, timeout=None):
+        yield self.db
+
+    @contextmanager
+    def dedicated(self):
+        db = sqlite3.connect(self.filename, check_same_thread=False)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def estimate_row_count(self, db=None):
+        return self.db.execute(f"SELECT MAX(id) FROM {self.table_name}").fetchone()[0]
+
+    def read_id_range(self, db=None):
+        return self.db.execute(f"SELECT MIN(id), MAX(id) FROM {self.table_name}").fetchone()
+
+    def stream_rows(self, column_names, chunk_size, db=None, id_range=None):
+        db = db if db is not None else self.db
+        where, params = ("", ()) if id_range is None else (" WHERE id >= ? AND id < ?", tuple(id_range))
+        cursor = db.execute(f"SELECT {', '.join(column_names)} FROM {self.table_name}{where} ORDER BY id", params)
+        yield from iter_chunks(cursor, chunk_size)
+
+    def copy_rows(self, column_names, chunk_size, db=None, id_range=None):
+        #   Замість COPY TO STDOUT - те саме читання в окремому потоці
+        yield from prefetch(self.stream_rows(column_names, chunk_size, db, id_range), MIGRATION["prefetch_chunks"])
+
+    def schema(self, db=None):
+        from DatabaseSQLite import read_sqlite_schema
+        return schema_catalog.get(
+            self.source, self.table_name, lambda: read_sqlite_schema(self.db.cursor(), self.table_name)
+        )
+
+    def chunk_checksums(self, column_names, bucket_size, db=None):
+        checksums = {}
+        for row in self.db.execute(f"SELECT {', '.join(column_names)} FROM {self.table_name}"):
+            bucket = row[column_names.index("id")] // bucket_size
+            count, checksum = checksums.get(bucket, (0, 0))
+            row_hash = int.from_bytes(hashlib.md5(repr(row).encode()).digest()[:8], "big")
+            checksums[bucket] = (count + 1, checksum ^ row_hash)
+        return {bucket: (count, str(checksum)) for bucket, (count, checksum) in checksums.items()}
+
+    def range_checksums(self, column_names, kinds, low, high, step, db=None):
+        from DatabaseSQLite import sqlite_range_checksums
+        return sqlite_range_checksums(self.db, self.table_name, column_names, kinds, low, high, step)
+
+    def read_bucket(self, column_names, bucket, bucket_size, db=None):
+        return [row for rows in self.stream_rows(
+            column_names, bucket_size, db, id_range=(bucket * bucket_size, (bucket + 1) * bucket_size)
+        ) for row in rows]
+
+    def fetch_page(self, after_row, limit, row_filter=None):
+        sql_query, params = page_query(self.table_name, self.column_names, row_filter, after_row, limit, "?")
+        return self.db.execute(sql_query, params).fetchall()
+
+
+def create_sqlite_source(filename: str, rows: int, text_size: int, chunk_size: int):
+    """Створення файлу SQLite зі згенерованими рядками"""
+    db = sqlite3.connect(filename)
+    db.execute(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE}")
+    db.execute(f"""
+        CREATE TABLE {BENCHMARK_TABLE} (
+            id INTEGER PRIMARY KEY,
+            price INT NOT NULL,
+            count INT,
+            rating FLOAT,
+            program_name TEXT NOT NULL,
+            program_description TEXT,
+            license_expire_year INT,
+            is_unlimited_license BOOLEAN NOT NULL
+        )
+    """)
+    for chunk in generate_chunks(rows, chunk_size, text_size):
+        db.executemany(f"INSERT INTO {BENCHMARK_TABLE} VALUES ({', '.join('?' for _ in COLUMN_NAMES)})", chunk)
+    db.commit()
+    db.close()
+
+
+def stats_result(name, stats):
+    """Результат сценарію міграції"""
+    return {
+        "scenario": name,
+        "rows": stats.rows,
+        "seconds": round(stats.elapsed, 4),
+        "rows_per_second": round(stats.rows_per_second, 1),
+        "phases": {phase: round(seconds, 4) for phase, seconds in stats.phases.items()},
+    }
+
+
+def scenario_sqlite_export(workdir, rows, text_size):
+    """Експорт у SQLite (DatabaseSQLite.migrate_from_postgresql) з локального джерела SQLite"""
+    from DatabaseSQLite import DatabaseSQLite
+    source_filename = os.path.join(workdir, f"source_{rows}.db")
+    target_filename = os.path.join(workdir, f"target_{rows}.db")
+    create_sqlite_source(source_filename, rows, text_size, MIGRATION["chunk_size"])
+    source = SQLiteSource(source_filename)
+    target = DatabaseSQLite(filename=target_filename, logger=ConsoleLogger())
+    target.table_name = BENCHMARK_TABLE
+    stats = target.migrate_from_postgresql(source, [name for name in COLUMN_NAMES if name != "id"])
+    return stats_result("sqlite_export", stats)
+
+
+def scenario_sqlite_sync(workdir, rows, text_size, changed_fraction=0.01):
+    """Повторна інкрементна синхронізація в SQLite після зміни частини рядків джерела"""
+    from DatabaseSQLite import DatabaseSQLite
+    source_filename = os.path.join(workdir, f"sync_source_{rows}.db")
+    target_filename = os.path.join(workdir, f"sync_target_{rows}.db")
+    create_sqlite_source(source_filename, rows, text_size, MIGRATION["chunk_size"])
+    source = SQLiteSource(source_filename)
+    target = DatabaseSQLite(filename=target_filename, logger=ConsoleLogger())
+    target.table_name = BENCHMARK_TABLE
+    export_fields = [name for name in COLUMN_NAMES if name != "id"]
+    target.sync_from_postgresql(source, export_fields)
+    #   Типова зміна між синхронізаціями: редагування та видалення кількох рядків і нові рядки в кінці таблиці
+    changed = max(2, int(rows * changed_fraction))
+    source.db.execute(f"UPDATE {BENCHMARK_TABLE} SET price = price + 1 WHERE id <= ?", (changed // 2,))
+    source.db.execute(f"DELETE FROM {BENCHMARK_TABLE} WHERE id % 1000 = 0 AND id <= ?", (changed * 10,))
+    source.db.executemany(
+        f"INSERT INTO {BENCHMARK_TABLE} VALUES ({', '.join('?' for _ in COLUMN_NAMES)})",
+        generate_rows(changed // 2, text_size, seed=1, start_id=rows + 1)
+    )
+    source.db.commit()
+    stats = target.sync_from_postgresql(source, export_fields)
+    result = stats_result("sqlite_sync", stats)
+    result["changed_rows"] = changed
+    return result
+
+
+def scenario_sqlite_verify(workdir, rows, text_size):
+    """Перевірка експортованої в SQLite копії контрольними сумами після зміни кількох її рядків"""
+    from DatabaseSQLite import DatabaseSQLite
+    source_filename = os.path.join(workdir, f"verify_source_{rows}.db")
+    target_filename = os.path.join(workdir, f"verify_target_{rows}.db")
+    create_sqlite_source(source_filename, rows, text_size, MIGRATION["chunk_size"])
+    source = SQLiteSource(source_filename)
+    target = DatabaseSQLite(filename=target_filename, logger=ConsoleLogger())
+    target.table_name = BENCHMARK_TABLE
+    target.sync_from_postgresql(source, [name for name in COLUMN_NAMES if name != "id"])
+    #   Розбіжності, які має знайти перевірка: змінені, втрачені та зайві рядки
+    target.db.execute(f"UPDATE {BENCHMARK_TABLE} SET price = price + 1 WHERE id IN (?, ?)", (2, rows // 2))
+    target.db.execute(f"DELETE FROM {BENCHMARK_TABLE} WHERE id = ?", (rows - 1,))
+    target.db.execute(f"INSERT INTO {BENCHMARK_TABLE} (id, price, program_name, is_unlimited_license) "
+                      f"VALUES (?, 1, 'extra', 0)", (rows + 5,))
+    target.db.commit()
+    stats = target.verify_against_postgresql(source)
+    result = stats_result("sqlite_verify", stats)
+    result["differences"] = stats.differences
+    result["checksums"] = stats.checksums
+    return result
+
+
+def scenario_render(workdir, rows, text_size, pages=50):
+    """Зображення таблиці: перша сторінка та прокрутка TableModel (потрібен PyQt5)"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from TableModel import TableModel
+    from config import TABLE_VIEW
+    source_filename = os.path.join(workdir, f"render_{rows}.db")
+    create_sqlite_source(source_filename, rows, text_size, MIGRATION["chunk_size"])
+    source = SQLiteSource(source_filename)
+    application = QApplication.instance() or QApplication([])
+    model = TableModel(fetch_page=source.fetch_page, page_size=TABLE_VIEW["page_size"])
+    started = time.perf_counter()
+    model.reset(source.column_names, source.id_index)
+    first_page = time.perf_counter() - started
+    for _ in range(pages - 1):
+        if not model.canFetchMore():
+            break
+        model.fetchMore()
+    #   Побудова тексту всіх комірок, як це робить QTableView під час малювання
+    render_started = time.perf_counter()
+    for row in range(model.rowCount()):
+        for column in range(model.columnCount()):
+            model.data(model.index(row, column))
+    render = time.perf_counter() - render_started
+    total = time.perf_counter() - started
+    application.processEvents()
+    return {
+        "scenario": "render",
+        "rows": len(model.rows),
+        "seconds": round(total, 4),
+        "rows_per_second": round(len(model.rows) / total, 1) if total > 0 else 0.0,
+        "phases": {"first_page": round(first_page, 4), "render": round(render, 4)},
+    }
+
+
+def connect_servers():
+    """З'єднання з MySQL та PostgreSQL з config.py на окремій таблиці для вимірювань"""
+    from DatabaseMySQL import DatabaseMySQL
+    from DatabasePostgreSQL import DatabasePostgreSQL
+    logger = ConsoleLogger()
+    db_mysql = DatabaseMySQL(host=MYSQL["host"], user=MYSQL["user"], password=MYSQL["password"],
+                             database=MYSQL["database"], logger=logger, pool_size=MYSQL["pool_size"])
+    db_postgresql = DatabasePostgreSQL(host=POSTGRESQL["host"], user=POSTGRESQL["user"],
+                                       password=POSTGRESQL["password"], database=POSTGRESQL["database"],
+                                       logger=logger, pool_size=POSTGRESQL["pool_size"])
+    db_mysql.table_name = db_postgresql.table_name = BENCHMARK_TABLE
+    return db_mysql, db_postgresql
+
+
+def scenario_mysql_to_postgres(workdir, rows, text_size):
+    """Міграція MySQL -> PostgreSQL (DatabasePostgreSQL.migrate_from_mysql)"""
+    db_mysql, db_postgresql = connect_servers()
+    db_mysql.cursor.execute(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE}")
+    db_mysql.create_sql_table()
+    insert_query = f"INSERT INTO {BENCHMARK_TABLE} ({', '.join(COLUMN_NAMES)}) " \
+                   f"VALUES ({', '.join('%s' for _ in COLUMN_NAMES)})"
+    for chunk in generate_chunks(rows, MIGRATION["chunk_size"], text_size):
+        db_mysql.cursor.executemany(insert_query, chunk)
+    db_mysql.db.commit()
+    stats = db_postgresql.migrate_from_mysql(db_mysql)
+    return stats_result("mysql_to_postgres", stats)
+
+
+def scenario_update_field(workdir, rows, text_size, updates=200):
+    """Затримка редагування комірки update_field в MySQL та PostgreSQL"""
+    db_mysql, db_postgresql = connect_servers()
+    phases = {}
+    total = 0.0
+    for name, database in (("mysql", db_mysql), ("postgresql", db_postgresql)):
+        database.load_columns()
+        fields = database.fetch_page(None, updates)
+        column = database.column_names.index("price")
+        started = time.perf_counter()
+        for i, field in enumerate(fields):
+            database.update_field(field, column, str(i))
+        elapsed = time.perf_counter() - started
+        total += elapsed
+        phases[f"{name}_per_update"] = round(elapsed / max(len(fields), 1), 6)
+    return {
+        "scenario": "update_field",
+        "rows": updates,
+        "seconds": round(total, 4),
+        "rows_per_second": round(2 * updates / total, 1) if total > 0 else 0.0,
+        "phases": phases,
+    }
+
+
+SCENARIOS = {
+    "sqlite_export": scenario_sqlite_export,
+    "sqlite_sync": scenario_sqlite_sync,
+    "sqlite_verify": scenario_sqlite_verify,
+    "render": scenario_render,
+    "mysql_to_postgres": scenario_mysql_to_postgres,
+    "update_field": scenario_update_field,
+}
+SERVER_SCENARIOS = ("mysql_to_postgres", "update_field")
+
+
+def run_scenario(name, workdir, rows, text_size, workers, results):
+    """Виконання сценарію в окремому процесі, щоб пікова пам'ять вимірювалась лише для нього"""
+    MIGRATION["parallel_workers"] = workers
+    #   Консольний логер пише в stderr лише попередження та помилки
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        result = SCENARIOS[name](workdir, rows, text_size)
+        result["peak_rss_kb"] = peak_rss_kb()
+    except Exception as error:
+        result = {"scenario": name, "rows": rows, "error": str(error)}
+    results.put(result)
+
+
+def parse_args(argv):
+    """Розбір аргументів командного рядка"""
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="Вимірювання швидкодії міграцій")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="кількість згенерованих рядків (можна вказати кілька)")
+    parser.add_argument("--text-size", type=int, default=200, help="максимальна довжина program_description")
+    parser.add_argument("--workers", type=int, default=MIGRATION["parallel_workers"],
+                        help="кількість потоків паралельної міграції діапазонами id")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), help="сценарії для запуску")
+    parser.add_argument("--servers", action="store_true",
+                        help="також вимірювати MySQL та PostgreSQL з config.py")
+    parser.add_argument("--output", default="benchmark_results.json", help="файл JSON з історією результатів")
+    parser.add_argument("--label", default="", help="мітка запуску (наприклад, версія)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Запуск сценаріїв та дописування результатів у JSON"""
+    args = parse_args(argv)
+    scenarios = args.scenarios or [name for name in SCENARIOS if args.servers or name not in SERVER_SCENARIOS]
+    context = multiprocessing.get_context("spawn")
+    run = {
+        "label": args.label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "chunk_size": MIGRATION["chunk_size"],
+        "parallel_workers": args.workers,
+        "text_size": args.text_size,
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            for name in scenarios:
+                results = context.Queue()
+                process = context.Process(
+                    target=run_scenario, args=(name, workdir, rows, args.text_size, args.workers, results)
+                )
+                process.start()
+                result = results.get()
+                process.join()
+                run["results"].append(result)
+                if "error" in result:
+                    print(f"{name:>18} {rows:>9} rows: error: {result['error']}")
+                else:
+                    phases = ", ".join(f"{phase} {seconds}s" for phase, seconds in result["phases"].items())
+                    print(f"{name:>18} {rows:>9} rows: {result['rows_per_second']:>10.0f} rows/s, "
+                          f"peak RSS {result['peak_rss_kb'] // 1024} MiB ({phases})")
+    history = []
+    if os.path.exists(args.output):
+        with open(args.output, encoding="utf-8") as file:
+            history = json.load(file)
+    history.append(run)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(history, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
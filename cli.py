@@ -0,0 +1,227 @@
+#   Запуск міграцій без графічного інтерфейсу (наприклад, з cron):
+#       python -m cli migrate mysql-to-postgres --chunk-size 50000
+#       python -m cli export-sqlite --fields price,rating
+#       python -m cli migrate mysql-to-postgres --incremental
+#       python -m cli migrate mysql-to-postgres --all-tables --table-workers 8
+#       python -m cli export-file postgres licenses.csv.gz
+#       python -m cli import-file mysql licenses.ndjson.zst
+#       python -m cli verify mysql-to-postgres
+import argparse
+import logging
+import sqlite3
+import sys
+import time
+
+import psycopg2
+from mysql.connector import Error as MySQLError
+
+from QueryStats import query_stats
+from config import MYSQL, POSTGRESQL, SQLITE, MIGRATION
+from ConsoleLogger import ConsoleLogger
+from DatabaseMySQL import DatabaseMySQL
+from DatabasePostgreSQL import DatabasePostgreSQL
+from DatabaseSQLite import DatabaseSQLite
+from verification import VerificationStats
+
+
+class ConsoleProgress:
+    """Звіт про прогрес міграції в консоль (аналог Worker для запуску без інтерфейсу)"""
+    def __init__(self, logger: ConsoleLogger, report_interval: float):
+        self.logger = logger
+        self.report_interval = report_interval
+        self.total_rows = None
+        self._last_report = time.perf_counter()
+
+    def report(self, stats):
+        """Періодичний запис прогресу в лог"""
+        now = time.perf_counter()
+        if now - self._last_report < self.report_interval:
+            return
+        self._last_report = now
+        rate = stats.rows_per_second
+        eta_text = ""
+        if self.total_rows and rate > 0:
+            eta_text = f", ETA {max(self.total_rows - stats.rows, 0) / rate:.0f}s"
+        self.logger.log(f"{stats.rows} rows, {rate:.0f} rows/s{eta_text}")
+
+
+def connect_mysql(logger):
+    """З'єднання з MySQL за налаштуваннями config.py"""
+    db_mysql = DatabaseMySQL(
+        host=MYSQL["host"],
+        user=MYSQL["user"],
+        password=MYSQL["password"],
+        database=MYSQL["database"],
+        logger=logger,
+        pool_size=MYSQL["pool_size"]
+    )
+    db_mysql.connect()
+    return db_mysql
+
+
+def connect_postgresql(logger):
+    """З'єднання з PostgreSQL за налаштуваннями config.py"""
+    db_postgresql = DatabasePostgreSQL(
+        host=POSTGRESQL["host"],
+        user=POSTGRESQL["user"],
+        password=POSTGRESQL["password"],
+        database=POSTGRESQL["database"],
+        logger=logger,
+        pool_size=POSTGRESQL["pool_size"]
+    )
+    db_postgresql.connect()
+    return db_postgresql
+
+
+def migrate_mysql_to_postgres(args, logger, progress):
+    """Міграція таблиці MySQL у PostgreSQL"""
+    db_mysql = connect_mysql(logger)
+    db_postgresql = connect_postgresql(logger)
+    if args.all_tables:
+        return db_postgresql.migrate_schema_from_mysql(db_mysql, task=progress)
+    if args.incremental:
+        return db_postgresql.sync_from_mysql(db_mysql, task=progress)
+    return db_postgresql.migrate_from_mysql(db_mysql, task=progress)
+
+
+def export_sqlite(args, logger, progress):
+    """Експорт вибраних полів таблиці PostgreSQL у SQLite"""
+    db_postgresql = connect_postgresql(logger)
+    db_sqlite = DatabaseSQLite(filename=args.filename or SQLITE["filename"], logger=logger)
+    if not db_postgresql.load_columns():
+        sys.exit(1)
+    export_fields = db_postgresql.parse_export_fields(args.fields)
+    if export_fields is None:
+        sys.exit(2)
+    if args.incremental:
+        return db_sqlite.sync_from_postgresql(db_postgresql, export_fields, task=progress)
+    return db_sqlite.migrate_from_postgresql(db_postgresql, export_fields, task=progress)
+
+
+def verify_copy(args, logger, progress):
+    """Перевірка копії таблиці за контрольними сумами діапазонів id"""
+    db_postgresql = connect_postgresql(logger)
+    if args.direction == "mysql-to-postgres":
+        stats = db_postgresql.verify_against_mysql(connect_mysql(logger), task=progress)
+    else:
+        db_sqlite = DatabaseSQLite(filename=args.filename or SQLITE["filename"], logger=logger)
+        stats = db_sqlite.verify_against_postgresql(db_postgresql, task=progress)
+    logger.log(f"Verification: {stats}", tag="INFO" if stats.ok else "WARNING")
+    return stats
+
+
+def connect_database(name, args, logger):
+    """З'єднання з БД, вибраною в командному рядку"""
+    if name == "mysql":
+        return connect_mysql(logger)
+    if name == "postgres":
+        return connect_postgresql(logger)
+    return DatabaseSQLite(filename=args.sqlite_filename or SQLITE["filename"], logger=logger)
+
+
+def export_to_file(args, logger, progress):
+    """Експорт таблиці у файл CSV чи NDJSON"""
+    return connect_database(args.database, args, logger).export_to_file(args.filename, task=progress)
+
+
+def import_from_file(args, logger, progress):
+    """Заміна вмісту таблиці даними з файлу CSV чи NDJSON"""
+    return connect_database(args.database, args, logger).import_from_file(args.filename, task=progress)
+
+
+def parse_args(argv):
+    """Розбір аргументів командного рядка"""
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Міграція таблиць між MySQL, PostgreSQL та SQLite")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--chunk-size", type=int, default=MIGRATION["chunk_size"],
+                        help="кількість рядків в одній порції")
+    common.add_argument("--prefetch", type=int, default=MIGRATION["prefetch_chunks"],
+                        help="кількість порцій, що читаються наперед паралельно із записом (0 - послідовно)")
+    common.add_argument("--workers", type=int, default=MIGRATION["parallel_workers"],
+                        help="кількість потоків паралельної міграції діапазонами id (1 - один потік)")
+    common.add_argument("--incremental", action="store_true",
+                        help="перенести лише змінені блоки id з моменту попередньої синхронізації")
+    common.add_argument("--progress-interval", type=float, default=10.0,
+                        help="період звіту про прогрес в секундах")
+    common.add_argument("--quiet", action="store_true", help="друкувати лише попередження та помилки")
+    common.add_argument("--query-stats", metavar="FILE",
+                        help="зберегти статистику запитів (час, рядки, повільні запити) у файл JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", parents=[common], help="міграція таблиці між БД")
+    migrate.add_argument("direction", choices=["mysql-to-postgres"])
+    migrate.add_argument("--all-tables", action="store_true",
+                         help="перенести всі таблиці бази з індексами та зовнішніми ключами")
+    migrate.add_argument("--table-workers", type=int, default=MIGRATION["table_workers"],
+                         help="кількість таблиць, що копіюються одночасно (з --all-tables)")
+    migrate.set_defaults(handler=migrate_mysql_to_postgres)
+
+    export = commands.add_parser("export-sqlite", parents=[common], help="експорт полів PostgreSQL у SQLite")
+    export.add_argument("--fields", required=True, help="назви полів через кому чи пробіл")
+    export.add_argument("--filename", help="файл SQLite (за замовчуванням з config.py)")
+    export.set_defaults(handler=export_sqlite)
+
+    verify = commands.add_parser("verify", parents=[common], help="перевірка копії таблиці за контрольними сумами")
+    verify.add_argument("direction", choices=["mysql-to-postgres", "postgres-to-sqlite"])
+    verify.add_argument("--filename", help="файл SQLite (за замовчуванням з config.py)")
+    verify.set_defaults(handler=verify_copy)
+
+    file_help = "файл .csv, .ndjson чи .jsonl, за розширенням .gz чи .zst - стиснений"
+    export_file = commands.add_parser("export-file", parents=[common], help="експорт таблиці у файл")
+    export_file.add_argument("database", choices=["mysql", "postgres", "sqlite"])
+    export_file.add_argument("filename", help=file_help)
+    export_file.add_argument("--sqlite-filename", help="файл SQLite (за замовчуванням з config.py)")
+    export_file.set_defaults(handler=export_to_file)
+
+    import_file = commands.add_parser("import-file", parents=[common], help="заміна вмісту таблиці даними з файлу")
+    import_file.add_argument("database", choices=["mysql", "postgres", "sqlite"])
+    import_file.add_argument("filename", help=file_help)
+    import_file.add_argument("--sqlite-filename", help="файл SQLite (за замовчуванням з config.py)")
+    import_file.set_defaults(handler=import_from_file)
+    args = parser.parse_args(argv)
+    if getattr(args, "all_tables", False) and args.incremental:
+        parser.error("--incremental cannot be combined with --all-tables")
+    return args
+
+
+def main(argv=None):
+    """Точка входу командного рядка; повертає код завершення"""
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(asctime)s [%(levelname)s] - %(message)s",
+        stream=sys.stderr
+    )
+    #   Міграції читають налаштування порцій з config.MIGRATION під час запуску
+    MIGRATION["chunk_size"] = args.chunk_size
+    MIGRATION["prefetch_chunks"] = args.prefetch
+    MIGRATION["parallel_workers"] = args.workers
+    if args.command == "migrate":
+        MIGRATION["table_workers"] = args.table_workers
+    logger = ConsoleLogger()
+    progress = ConsoleProgress(logger, args.progress_interval)
+    try:
+        stats = args.handler(args, logger, progress)
+    except KeyboardInterrupt:
+        logger.log("Interrupted, changes rolled back", tag="WARNING")
+        return 130
+    except (MySQLError, psycopg2.Error, sqlite3.Error) as error:
+        logger.log(f"Migration error! {error}", tag="ERROR")
+        return 1
+    except (ValueError, OSError) as error:
+        #   Невідомий формат чи стовпці файлу, некоректні значення, помилки читання та запису
+        logger.log(f"File error! {error}", tag="ERROR")
+        return 1
+    finally:
+        #   Статистика зберігається і після помилки, щоб було видно, на якому запиті все зупинилось
+        if args.query_stats:
+            query_stats.export_json(args.query_stats)
+    print(f"{args.command}: {stats.rows} rows in {stats.elapsed:.2f}s, {stats.rows_per_second:.0f} rows/s")
+    #   Окремий код завершення, щоб cron чи скрипт міг відрізнити розбіжності від помилки
+    if isinstance(stats, VerificationStats) and not stats.ok:
+        return 3
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+#   Компактне зберігання сторінок рядків по стовпцях: числа - в типізованих масивах array,
+#   текст - одним буфером UTF-8 зі зміщеннями, NULL - бітовою маскою. Рядок-кортеж
+#   створюється лише при зверненні до нього, тож у пам'яті немає об'єктів окремих значень
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def null_mask(values):
+    """Бітова маска NULL (біт i встановлений, якщо values[i] - None); None, якщо NULL немає"""
+    if None not in values:
+        return None
+    mask = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value is None:
+            mask[i >> 3] |= 1 << (i & 7)
+    return mask
+
+
+def is_null(mask, i):
+    return mask is not None and mask[i >> 3] >> (i & 7) & 1
+
+
+class NumberColumn:
+    """Стовпець чисел у масиві array ('q' - цілі, 'd' - дійсні, 'b' - логічні); NULL зберігаються як 0"""
+    def __init__(self, values, typecode, mask):
+        self.data = array(typecode, [0 if value is None else value for value in values])
+        self.mask = mask
+        self.to_python = bool if typecode == "b" else None
+
+    def __len__(self):
+        return len(self.data)
+
+    def value(self, i):
+        mask = self.mask
+        if mask is not None and mask[i >> 3] >> (i & 7) & 1:
+            return None
+        value = self.data[i]
+        return value if self.to_python is None else self.to_python(value)
+
+    def values(self, start, stop):
+        values = self.data[start:stop].tolist()
+        if self.to_python is not None:
+            values = list(map(self.to_python, values))
+        if self.mask is not None:
+            for i in range(start, stop):
+                if is_null(self.mask, i):
+                    values[i - start] = None
+        return values
+
+    @property
+    def nbytes(self):
+        return self.data.itemsize * len(self.data) + len(self.mask or b"")
+
+
+class TextColumn:
+    """Текстовий стовпець: рядки UTF-8 підряд в одному буфері, межі рядка i - offsets[i] та offsets[i + 1]"""
+    def __init__(self, values, mask):
+        encoded = [b"" if value is None else value.encode() for value in values]
+        self.offsets = array("q", [0])
+        position = 0
+        for item in encoded:
+            position += len(item)
+            self.offsets.append(position)
+        self.buffer = b"".join(encoded)
+        self.view = memoryview(self.buffer)
+        self.mask = mask
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def value(self, i):
+        mask = self.mask
+        if mask is not None and mask[i >> 3] >> (i & 7) & 1:
+            return None
+        return str(self.view[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def values(self, start, stop):
+        return [self.value(i) for i in range(start, stop)]
+
+    @property
+    def nbytes(self):
+        return len(self.buffer) + self.offsets.itemsize * len(self.offsets) + len(self.mask or b"")
+
+
+class ObjectColumn:
+    """Стовпець значень, що не вміщуються в масив (Decimal, дати, мішані типи): звичайний кортеж"""
+    def __init__(self, values):
+        self.data = tuple(values)
+
+    def __len__(self):
+        return len(self.data)
+
+    def value(self, i):
+        return self.data[i]
+
+    def values(self, start, stop):
+        return list(self.data[start:stop])
+
+    @property
+    def nbytes(self):
+        return sys.getsizeof(self.data) + sum(sys.getsizeof(value) for value in self.data if value is not None)
+
+
+def build_column(values):
+    """Найкомпактніший стовпець для значень; вид визначається за типами значень, а не за схемою,
+    бо драйвери повертають різні типи для однакових стовпців"""
+    types = {type(value) for value in values if value is not None}
+    mask = null_mask(values)
+    if types == {bool}:
+        return NumberColumn(values, "b", mask)
+    if types == {int} and all(INT64_MIN <= value <= INT64_MAX for value in values if value is not None):
+        return NumberColumn(values, "q", mask)
+    if types == {float}:
+        return NumberColumn(values, "d", mask)
+    if types == {str}:
+        return TextColumn(values, mask)
+    return ObjectColumn(values)
+
+
+class ColumnBatch(Sequence):
+    """Незмінна порція рядків, збережена по стовпцях. Поводиться як послідовність кортежів,
+    а зріз чи вибір стовпців повертає нову порцію над тими самими стовпцями без копіювання"""
+    def __init__(self, columns, start=0, stop=None):
+        self.columns = columns
+        self.start = start
+        self.stop = stop if stop is not None else (len(columns[0]) if columns else 0)
+
+    @classmethod
+    def from_rows(cls, rows, width=None):
+        """Порція зі списку рядків-кортежів; width потрібна лише для порожньої порції"""
+        rows = rows if isinstance(rows, (list, tuple)) else list(rows)
+        if not rows:
+            return cls([ObjectColumn(()) for _ in range(width or 0)])
+        return cls([build_column(values) for values in zip(*rows)])
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return ColumnBatch.from_rows([self[i] for i in range(start, stop, step)], len(self.columns))
+            return ColumnBatch(self.columns, self.start + start, self.start + max(start, stop))
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("ColumnBatch index out of range")
+        i = self.start + item
+        return tuple(column.value(i) for column in self.columns)
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def value(self, row, column):
+        """Одне значення без створення кортежу рядка"""
+        return self.columns[column].value(self.start + row)
+
+    def column(self, column):
+        """Значення стовпця списком (числові стовпці перетворюються одним викликом tolist)"""
+        return self.columns[column].values(self.start, self.stop)
+
+    def rows(self):
+        """Усі рядки списком кортежів, як їх повертає курсор"""
+        if not self.columns:
+            return [() for _ in range(len(self))]
+        return list(zip(*(self.column(column) for column in range(len(self.columns)))))
+
+    def select(self, columns):
+        """Порція лише з вибраних стовпців у заданому порядку"""
+        return ColumnBatch([self.columns[column] for column in columns], self.start, self.stop)
+
+    def replace(self, changes):
+        """Нова порція, де рядки з позицій changes ({позиція: рядок}) замінено, а рядки з None видалено"""
+        rows = self.rows()
+        for position in sorted(changes, reverse=True):
+            if changes[position] is None:
+                del rows[position]
+            else:
+                rows[position] = tuple(changes[position])
+        return ColumnBatch.from_rows(rows, len(self.columns))
+
+    def insert(self, position, row):
+        """Нова порція зі вставленим рядком"""
+        rows = self.rows()
+        rows.insert(position, tuple(row))
+        return ColumnBatch.from_rows(rows, len(self.columns))
+
+    @property
+    def nbytes(self):
+        """Розмір стовпців у пам'яті в байтах (зріз ділить стовпці з початковою порцією)"""
+        return sum(column.nbytes for column in self.columns)
+
+
+class PagedRows(Sequence):
+    """Рядки моделі таблиці як список порцій ColumnBatch: сторінки додаються без копіювання,
+    а зміна рядка перебудовує лише його сторінку"""
+    def __init__(self):
+        self.pages = []
+        #   Номер першого рядка кожної сторінки
+        self.starts = []
+        self.ends = []
+        self.length = 0
+        self.last_page = 0
+
+    def __len__(self):
+        return self.length
+
+    def locate(self, position):
+        """Сторінка та позиція в ній для рядка з номером position"""
+        if position < 0:
+            position += self.length
+        #   Представлення читає комірки підряд, тож зазвичай рядок на тій самій сторінці, що й попередній
+        page = self.last_page
+        if page >= len(self.pages) or not self.starts[page] <= position < self.ends[page]:
+            if not 0 <= position < self.length:
+                raise IndexError("PagedRows index out of range")
+            page = self.last_page = bisect_right(self.starts, position) - 1
+        return page, position - self.starts[page]
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self.length))]
+        page, offset = self.locate(position)
+        return self.pages[page][offset]
+
+    def __iter__(self):
+        for page in self.pages:
+            yield from page
+
+    def value(self, position, column):
+        """Одне значення комірки без створення кортежу рядка"""
+        page, offset = self.locate(position)
+        batch = self.pages[page]
+        return batch.columns[column].value(batch.start + offset)
+
+    def column(self, column):
+        """Значення стовпця всіх сторінок одним списком"""
+        return [value for page in self.pages for value in page.column(column)]
+
+    def extend(self, page):
+        """Додавання сторінки в кінець; список рядків перетворюється в ColumnBatch"""
+        if not isinstance(page, ColumnBatch):
+            page = ColumnBatch.from_rows(page)
+        if not len(page):
+            return
+        self.starts.append(self.length)
+        self.pages.append(page)
+        self.length += len(page)
+        self.ends.append(self.length)
+
+    def reindex(self):
+        """Перерахунок початків сторінок після зміни кількості рядків"""
+        self.pages = [page for page in self.pages if len(page)]
+        self.starts = []
+        self.ends = []
+        self.length = 0
+        self.last_page = 0
+        for page in self.pages:
+            self.starts.append(self.length)
+            self.length += len(page)
+            self.ends.append(self.length)
+
+    def __setitem__(self, position, row):
+        page, offset = self.locate(position)
+        self.pages[page] = self.pages[page].replace({offset: row})
+
+    def __delitem__(self, position):
+        """Видалення рядка чи зрізу рядків; кожна зачеплена сторінка перебудовується один раз"""
+        positions = range(*position.indices(self.length)) if isinstance(position, slice) else [position]
+        changes = {}
+        for row in positions:
+            page, offset = self.locate(row)
+            changes.setdefault(page, {})[offset] = None
+        for page, page_changes in changes.items():
+            self.pages[page] = self.pages[page].replace(page_changes)
+        self.reindex()
+
+    def insert(self, position, row):
+        """Вставка рядка перед position (у кінець останньої сторінки, якщо position == len)"""
+        if not self.pages:
+            self.extend([tuple(row)])
+            return
+        if position >= self.length:
+            page, offset = len(self.pages) - 1, len(self.pages[-1])
+        else:
+            page, offset = self.locate(position)
+        self.pages[page] = self.pages[page].insert(offset, row)
+        self.reindex()
+
+    @property
+    def nbytes(self):
+        return sum(page.nbytes for page in self.pages)
@@ -5,6 +5,8 @@ MYSQL = {
     "user": "root",
     "password": "aboba",
     "database": "django",
+    #   Одне з'єднання для редагування в інтерфейсі, решта - для фонових задач
+    "pool_size": 3,
 }
 
 POSTGRESQL = {
@@ -12,8 +14,94 @@ POSTGRESQL = {
     "user": "postgres",
     "password": "root",
     "database": "django",
+    "pool_size": 3,
 }
 
 SQLITE = {
     "filename": "sqlite.db"
 }
+
+#   Параметри міграції між базами даних
+MIGRATION = {
+    "chunk_size": 10000,
+    #   Розмір блоків id інкрементної синхронізації; не залежить від --chunk-size, бо збережені контрольні точки
+    #   дійсні лише для того самого розміру блоку (зміна означає повну повторну синхронізацію)
+    "sync_bucket_size": 10000,
+    #   Скільки порцій джерела читається наперед в окремому потоці (0 - без паралельного читання)
+    "prefetch_chunks": 2,
+    #   Кількість потоків паралельної міграції діапазонами id, кожен з власними з'єднаннями (1 - один потік)
+    "parallel_workers": 1,
+    #   Скільки діапазонів id припадає на один потік, щоб нерівномірні діапазони не гальмували міграцію
+    "partitions_per_worker": 4,
+    #   Скільки таблиць копіюється одночасно під час міграції всієї бази (migrate --all-tables)
+    "table_workers": 4,
+    #   Режим завантаження SQLite: журнал (WAL, DELETE, TRUNCATE чи MEMORY; OFF не підтримується, бо скасований
+    #   експорт відкочується) та розмір кешу сторінок у KiB. Після завантаження попередній журнал відновлюється
+    "sqlite_journal_mode": "WAL",
+    "sqlite_cache_size_kib": 262144,
+    #   Повний експорт у SQLite через проміжну БД: None - запис прямо у файл, "memory" - БД у пам'яті,
+    #   "file" - тимчасовий файл поруч з файлом БД (для таблиць, що не вміщуються в пам'ять)
+    "sqlite_staging": None,
+    #   Як готова проміжна БД замінює файл: "backup" - онлайн-копіювання в файл однією транзакцією,
+    #   "vacuum" - VACUUM INTO тимчасового файлу та його перейменування
+    "sqlite_publish": "backup",
+}
+
+#   Параметри перевірки копій таблиць за контрольними сумами діапазонів id
+VERIFICATION = {
+    #   Розмір діапазонів id першого рівня та на скільки частин ділиться діапазон з відмінностями
+    "bucket_size": 100000,
+    "fanout": 16,
+    #   Діапазони до стількох id порівнюються вже по рядках
+    "leaf_rows": 64,
+    #   Дійсні числа порівнюються з такою кількістю знаків після коми
+    "float_digits": 4,
+    #   Після стількох відмінних рядків пошук зупиняється
+    "max_differences": 1000,
+}
+
+#   Параметри експорту та імпорту файлів CSV та NDJSON (.gz - gzip, .zst - zstd, потрібен пакет zstandard)
+FILE_TRANSFER = {
+    #   Розмір буфера читання та запису файлу в KiB
+    "buffer_kib": 1024,
+    "gzip_level": 6,
+    "zstd_level": 3,
+}
+
+#   Параметри зображення таблиць
+TABLE_VIEW = {
+    "page_size": 200,
+    #   Пауза в редагуванні (мс), після якої змінені комірки записуються в БД (None - лише кнопкою)
+    "edit_debounce_ms": 2000,
+    #   Бюджет пам'яті кешу сторінок кожної вкладки в MiB (0 - без кешу)
+    "page_cache_mib": 64,
+}
+
+#   Параметри логування
+LOGGING = {
+    "buffer_size": 1000,
+    "flush_interval_ms": 250,
+    #   Файл для дублювання логу (None - без запису у файл)
+    "filename": None,
+    #   Записувати в лог час показу вікна, з'єднання з БД та завантаження першої таблиці
+    "startup_timing": False,
+}
+
+#   Параметри статистики запитів (панель «Діагностика»)
+DIAGNOSTICS = {
+    "enabled": True,
+    #   Запити, довші за цей поріг у мс, потрапляють у журнал повільних запитів (None - без журналу)
+    "slow_query_ms": 200,
+    "slow_log_size": 200,
+}
+
+#   Параметри пулів з'єднань MySQL та PostgreSQL
+POOL = {
+    "retries": 5,
+    "backoff_initial": 0.5,
+    "backoff_max": 8,
+    #   З'єднання, що простоювало довше стількох секунд, перевіряється перед використанням
+    "idle_ping_seconds": 1,
+    #   Скільки секунд чекати на вільне з'єднання, коли всі зайняті (потім - помилка PoolExhausted)
+    "acquire_timeout": 30,
+}
@@ -0,0 +1,265 @@
+#   Шар відповідності типів: план перетворення значень будується один раз на стовпець,
+#   а потім застосовується до цілих порцій рядків
+import re
+from datetime import timedelta
+
+INTEGER = "integer"
+FLOAT = "float"
+BOOLEAN = "boolean"
+TEXT = "text"
+
+#   OID типів PostgreSQL з cursor.description
+POSTGRESQL_TYPE_OIDS = {
+    16: BOOLEAN,
+    20: INTEGER,
+    21: INTEGER,
+    23: INTEGER,
+    700: FLOAT,
+    701: FLOAT,
+    1700: FLOAT,
+    25: TEXT,
+    1042: TEXT,
+    1043: TEXT,
+}
+
+#   Оголошені типи стовпців SQLite для видів значень
+SQLITE_TYPES = {
+    INTEGER: "INT",
+    FLOAT: "FLOAT",
+    BOOLEAN: "BOOLEAN",
+    TEXT: "TEXT",
+}
+
+TRUE_STRINGS = ("1", "true", "t", "yes")
+FALSE_STRINGS = ("0", "false", "f", "no")
+
+
+def mysql_kind(column_type):
+    """Вид значень стовпця за типом з SHOW COLUMNS"""
+    if isinstance(column_type, bytes):
+        column_type = column_type.decode()
+    column_type = column_type.lower()
+    if column_type == "tinyint(1)":
+        return BOOLEAN
+    base_type = column_type.split("(")[0].split(" ")[0]
+    if base_type in ("tinyint", "smallint", "mediumint", "int", "integer", "bigint", "year"):
+        return INTEGER
+    if base_type in ("float", "double", "real", "decimal", "numeric"):
+        return FLOAT
+    if base_type in ("bool", "boolean"):
+        return BOOLEAN
+    return TEXT
+
+
+#   Цілі типи MySQL за розміром у байтах та цілі типи PostgreSQL (звичайний та з автоінкрементом)
+MYSQL_INTEGER_BYTES = {"tinyint": 1, "smallint": 2, "mediumint": 3, "int": 4, "integer": 4, "bigint": 8, "year": 2}
+POSTGRESQL_INTEGER_TYPES = {2: ("smallint", "smallserial"), 4: ("integer", "serial"), 8: ("bigint", "bigserial")}
+MYSQL_TEXT_TYPES = ("tinytext", "text", "mediumtext", "longtext", "enum", "set")
+MYSQL_BINARY_TYPES = ("binary", "varbinary", "tinyblob", "blob", "mediumblob", "longblob")
+
+
+def postgresql_type(column_type, auto_increment=False):
+    """Тип стовпця PostgreSQL для типу MySQL з information_schema.COLUMNS.COLUMN_TYPE (міграція схеми)"""
+    if isinstance(column_type, bytes):
+        column_type = column_type.decode()
+    column_type = column_type.lower()
+    base_type = column_type.split("(")[0].split(" ")[0]
+    arguments = column_type[column_type.find("("):column_type.find(")") + 1] if "(" in column_type else ""
+    if column_type in ("tinyint(1)", "bit(1)") or base_type in ("bool", "boolean"):
+        return "boolean"
+    if base_type in MYSQL_INTEGER_BYTES:
+        #   Беззнаковому цілому потрібен наступний за розміром тип, для BIGINT UNSIGNED - numeric
+        size = MYSQL_INTEGER_BYTES[base_type] + ("unsigned" in column_type)
+        for pg_size, (pg_type, serial_type) in POSTGRESQL_INTEGER_TYPES.items():
+            if size <= pg_size:
+                return serial_type if auto_increment else pg_type
+        return "bigserial" if auto_increment else "numeric(20)"
+    if base_type == "bit":
+        return "bigint"
+    if base_type == "float":
+        return "real"
+    if base_type in ("double", "real"):
+        return "double precision"
+    if base_type in ("decimal", "numeric", "dec", "fixed"):
+        return f"numeric{arguments}"
+    if base_type in ("char", "varchar"):
+        return f"{base_type}{arguments}"
+    if base_type in ("datetime", "timestamp"):
+        return f"timestamp{arguments}"
+    if base_type in ("date", "time"):
+        return f"{base_type}{arguments}"
+    if base_type == "json":
+        return "jsonb"
+    if base_type in MYSQL_BINARY_TYPES:
+        return "bytea"
+    return "text"
+
+
+def postgresql_kind(type_code):
+    """Вид значень стовпця за OID типу з cursor.description"""
+    return POSTGRESQL_TYPE_OIDS.get(type_code, TEXT)
+
+
+def sqlite_kind(declared_type):
+    """Вид значень стовпця за оголошеним типом SQLite (правила спорідненості типів)"""
+    declared_type = (declared_type or "").upper()
+    if declared_type.startswith("BOOL"):
+        return BOOLEAN
+    if "INT" in declared_type:
+        return INTEGER
+    if any(name in declared_type for name in ("REAL", "FLOA", "DOUB", "NUMERIC", "DECIMAL")):
+        return FLOAT
+    return TEXT
+
+
+def value_converter(source_kind, target_kind, integer_booleans=False):
+    """Перетворення значення між БД; None означає, що значення передається без змін.
+    integer_booleans - драйвер джерела повертає логічні значення цілими числами (tinyint(1) MySQL)"""
+    if source_kind == target_kind:
+        return bool if target_kind == BOOLEAN and integer_booleans else None
+    if target_kind == BOOLEAN:
+        return bool
+    if target_kind == INTEGER:
+        return int
+    if target_kind == FLOAT:
+        return float
+    if target_kind == TEXT:
+        return str
+    return None
+
+
+def build_plan(source_kinds, target_kinds, integer_booleans=False):
+    """План перетворення рядків: пари (індекс стовпця, функція) лише для стовпців, що потребують змін"""
+    plan = []
+    for i, (source_kind, target_kind) in enumerate(zip(source_kinds, target_kinds)):
+        converter = value_converter(source_kind, target_kind, integer_booleans)
+        if converter is not None:
+            plan.append((i, converter))
+    return plan
+
+
+def convert_rows(rows, plan):
+    """Застосування плану до порції рядків; без плану рядки повертаються як є"""
+    if not plan:
+        return rows
+    converted_rows = []
+    for row in rows:
+        row = list(row)
+        for i, converter in plan:
+            if row[i] is not None:
+                row[i] = converter(row[i])
+        converted_rows.append(row)
+    return converted_rows
+
+
+def parse_boolean(text):
+    """Логічне значення з тексту комірки"""
+    lowered = text.lower()
+    if lowered in TRUE_STRINGS:
+        return True
+    if lowered in FALSE_STRINGS:
+        return False
+    raise ValueError(f"'{text}' is not a boolean value")
+
+
+TEXT_PARSERS = {
+    INTEGER: int,
+    FLOAT: float,
+    BOOLEAN: parse_boolean,
+    TEXT: str,
+}
+
+
+def parse_text(text, kind):
+    """Значення для параметризованого запиту з тексту комірки; порожній текст чи null - це NULL"""
+    if text is None or text == "" or text.lower() == "null":
+        return None
+    return TEXT_PARSERS[kind](text.strip() if kind != TEXT else text)
+
+
+#   Текстовий формат COPY PostgreSQL: поля розділені табуляцією, NULL - це \N, спецсимволи екрановано
+COPY_ESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+COPY_ESCAPE_PATTERN = re.compile(r"\\(.)")
+COPY_PARSERS = {
+    INTEGER: int,
+    FLOAT: float,
+    BOOLEAN: lambda text: text == "t",
+    TEXT: str,
+}
+
+
+def unescape_copy_text(text):
+    """Текст поля COPY без екранування"""
+    return COPY_ESCAPE_PATTERN.sub(lambda match: COPY_ESCAPES.get(match.group(1), match.group(1)), text)
+
+
+def copy_line_parser(kinds):
+    """Розбір рядка текстового формату COPY у кортеж значень заданих видів"""
+    parsers = [COPY_PARSERS[kind] for kind in kinds]
+
+    def parse_line(line):
+        return tuple(
+            None if field == "\\N" else parser(unescape_copy_text(field) if "\\" in field else field)
+            for parser, field in zip(parsers, line.split("\t"))
+        )
+    return parse_line
+
+
+#   Зворотне перетворення для COPY FROM STDIN; ті самі правила екранування та \N використовує LOAD DATA MySQL
+COPY_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def interval_text(value: timedelta):
+    """Значення TIME MySQL (конектор повертає timedelta) як [-]HH:MM:SS[.ffffff]; години можуть бути більше 24,
+    а str(timedelta) дав би "1 day, 2:00:00" чи "-1 day, 23:59:59", яких не приймає PostgreSQL"""
+    sign = "-" if value < timedelta(0) else ""
+    seconds, microseconds = divmod(abs(value) // timedelta(microseconds=1), 1000000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    text = f"{sign}{hours:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{text}.{microseconds:06d}" if microseconds else text
+
+
+def copy_text_value(value):
+    """Поле текстового формату COPY; логічні значення як 1 та 0, бо так їх приймають і PostgreSQL, і MySQL"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, str):
+        return value.translate(COPY_TEXT_ESCAPES)
+    if isinstance(value, (bytes, bytearray)):
+        #   bytea у шістнадцятковому вигляді \x..., зворотна коса риска в COPY подвоюється
+        return "\\\\x" + value.hex()
+    if isinstance(value, timedelta):
+        return interval_text(value)
+    if isinstance(value, (set, frozenset)):
+        #   Стовпець SET MySQL конектор повертає множиною, текстом це значення через кому
+        return ",".join(sorted(value)).translate(COPY_TEXT_ESCAPES)
+    return str(value)
+
+
+def copy_text(rows):
+    """Порція рядків у текстовому форматі COPY"""
+    return "".join("\t".join(copy_text_value(value) for value in row) + "\n" for row in rows)
+
+
+#   Значення з файлів: у CSV всі поля - текст, у NDJSON - типи JSON
+FILE_VALUE_PARSERS = {
+    INTEGER: int,
+    FLOAT: float,
+    BOOLEAN: lambda value: parse_boolean(value) if isinstance(value, str) else bool(value),
+    TEXT: lambda value: value if isinstance(value, str) else str(value),
+}
+
+
+def file_rows_converter(kinds):
+    """Перетворення порції рядків з файлу у значення заданих видів стовпців"""
+    parsers = [FILE_VALUE_PARSERS[kind] for kind in kinds]
+
+    def convert(rows):
+        return [
+            tuple(None if value is None else parser(value) for parser, value in zip(parsers, row))
+            for row in rows
+        ]
+    return convert
@@ -0,0 +1,189 @@
+#   Потоковий експорт та імпорт таблиць у файли CSV та NDJSON; стиснення визначається розширенням:
+#       licenses.csv, licenses.ndjson.gz, licenses.csv.zst
+import csv
+import gzip
+import io
+import json
+import os
+from contextlib import contextmanager, ExitStack
+from datetime import timedelta
+from decimal import Decimal
+from itertools import chain, islice
+
+from config import FILE_TRANSFER
+from converters import file_rows_converter, interval_text
+from migration import run_migration, MigrationStats
+
+try:
+    import zstandard
+except ImportError:
+    #   Стиснення zstd необов'язкове, без пакета доступні лише gzip та нестиснені файли
+    zstandard = None
+
+CSV = "csv"
+NDJSON = "ndjson"
+FORMATS = {".csv": CSV, ".ndjson": NDJSON, ".jsonl": NDJSON}
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+#   NULL у CSV позначається \N, як у LOAD DATA MySQL, бо порожнє поле - це порожній рядок;
+#   текст, що починається зворотною скісною рискою, записується з ще однією, щоб текст "\N" не став NULL
+CSV_NULL = "\\N"
+CSV_ESCAPE = "\\"
+
+
+def csv_field(value):
+    if value is None:
+        return CSV_NULL
+    if isinstance(value, str) and value.startswith(CSV_ESCAPE):
+        return CSV_ESCAPE + value
+    if isinstance(value, timedelta):
+        return interval_text(value)
+    return value
+
+
+def csv_value(field):
+    if field == CSV_NULL:
+        return None
+    if field.startswith(CSV_ESCAPE):
+        return field[1:]
+    return field
+
+
+def file_format(filename):
+    """Формат та стиснення файлу за розширенням, наприклад licenses.csv.gz -> ("csv", "gzip")"""
+    root, extension = os.path.splitext(filename.lower())
+    compression = COMPRESSIONS.get(extension)
+    if compression is not None:
+        root, extension = os.path.splitext(root)
+    if extension not in FORMATS:
+        raise ValueError(f"Unknown format of file {filename}: expected .csv, .ndjson or .jsonl, optionally .gz or .zst")
+    return FORMATS[extension], compression
+
+
+@contextmanager
+def open_text(filename, mode, compression=None):
+    """Текстовий потік файлу, що читається та записується великими блоками; стиснений файл
+    розпаковується та стискається на льоту, тож у пам'яті тримаються лише буфери"""
+    buffer_size = FILE_TRANSFER["buffer_kib"] * 1024
+    with ExitStack() as stack:
+        file = stack.enter_context(open(filename, mode + "b", buffering=buffer_size))
+        if compression == "gzip":
+            file = stack.enter_context(
+                gzip.GzipFile(fileobj=file, mode=mode + "b", compresslevel=FILE_TRANSFER["gzip_level"])
+            )
+        elif compression == "zstd":
+            if zstandard is None:
+                raise ValueError(f"Compression of {filename} requires the zstandard package")
+            if mode == "w":
+                stream = zstandard.ZstdCompressor(level=FILE_TRANSFER["zstd_level"]).stream_writer(file, closefd=False)
+                file = stack.enter_context(io.BufferedWriter(stream, buffer_size))
+            else:
+                stream = zstandard.ZstdDecompressor().stream_reader(file, read_size=buffer_size, closefd=False)
+                file = stack.enter_context(io.BufferedReader(stream, buffer_size))
+        yield stack.enter_context(io.TextIOWrapper(file, encoding="utf-8", newline=""))
+
+
+def json_value(value):
+    """Значення, яких немає в JSON: Decimal записується числом, решта (дати) - текстом"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode()
+    if isinstance(value, timedelta):
+        return interval_text(value)
+    return str(value)
+
+
+def csv_chunk_writer(file, column_names):
+    """Запис заголовка CSV; повертає функцію запису порції рядків"""
+    writer = csv.writer(file, lineterminator="\n")
+    writer.writerow(column_names)
+
+    def write_chunk(rows):
+        writer.writerows([csv_field(value) for value in row] for row in rows)
+    return write_chunk
+
+
+def ndjson_chunk_writer(file, column_names):
+    """Функція запису порції рядків NDJSON: по одному об'єкту {стовпець: значення} в рядку"""
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=json_value).encode
+
+    def write_chunk(rows):
+        file.write("".join(encode(dict(zip(column_names, row))) + "\n" for row in rows))
+    return write_chunk
+
+
+def csv_chunks(file, chunk_size):
+    """Назви стовпців із заголовка CSV та порції рядків зі значеннями-текстом"""
+    reader = csv.reader(file)
+    column_names = next(reader, [])
+
+    def chunks():
+        while True:
+            rows = [tuple(map(csv_value, row)) for row in islice(reader, chunk_size)]
+            if not rows:
+                return
+            yield rows
+    return column_names, chunks()
+
+
+def ndjson_chunks(file, chunk_size):
+    """Назви стовпців з першого об'єкта NDJSON та порції рядків у тому ж порядку стовпців"""
+    first_line = file.readline()
+    while first_line and not first_line.strip():
+        first_line = file.readline()
+    column_names = list(json.loads(first_line)) if first_line else []
+    lines = chain([first_line], file)
+    decode = json.JSONDecoder().decode
+
+    def chunks():
+        while True:
+            batch = list(islice(lines, chunk_size))
+            if not batch:
+                return
+            rows = [tuple(map(decode(line).get, column_names)) for line in batch if line.strip()]
+            if rows:
+                yield rows
+    return column_names, chunks()
+
+
+CHUNK_WRITERS = {CSV: csv_chunk_writer, NDJSON: ndjson_chunk_writer}
+CHUNK_READERS = {CSV: csv_chunks, NDJSON: ndjson_chunks}
+
+
+def export_file(filename, column_names, chunks, on_chunk=None) -> MigrationStats:
+    """Запис порцій рядків у файл; під своєю назвою файл з'являється лише після успішного запису"""
+    file_type, compression = file_format(filename)
+    partial_filename = f"{filename}.part"
+    try:
+        with open_text(partial_filename, "w", compression) as file:
+            stats = run_migration(chunks, CHUNK_WRITERS[file_type](file, column_names), on_chunk=on_chunk)
+        os.replace(partial_filename, filename)
+    except BaseException:
+        #   Перерваний експорт не залишає недописаного файлу
+        if hasattr(chunks, "close"):
+            chunks.close()
+        try:
+            os.remove(partial_filename)
+        except OSError:
+            pass
+        raise
+    stats.finish()
+    return stats
+
+
+@contextmanager
+def open_rows(filename, chunk_size):
+    """Назви стовпців файлу та ітератор його порцій рядків; файл відкритий до кінця блоку with"""
+    file_type, compression = file_format(filename)
+    with open_text(filename, "r", compression) as file:
+        yield CHUNK_READERS[file_type](file, chunk_size)
+
+
+def import_converter(filename, table_name, column_names, schema):
+    """Перетворення порцій з файлу у види стовпців цільової таблиці; стовпці файлу мають бути в таблиці"""
+    if not schema.exists:
+        raise ValueError(f"Table {table_name} does not exist")
+    unknown_columns = [name for name in column_names if name not in schema.column_names]
+    if not column_names or unknown_columns:
+        raise ValueError(f"Columns of {filename} do not match table {table_name}: unknown columns {unknown_columns}")
+    return file_rows_converter(schema.kinds_of(column_names))
@@ -1,8 +1,13 @@
 import sys
+import time
+
+#   Час запуску фіксується до імпорту PyQt, щоб звіт про запуск враховував і його
+started = time.perf_counter()
+
 from MainWindow import MainWindow
 from PyQt5.QtWidgets import QApplication
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    widget = MainWindow()
+    widget = MainWindow(started)
     app.exec_()
@@ -0,0 +1,293 @@
+import io
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+class MigrationStats:
+    """Статистика міграції: кількість перенесених рядків, швидкість та час окремих етапів"""
+    def __init__(self):
+        self.rows = 0
+        self.started = time.perf_counter()
+        self.finished = None
+        #   Сумарний час етапів (read, convert, write, commit) в секундах
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Вимірювання часу етапу міграції"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def add(self, rows: int):
+        """Врахувати перенесену порцію рядків"""
+        self.rows += rows
+
+    def finish(self):
+        """Зафіксувати час завершення міграції (повторний виклик переносить час завершення)"""
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        """Тривалість міграції в секундах"""
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def rows_per_second(self):
+        """Швидкість міграції в рядках за секунду"""
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        return f"{self.rows} rows in {self.elapsed:.2f}s ({self.rows_per_second:.0f} rows/s)"
+
+
+def iter_chunks(cursor, chunk_size: int):
+    """Читання результату запиту порціями фіксованого розміру"""
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+class ConsumerStopped(Exception):
+    """Споживач порцій зупинився, тож джерело має припинити читання"""
+
+
+def pushed_chunks(produce, depth: int):
+    """Джерело, що саме надсилає порції через produce(emit), виконується в окремому потоці,
+    а порції віддаються ітератором через обмежену чергу"""
+    buffer = queue.Queue(maxsize=max(depth, 1))
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        """Додавання в чергу, що не блокується назавжди після зупинки споживача"""
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def emit(rows):
+        """Передача порції споживачу; після його зупинки перериває джерело"""
+        if stop.is_set():
+            raise ConsumerStopped()
+        put(rows)
+
+    def read():
+        """Потік читання: з'єднання джерела використовується лише в цьому потоці"""
+        try:
+            produce(emit)
+        except ConsumerStopped:
+            pass
+        except BaseException as error:
+            put(error)
+        finally:
+            put(done)
+
+    reader = threading.Thread(target=read, name="migration-reader", daemon=True)
+    reader.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        reader.join()
+
+
+def prefetch(chunks, depth: int):
+    """Читання порцій джерела в окремому потоці, поки попередні порції записуються в цільову БД"""
+    if depth <= 0:
+        yield from chunks
+        return
+
+    def produce(emit):
+        """Курсор джерела читається та закривається в потоці читання"""
+        try:
+            for rows in chunks:
+                emit(rows)
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+    yield from pushed_chunks(produce, depth)
+
+
+class LineChunkWriter(io.TextIOBase):
+    """Файл для copy_expert: розбирає отримані рядки тексту та надсилає їх порціями"""
+    def __init__(self, parse_line, chunk_size: int, emit):
+        super(LineChunkWriter, self).__init__()
+        self.parse_line = parse_line
+        self.chunk_size = chunk_size
+        self.emit = emit
+        self.tail = ""
+        self.rows = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        #   Рядок може бути розірваний між двома викликами write
+        lines = (self.tail + data).split("\n")
+        self.tail = lines.pop()
+        for line in lines:
+            self.rows.append(self.parse_line(line))
+            if len(self.rows) >= self.chunk_size:
+                self.emit(self.rows)
+                self.rows = []
+        return len(data)
+
+    def emit_rest(self):
+        """Надсилання останньої неповної порції"""
+        if self.tail:
+            self.rows.append(self.parse_line(self.tail))
+            self.tail = ""
+        if self.rows:
+            self.emit(self.rows)
+            self.rows = []
+
+
+def run_migration(chunks, write_chunk, on_chunk=None, convert=None) -> MigrationStats:
+    """Перенесення даних порціями: кожна прочитана порція одразу записується в цільову БД"""
+    stats = MigrationStats()
+    chunks = iter(chunks)
+    try:
+        while True:
+            with stats.phase("read"):
+                rows = next(chunks, None)
+            if rows is None:
+                break
+            if convert is not None:
+                with stats.phase("convert"):
+                    rows = convert(rows)
+            with stats.phase("write"):
+                write_chunk(rows)
+            stats.add(len(rows))
+            #   on_chunk може перервати міграцію винятком (наприклад, при скасуванні)
+            if on_chunk is not None:
+                on_chunk(stats)
+    finally:
+        #   Закриття курсора джерела, якщо міграцію перервано посередині
+        if hasattr(chunks, "close"):
+            chunks.close()
+    stats.finish()
+    return stats
+
+
+class PartitionAborted(Exception):
+    """Розділ міграції зупинено, бо інший розділ завершився помилкою чи скасуванням"""
+
+
+def split_id_range(min_id, max_id, partitions: int):
+    """Поділ діапазону id [min_id, max_id] на рівні півінтервали [low, high)"""
+    if min_id is None or max_id is None:
+        return []
+    partitions = max(1, min(partitions, max_id - min_id + 1))
+    step = (max_id - min_id + 1) / partitions
+    bounds = [min_id + round(step * i) for i in range(partitions)] + [max_id + 1]
+    return list(zip(bounds, bounds[1:]))
+
+
+def run_partitioned(ranges, copy_range, workers: int, on_chunk=None) -> MigrationStats:
+    """Паралельне перенесення діапазонів id; copy_range(low, high, on_chunk) копіює один розділ
+    на власних з'єднаннях та повертає його MigrationStats. Розділом може бути й інший кортеж
+    (наприклад, (таблиця,) під час міграції всієї бази): він передається в copy_range так само"""
+    stats = MigrationStats()
+    lock = threading.Lock()
+    failed = threading.Event()
+
+    def partition_progress():
+        """Зведення прогресу розділу в загальну статистику"""
+        counted = 0
+
+        def report(partition_stats):
+            nonlocal counted
+            if failed.is_set():
+                raise PartitionAborted()
+            with lock:
+                stats.add(partition_stats.rows - counted)
+                counted = partition_stats.rows
+                if on_chunk is not None:
+                    on_chunk(stats)
+        return report
+
+    def copy(*partition):
+        """Копіювання одного розділу в потоці пулу"""
+        if failed.is_set():
+            raise PartitionAborted()
+        try:
+            partition_stats = copy_range(*partition, partition_progress())
+        except BaseException:
+            failed.set()
+            raise
+        #   Час етапів підсумовується по всіх потоках
+        with lock:
+            for name, seconds in partition_stats.phases.items():
+                stats.phases[name] = stats.phases.get(name, 0.0) + seconds
+        return partition_stats
+
+    error = None
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="migration-partition") as executor:
+        try:
+            futures = [executor.submit(copy, *partition) for partition in ranges]
+            for future in futures:
+                try:
+                    future.result()
+                except PartitionAborted:
+                    pass
+                except BaseException as partition_error:
+                    if error is None:
+                        error = partition_error
+        except BaseException:
+            #   Перервано в головному потоці (наприклад, Ctrl+C): зупиняємо всі розділи
+            failed.set()
+            raise
+    if error is not None:
+        raise error
+    stats.finish()
+    return stats
+
+
+#   Контрольна точка блоку, що є в цільовій таблиці, але стан якого невідомий (стан синхронізації скинуто):
+#   не дорівнює ні контрольній сумі, ні відсутності блоку в джерелі, тож такий блок завжди синхронізується
+UNKNOWN_CHECKSUM = object()
+
+
+def changed_buckets(source_checksums: dict, checkpoints: dict):
+    """Блоки id, вміст яких змінився після останньої синхронізації (нові, змінені та видалені)"""
+    return sorted(
+        bucket for bucket in source_checksums.keys() | checkpoints.keys()
+        if source_checksums.get(bucket) != checkpoints.get(bucket)
+    )
+
+
+def run_sync(buckets, read_bucket, apply_bucket, on_chunk=None, convert=None) -> MigrationStats:
+    """Інкрементна синхронізація: кожен змінений блок id читається з джерела та застосовується окремою
+    транзакцією разом зі своєю контрольною точкою, тому перервана синхронізація продовжується з наступного блоку"""
+    stats = MigrationStats()
+    for bucket in buckets:
+        with stats.phase("read"):
+            rows = read_bucket(bucket)
+        if convert is not None:
+            with stats.phase("convert"):
+                rows = convert(rows)
+        with stats.phase("write"):
+            apply_bucket(bucket, rows)
+        stats.add(len(rows))
+        if on_chunk is not None:
+            on_chunk(stats)
+    stats.finish()
+    return stats
@@ -0,0 +1,139 @@
+#   Міграція всієї бази MySQL: опис таблиць з information_schema, порядок таблиць за зовнішніми ключами
+#   та DDL PostgreSQL. Таблиці створюються без первинних ключів, індексів та зовнішніх ключів,
+#   які додаються вже після завантаження даних
+from converters import postgresql_type
+from SchemaCatalog import TableSchema
+
+
+class IndexInfo:
+    """Індекс таблиці; prefix_lengths - довжина префікса кожного стовпця (None - стовпець повністю)"""
+    def __init__(self, name, columns, unique=False, prefix_lengths=None):
+        self.name = name
+        self.columns = columns
+        self.unique = unique
+        self.prefix_lengths = prefix_lengths or [None] * len(columns)
+
+
+class ForeignKeyInfo:
+    """Зовнішній ключ: стовпці таблиці посилаються на стовпці referenced_table"""
+    def __init__(self, name, columns, referenced_table, referenced_columns, on_update="NO ACTION",
+                 on_delete="NO ACTION"):
+        self.name = name
+        self.columns = columns
+        self.referenced_table = referenced_table
+        self.referenced_columns = referenced_columns
+        self.on_update = on_update
+        self.on_delete = on_delete
+
+
+class TableDefinition:
+    """Повний опис таблиці для міграції схеми: стовпці, первинний ключ, індекси та зовнішні ключі"""
+    def __init__(self, name, schema: TableSchema, primary_key=(), indexes=(), foreign_keys=(), estimated_rows=None):
+        self.name = name
+        self.schema = schema
+        self.primary_key = list(primary_key)
+        self.indexes = list(indexes)
+        self.foreign_keys = list(foreign_keys)
+        #   Приблизна кількість рядків за статистикою сервера (для прогресу)
+        self.estimated_rows = estimated_rows
+
+    @property
+    def dependencies(self):
+        """Таблиці, на які посилаються зовнішні ключі (без посилань таблиці на саму себе)"""
+        return {foreign_key.referenced_table for foreign_key in self.foreign_keys} - {self.name}
+
+
+def dependency_order(tables: [TableDefinition]):
+    """Таблиці в порядку зовнішніх ключів: таблиця йде після всіх таблиць, на які вона посилається.
+    Таблиці з циклічними посиланнями додаються в кінці - обмеження все одно створюються після завантаження"""
+    names = {table.name for table in tables}
+    remaining = {table.name: table.dependencies & names for table in tables}
+    by_name = {table.name: table for table in tables}
+    ordered = []
+    while remaining:
+        ready = sorted(name for name, dependencies in remaining.items() if not dependencies)
+        if not ready:
+            ordered.extend(by_name[name] for name in sorted(remaining))
+            break
+        for name in ready:
+            ordered.append(by_name[name])
+            del remaining[name]
+        for dependencies in remaining.values():
+            dependencies.difference_update(ready)
+    return ordered
+
+
+def quote_identifier(name):
+    """Назва в лапках: назви MySQL можуть збігатися з ключовими словами PostgreSQL (user, order)"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def quote_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def postgresql_default(column, column_type):
+    """Вираз DEFAULT для стовпця; значення MySQL - текст з information_schema"""
+    default = column.default
+    if default is None or column.auto_increment:
+        return ""
+    if column_type.startswith(("timestamp", "date", "time")) and default.upper().startswith(("CURRENT_TIMESTAMP", "NOW(")):
+        return " DEFAULT CURRENT_TIMESTAMP"
+    if default.startswith("b'") and default.endswith("'"):
+        #   Бітові літерали MySQL (b'0', b'1')
+        default = str(int(default[2:-1] or "0", 2))
+    return f" DEFAULT {quote_literal(default)}"
+
+
+def postgresql_create_table(schema_name, table: TableDefinition):
+    """CREATE TABLE без обмежень, крім NOT NULL: їх перевірка не гальмує завантаження"""
+    columns = []
+    for column in table.schema.columns:
+        column_type = postgresql_type(column.declared_type, column.auto_increment)
+        not_null = "" if column.nullable else " NOT NULL"
+        columns.append(f"{quote_identifier(column.name)} {column_type}{not_null}{postgresql_default(column, column_type)}")
+    return f"CREATE TABLE {quote_identifier(schema_name)}.{quote_identifier(table.name)} ({', '.join(columns)})"
+
+
+def postgresql_index_statements(schema_name, table: TableDefinition):
+    """Первинний ключ та індекси, що будуються після завантаження таблиці. Індекс за префіксом стовпця
+    стає індексом виразу substring, тож і унікальність перевіряється так само, як у MySQL"""
+    qualified_table = f"{quote_identifier(schema_name)}.{quote_identifier(table.name)}"
+    statements = []
+    if table.primary_key:
+        statements.append(
+            f"ALTER TABLE {qualified_table} ADD CONSTRAINT {quote_identifier(f'{table.name}_pkey')} "
+            f"PRIMARY KEY ({', '.join(map(quote_identifier, table.primary_key))})"
+        )
+    for index in table.indexes:
+        parts = [
+            quote_identifier(column) if length is None else f"(substring({quote_identifier(column)} from 1 for {length}))"
+            for column, length in zip(index.columns, index.prefix_lengths)
+        ]
+        statements.append(
+            f"CREATE {'UNIQUE ' if index.unique else ''}INDEX {quote_identifier(f'{table.name}_{index.name}')} "
+            f"ON {qualified_table} ({', '.join(parts)})"
+        )
+    return statements
+
+
+def postgresql_foreign_key_statements(table: TableDefinition):
+    """Зовнішні ключі таблиці; створюються, коли всі таблиці вже завантажені та мають первинні ключі"""
+    return [
+        f"ALTER TABLE {quote_identifier(table.name)} ADD CONSTRAINT {quote_identifier(foreign_key.name)} "
+        f"FOREIGN KEY ({', '.join(map(quote_identifier, foreign_key.columns))}) "
+        f"REFERENCES {quote_identifier(foreign_key.referenced_table)} "
+        f"({', '.join(map(quote_identifier, foreign_key.referenced_columns))}) "
+        f"ON UPDATE {foreign_key.on_update} ON DELETE {foreign_key.on_delete}"
+        for foreign_key in table.foreign_keys
+    ]
+
+
+def postgresql_sequence_statements(table: TableDefinition):
+    """Послідовності стовпців з автоінкрементом мають продовжуватись після перенесених значень"""
+    return [
+        f"SELECT setval(pg_get_serial_sequence({quote_literal(quote_identifier(table.name))}, "
+        f"{quote_literal(column.name)}), COALESCE(MAX({quote_identifier(column.name)}), 1), "
+        f"MAX({quote_identifier(column.name)}) IS NOT NULL) FROM {quote_identifier(table.name)}"
+        for column in table.schema.columns if column.auto_increment
+    ]
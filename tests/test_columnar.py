@@ -0,0 +1,114 @@
+import pytest
+
+from columnar import ColumnBatch, PagedRows, NumberColumn, TextColumn, ObjectColumn
+
+ROWS = [(i, i * 1.5, None if i % 4 == 0 else f"текст {i}", i % 2 == 0, None if i % 3 == 0 else i * 10)
+        for i in range(12)]
+
+
+def paged(page_size=4):
+    rows = PagedRows()
+    for start in range(0, len(ROWS), page_size):
+        rows.extend(ROWS[start:start + page_size])
+    return rows
+
+
+def assert_consistent(rows, expected):
+    """Рядки, межі сторінок та пошук рядка за номером відповідають очікуваному списку"""
+    assert list(rows) == expected
+    assert [rows[i] for i in range(len(expected))] == expected
+    assert len(rows) == len(expected)
+    position = 0
+    for page, start, end in zip(rows.pages, rows.starts, rows.ends):
+        assert (start, end) == (position, position + len(page))
+        position = end
+    assert all(len(page) for page in rows.pages)
+
+
+def test_batch_round_trip_and_column_types():
+    batch = ColumnBatch.from_rows(ROWS)
+    assert batch.rows() == ROWS
+    assert isinstance(batch.columns[0], NumberColumn)
+    assert isinstance(batch.columns[2], TextColumn)
+    assert batch.column(4) == [row[4] for row in ROWS]
+    assert batch.value(3, 2) == "текст 3"
+    assert batch.value(4, 2) is None
+
+
+def test_mixed_values_fall_back_to_objects():
+    batch = ColumnBatch.from_rows([(1, "a"), ("b", 2)])
+    assert isinstance(batch.columns[0], ObjectColumn)
+    assert batch.rows() == [(1, "a"), ("b", 2)]
+
+
+def test_batch_slices_and_select_share_columns():
+    batch = ColumnBatch.from_rows(ROWS)
+    part = batch[3:7]
+    assert part.columns is batch.columns
+    assert part.rows() == ROWS[3:7]
+    assert part[-1] == ROWS[6]
+    assert part.column(0) == [3, 4, 5, 6]
+    assert part.select([2, 0]).rows() == [(row[2], row[0]) for row in ROWS[3:7]]
+    assert batch[::5].rows() == ROWS[::5]
+    with pytest.raises(IndexError):
+        part[4]
+
+
+def test_batch_replace_and_insert_return_new_batches():
+    batch = ColumnBatch.from_rows(ROWS[:4])
+    changed = batch.replace({1: (100, 0.5, "x", True, None), 2: None})
+    assert changed.rows() == [ROWS[0], (100, 0.5, "x", True, None), ROWS[3]]
+    assert batch.rows() == ROWS[:4]
+    assert batch.insert(0, ROWS[5]).rows() == [ROWS[5]] + ROWS[:4]
+    assert ColumnBatch.from_rows([], 3).replace({}).rows() == []
+
+
+def test_paged_rows_value_and_column():
+    rows = paged()
+    assert rows.value(5, 2) == ROWS[5][2]
+    assert rows.value(-1, 0) == ROWS[-1][0]
+    assert rows.column(1) == [row[1] for row in ROWS]
+    assert rows[2:6] == ROWS[2:6]
+    with pytest.raises(IndexError):
+        rows.value(len(ROWS), 0)
+    with pytest.raises(IndexError):
+        PagedRows()[0]
+
+
+def test_setitem_rebuilds_only_its_page():
+    rows = paged()
+    untouched = rows.pages[0]
+    rows[5] = (500, 1.0, "changed", False, 1)
+    expected = list(ROWS)
+    expected[5] = (500, 1.0, "changed", False, 1)
+    assert_consistent(rows, expected)
+    assert rows.pages[0] is untouched
+
+
+@pytest.mark.parametrize("deleted", [slice(2, 9), slice(3, 5), slice(0, 12), slice(8, 12), slice(1, 11, 3), 4, -1])
+def test_delete_across_page_boundaries(deleted):
+    rows = paged()
+    expected = list(ROWS)
+    del rows[deleted]
+    del expected[deleted]
+    assert_consistent(rows, expected)
+
+
+@pytest.mark.parametrize("position", [0, 3, 4, 7, 11, 12, 20])
+def test_insert_at_page_boundaries(position):
+    rows = paged()
+    new_row = (99, 9.9, "new", True, None)
+    expected = list(ROWS)
+    expected.insert(position, new_row)
+    rows.insert(position, new_row)
+    assert_consistent(rows, expected)
+
+
+def test_insert_into_empty_and_delete_everything():
+    rows = PagedRows()
+    rows.insert(0, ROWS[0])
+    assert_consistent(rows, [ROWS[0]])
+    del rows[0]
+    assert_consistent(rows, [])
+    rows.extend([])
+    assert rows.pages == []
@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from ConnectionPool import ConnectionPool, PoolExhausted
+from config import POOL
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.alive = True
+        self.closed = False
+        self.rolled_back = 0
+
+    def close(self):
+        self.closed = True
+
+    def rollback(self):
+        self.rolled_back += 1
+
+
+class FakeServer:
+    def __init__(self):
+        self.connections = []
+        self.pings = 0
+
+    def connect(self):
+        connection = FakeConnection(len(self.connections))
+        self.connections.append(connection)
+        return connection
+
+    def ping(self, connection):
+        self.pings += 1
+        return connection.alive
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+def make_pool(server, size=2):
+    return ConnectionPool(server.connect, server.ping, size, errors=(ConnectionError,))
+
+
+def test_acquire_times_out_when_exhausted(server, monkeypatch):
+    monkeypatch.setitem(POOL, "acquire_timeout", 0.05)
+    pool = make_pool(server)
+    first, second = pool.acquire(), pool.acquire()
+    with pytest.raises(PoolExhausted):
+        pool.acquire()
+    #   Повернене з'єднання знову можна отримати
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.release(second)
+
+
+def test_waiting_acquire_gets_released_connection(server):
+    pool = make_pool(server, size=1)
+    connection = pool.acquire()
+    timer = threading.Timer(0.05, pool.release, (connection,))
+    timer.start()
+    assert pool.acquire(timeout=2) is connection
+    timer.join()
+
+
+def test_idle_connection_is_pinged_and_replaced(server, monkeypatch):
+    monkeypatch.setitem(POOL, "idle_ping_seconds", 0)
+    pool = make_pool(server)
+    connection = pool.acquire()
+    pool.release(connection)
+    #   Сервер розірвав з'єднання, поки воно простоювало в пулі
+    connection.alive = False
+    replacement = pool.acquire()
+    assert replacement is not connection
+    assert connection.closed
+    assert server.pings == 1
+
+
+def test_recently_used_connection_is_not_pinged(server, monkeypatch):
+    monkeypatch.setitem(POOL, "idle_ping_seconds", 60)
+    pool = make_pool(server)
+    connection = pool.acquire()
+    assert pool.is_alive(connection)
+    pool.release(connection)
+    assert pool.acquire() is connection
+    assert server.pings == 0
+
+
+def test_connection_rolls_back_on_error(server):
+    pool = make_pool(server)
+    with pytest.raises(ValueError):
+        with pool.connection() as connection:
+            raise ValueError("query failed")
+    assert connection.rolled_back == 1
+    assert pool.acquire() is connection
+
+
+def test_failed_reconnect_frees_pool_slot(server, monkeypatch):
+    monkeypatch.setitem(POOL, "idle_ping_seconds", 0)
+    monkeypatch.setitem(POOL, "retries", 1)
+    pool = make_pool(server, size=1)
+    connection = pool.acquire()
+    pool.release(connection)
+    connection.alive = False
+
+    def server_down():
+        raise ConnectionError("server is down")
+
+    pool.connect = server_down
+    with pytest.raises(ConnectionError):
+        pool.acquire()
+    assert pool.created == 0
+    #   Після відновлення сервера з'єднання знову відкривається, а не PoolExhausted
+    pool.connect = server.connect
+    monkeypatch.setitem(POOL, "acquire_timeout", 0.05)
+    assert pool.acquire().alive
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+
+from converters import BOOLEAN, INTEGER, FLOAT, TEXT, mysql_kind, postgresql_kind, build_plan, convert_rows, \
+    copy_text, copy_line_parser, parse_text, postgresql_type, copy_text_value
+
+
+def test_mysql_tinyint_plan_converts_to_boolean():
+    source_kinds = [mysql_kind("int(11)"), mysql_kind("tinyint(1)")]
+    target_kinds = [postgresql_kind(23), postgresql_kind(16)]
+    plan = build_plan(source_kinds, target_kinds, integer_booleans=True)
+    assert [i for i, _ in plan] == [1]
+    assert convert_rows([(1, 0), (2, 1), (3, None)], plan) == [[1, False], [2, True], [3, None]]
+
+
+def test_native_booleans_need_no_plan():
+    assert build_plan([BOOLEAN, INTEGER], [BOOLEAN, INTEGER]) == []
+    rows = [(True, 1)]
+    assert convert_rows(rows, []) is rows
+
+
+def test_plan_converts_only_differing_kinds():
+    plan = build_plan([INTEGER, TEXT, FLOAT], [FLOAT, TEXT, INTEGER])
+    assert convert_rows([(1, "a", 2.0)], plan) == [[1.0, "a", 2]]
+
+
+def test_copy_text_round_trip():
+    rows = [(1, "tab\there\nnew \\ line", None, True)]
+    line = copy_text(rows).rstrip("\n")
+    fields = line.split("\t")
+    assert fields[3] == "1"
+    parse_line = copy_line_parser([INTEGER, TEXT, TEXT])
+    assert parse_line("\t".join(fields[:3])) == (1, "tab\there\nnew \\ line", None)
+
+
+def test_parse_text():
+    assert parse_text("", INTEGER) is None
+    assert parse_text("NULL", TEXT) is None
+    assert parse_text(" 42 ", INTEGER) == 42
+    assert parse_text("yes", BOOLEAN) is True
+
+
+@pytest.mark.parametrize("column_type, expected", [
+    ("tinyint(4)", "smallint"),
+    ("tinyint(3) unsigned", "smallint"),
+    ("smallint(6) unsigned", "integer"),
+    ("mediumint(9)", "integer"),
+    ("int(11)", "integer"),
+    ("int(10) unsigned", "bigint"),
+    ("bigint(20)", "bigint"),
+    ("bigint(20) unsigned", "numeric(20)"),
+    (b"tinyint(1)", "boolean"),
+    ("TINYINT(1)", "boolean"),
+    ("bit(1)", "boolean"),
+    ("bit(8)", "bigint"),
+    ("decimal(10,2) unsigned", "numeric(10,2)"),
+    ("varchar(255)", "varchar(255)"),
+    ("datetime(3)", "timestamp(3)"),
+    ("enum('a','b')", "text"),
+    ("longblob", "bytea"),
+])
+def test_postgresql_type(column_type, expected):
+    assert postgresql_type(column_type) == expected
+
+
+@pytest.mark.parametrize("column_type, expected", [
+    ("smallint(6)", "smallserial"),
+    ("int(11)", "serial"),
+    ("int(10) unsigned", "bigserial"),
+    ("bigint(20) unsigned", "bigserial"),
+])
+def test_postgresql_type_auto_increment(column_type, expected):
+    assert postgresql_type(column_type, auto_increment=True) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    (timedelta(hours=2, minutes=3, seconds=4), "02:03:04"),
+    (timedelta(hours=838, minutes=59, seconds=59), "838:59:59"),
+    (timedelta(days=1, seconds=1, microseconds=500), "24:00:01.000500"),
+    (timedelta(seconds=-1), "-00:00:01"),
+    (-timedelta(hours=25, minutes=30), "-25:30:00"),
+    (timedelta(0), "00:00:00"),
+])
+def test_copy_text_time_values(value, expected):
+    assert copy_text_value(value) == expected
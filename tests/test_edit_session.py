@@ -0,0 +1,88 @@
+from converters import INTEGER, FLOAT, TEXT, BOOLEAN
+from EditSession import EditSession, parse_edits, parse_pasted_rows, find_failed_edit
+
+COLUMNS = ["id", "price", "rating", "program_name", "is_unlimited_license"]
+KINDS = [INTEGER, INTEGER, FLOAT, TEXT, BOOLEAN]
+ROW = (7, 100, 4.5, "name", False)
+
+
+def test_session_merges_repeated_edits():
+    session = EditSession()
+    session.add(ROW, 0, 1, "150")
+    session.add((7, 150, 4.5, "name", False), 0, 1, "200")
+    session.add(ROW, 0, 3, "other")
+    edits, original_rows = session.take()
+    assert edits == [(ROW, 1, "200"), (ROW, 3, "other")]
+    assert original_rows == {7: ROW}
+    assert len(session) == 0
+
+
+def test_parse_edits_groups_by_column_and_changes_id_last():
+    edits = [(ROW, 0, "70"), (ROW, 1, " 120 "), (ROW, 3, "null"), (ROW, 2, ""), (ROW, 4, "yes")]
+    statements, new_ids, errors = parse_edits(edits, COLUMNS, KINDS, 0)
+    assert errors == []
+    assert statements == [
+        ("price", [(120, 7)]),
+        ("program_name", [(None, 7)]),
+        ("rating", [(None, 7)]),
+        ("is_unlimited_license", [(True, 7)]),
+        ("id", [(70, 7)]),
+    ]
+    assert new_ids == [70]
+
+
+def test_parse_edits_reports_invalid_values():
+    edits = [(ROW, 4, "maybe"), (ROW, 1, "12a"), (ROW, 2, "3.5")]
+    statements, _, errors = parse_edits(edits, COLUMNS, KINDS, 0)
+    assert statements == [("rating", [(3.5, 7)])]
+    assert len(errors) == 2
+    assert errors[0].startswith("id 7, is_unlimited_license:")
+    assert errors[1].startswith("id 7, price:")
+
+
+def test_paste_all_columns_or_all_but_id():
+    columns, rows, errors = parse_pasted_rows("1\t10\t\tname\ttrue\n", COLUMNS, KINDS, 0)
+    assert (columns, rows, errors) == ([0, 1, 2, 3, 4], [(1, 10, None, "name", True)], [])
+    columns, rows, errors = parse_pasted_rows("10,NULL,\"a, b\",0\n20,2.5,c,false\n", COLUMNS, KINDS, 0)
+    assert columns == [1, 2, 3, 4]
+    assert rows == [(10, None, "a, b", False), (20, 2.5, "c", False)]
+    assert errors == []
+
+
+def test_paste_with_header_in_any_order():
+    columns, rows, errors = parse_pasted_rows("program_name\tprice\nx\t5\n\ny\tnull\n", COLUMNS, KINDS, 0)
+    assert columns == [3, 1]
+    assert rows == [("x", 5), ("y", None)]
+    assert errors == []
+
+
+def test_paste_rejects_wrong_column_counts():
+    assert parse_pasted_rows("1\t2\n", COLUMNS, KINDS, 0) == ([], [], ["expected 5 or 4 fields per row, got 2"])
+    columns, rows, errors = parse_pasted_rows("1\t2\t3\tx\ttrue\n4\t5\n", COLUMNS, KINDS, 0)
+    assert rows == [(1, 2, 3.0, "x", True)]
+    assert errors == ["row 2: expected 5 fields, got 2"]
+
+
+def test_paste_reports_invalid_booleans_and_numbers():
+    _, rows, errors = parse_pasted_rows("10\t1\tx\tmaybe\n1.5\t1\ty\tno\n", COLUMNS, KINDS, 0)
+    assert rows == []
+    assert errors[0] == "row 1, is_unlimited_license: 'maybe' is not a boolean value"
+    assert errors[1].startswith("row 2, price:")
+
+
+def test_paste_empty_text():
+    assert parse_pasted_rows(" \n\t\n", COLUMNS, KINDS, 0) == ([], [], [])
+
+
+def test_find_failed_edit_stops_at_first_error():
+    executed = []
+
+    def execute_one(field_name, value, field_id):
+        if value == "bad":
+            raise ValueError("rejected")
+        executed.append((field_name, value, field_id))
+
+    statements = [("price", [(1, 1), ("bad", 2), (3, 3)])]
+    assert find_failed_edit(statements, execute_one, (ValueError,)) == "id 2, price=bad: rejected"
+    assert executed == [("price", 1, 1)]
+    assert find_failed_edit([("price", [(1, 1)])], execute_one, (ValueError,)) is None
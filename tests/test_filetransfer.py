@@ -0,0 +1,50 @@
+import pytest
+
+from benchmark import BENCHMARK_TABLE
+from ConsoleLogger import ConsoleLogger
+from DatabaseSQLite import DatabaseSQLite
+from filetransfer import file_format
+
+ROWS = [
+    (1, 100, 4.5, "plain", 1),
+    (2, None, None, "\\N", 0),
+    (3, 0, 0.0, None, None),
+    (4, -5, 1.25, "\\\\N and \\ slash", 1),
+    (5, 7, 2.0, "", 0),
+    (6, 8, 3.0, "comma, \"quotes\"\nnew line", 1),
+]
+
+
+@pytest.fixture
+def table(tmp_path):
+    target = DatabaseSQLite(filename=str(tmp_path / "table.db"), logger=ConsoleLogger())
+    target.table_name = BENCHMARK_TABLE
+    target.cursor.execute(
+        f"CREATE TABLE {BENCHMARK_TABLE} (id INTEGER PRIMARY KEY, price INTEGER, rating REAL, "
+        f"program_name TEXT, is_unlimited_license BOOLEAN)"
+    )
+    target.cursor.executemany(f"INSERT INTO {BENCHMARK_TABLE} VALUES (?, ?, ?, ?, ?)", ROWS)
+    target.db.commit()
+    return target
+
+
+def table_rows(target):
+    return target.db.execute(f"SELECT * FROM {BENCHMARK_TABLE} ORDER BY id").fetchall()
+
+
+@pytest.mark.parametrize("name", ["licenses.csv", "licenses.csv.gz", "licenses.ndjson"])
+def test_file_round_trip_keeps_nulls_and_text(table, tmp_path, name):
+    filename = str(tmp_path / name)
+    stats = table.export_to_file(filename)
+    assert stats.rows == len(ROWS)
+    table.db.execute(f"DELETE FROM {BENCHMARK_TABLE}")
+    table.db.commit()
+    table.import_from_file(filename)
+    assert table_rows(table) == ROWS
+
+
+def test_file_format():
+    assert file_format("a.CSV") == ("csv", None)
+    assert file_format("a.jsonl.zst") == ("ndjson", "zstd")
+    with pytest.raises(ValueError):
+        file_format("a.txt.gz")
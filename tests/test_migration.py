@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from migration import run_migration, run_partitioned, run_sync, changed_buckets, split_id_range, iter_chunks, \
+    prefetch, UNKNOWN_CHECKSUM
+
+
+def test_changed_buckets_new_changed_and_deleted():
+    source = {0: (10, "a"), 1: (10, "b"), 3: (5, "d")}
+    checkpoints = {0: (10, "a"), 1: (10, "x"), 2: (10, "c")}
+    assert changed_buckets(source, checkpoints) == [1, 2, 3]
+
+
+def test_changed_buckets_after_state_reset():
+    #   Після скидання стану блоки цільової таблиці невідомі: синхронізуються і наявні в джерелі,
+    #   і видалені з нього
+    source = {0: (10, "a")}
+    checkpoints = {0: UNKNOWN_CHECKSUM, 1: UNKNOWN_CHECKSUM}
+    assert changed_buckets(source, checkpoints) == [0, 1]
+
+
+def test_run_migration_writes_all_chunks():
+    written = []
+    stats = run_migration(iter([[1, 2], [3]]), written.extend, convert=lambda rows: [row * 10 for row in rows])
+    assert written == [10, 20, 30]
+    assert stats.rows == 3
+
+
+def test_run_sync_applies_each_bucket():
+    applied = {}
+    stats = run_sync([2, 5], lambda bucket: [bucket] * bucket, applied.__setitem__)
+    assert applied == {2: [2, 2], 5: [5] * 5}
+    assert stats.rows == 7
+
+
+def test_split_id_range_covers_range():
+    ranges = split_id_range(1, 100, 4)
+    assert ranges[0][0] == 1
+    assert ranges[-1][1] > 100
+    assert all(high == low for (_, high), (low, _) in zip(ranges, ranges[1:]))
+
+
+def test_run_partitioned_collects_rows_and_errors():
+    lock = threading.Lock()
+    seen = []
+
+    def copy_range(low, high, on_chunk):
+        with lock:
+            seen.append(low)
+        return run_migration(iter([list(range(low, high))]), lambda rows: None, on_chunk=on_chunk)
+
+    stats = run_partitioned(split_id_range(0, 99, 4), copy_range, workers=2)
+    assert stats.rows == 100
+    assert len(seen) == 4
+
+    def failing(low, high, on_chunk):
+        raise ValueError("partition failed")
+
+    with pytest.raises(ValueError):
+        run_partitioned([(0, 10), (10, 20)], failing, workers=2)
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+
+def test_iter_chunks_and_prefetch():
+    chunks = list(prefetch(iter_chunks(FakeCursor(list(range(7))), 3), 2))
+    assert chunks == [[0, 1, 2], [3, 4, 5], [6]]
@@ -0,0 +1,127 @@
+import sqlite3
+
+import pytest
+
+from columnar import ColumnBatch
+from PageCache import PageCache
+from utils import RowFilter, page_query
+
+COLUMNS = ["id", "price", "rating", "program_name"]
+ROWS = [(i, i * 10, None if i % 3 == 0 else float(i % 5), f"program {i}") for i in range(1, 21)]
+
+
+def page(first, count):
+    return [row for row in ROWS if first <= row[0] < first + count]
+
+
+def fetch(cache, after_row, limit=5, row_filter=None, table="licenses"):
+    row_filter = row_filter if row_filter is not None else RowFilter()
+    loads = []
+
+    def load():
+        loads.append(after_row)
+        first = 1 if after_row is None else after_row[0] + 1
+        return page(first, limit)
+
+    rows = cache.fetch(table, row_filter, COLUMNS, after_row, limit, load)
+    return rows, bool(loads)
+
+
+def test_pages_are_cached_by_previous_row():
+    cache = PageCache(budget_bytes=1 << 20)
+    first, loaded = fetch(cache, None)
+    assert loaded and list(first) == page(1, 5)
+    again, loaded = fetch(cache, None)
+    assert not loaded and again is first
+    second, loaded = fetch(cache, first[-1])
+    assert loaded and list(second) == page(6, 5)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_page_is_evicted():
+    page_bytes = ColumnBatch.from_rows(page(1, 5)).nbytes
+    cache = PageCache(budget_bytes=page_bytes * 2 + page_bytes // 2)
+    first, _ = fetch(cache, None)
+    second, _ = fetch(cache, first[-1])
+    #   Перша сторінка використана останньою, тож витісняється друга
+    fetch(cache, None)
+    fetch(cache, second[-1])
+    assert len(cache) == 2
+    assert cache.size <= cache.budget_bytes
+    assert not fetch(cache, None)[1]
+    assert fetch(cache, first[-1])[1]
+
+
+def test_page_larger_than_budget_is_not_cached():
+    cache = PageCache(budget_bytes=10)
+    fetch(cache, None)
+    assert len(cache) == 0 and cache.size == 0
+
+
+def test_edited_rows_replace_cached_values():
+    cache = PageCache(budget_bytes=1 << 20)
+    first, _ = fetch(cache, None)
+    by_price = RowFilter(sort_column="price")
+    fetch(cache, None, row_filter=by_price)
+    edited = (2, 999, 1.5, "edited")
+    cache.update_rows("licenses", 0, [edited], ["price"])
+    rows, loaded = fetch(cache, None)
+    assert not loaded and rows[1] == edited
+    #   Модель таблиці ділить стару сторінку, вона не змінюється
+    assert first[1] == ROWS[1]
+    #   Сортування за зміненим стовпцем могло перемістити рядок, сторінку скинуто
+    assert fetch(cache, None, row_filter=by_price)[1]
+
+
+def test_removed_and_inserted_rows_drop_pages():
+    cache = PageCache(budget_bytes=1 << 20)
+    first, _ = fetch(cache, None)
+    fetch(cache, first[-1])
+    cache.remove_rows("licenses", 0, [7])
+    assert not fetch(cache, None)[1]
+    assert fetch(cache, first[-1])[1]
+    #   Неповна остання сторінка скидається, бо новий рядок додається в її кінець
+    fetch(cache, ROWS[-3], limit=5)
+    cache.insert_row("licenses", 0, (21, 1, 1.0, "new"))
+    assert fetch(cache, ROWS[-3], limit=5)[1]
+    assert not fetch(cache, None)[1]
+
+
+def test_invalidate_drops_only_that_table():
+    cache = PageCache(budget_bytes=1 << 20)
+    fetch(cache, None)
+    fetch(cache, None, table="other")
+    cache.invalidate("licenses")
+    assert fetch(cache, None)[1]
+    assert not fetch(cache, None, table="other")[1]
+
+
+@pytest.fixture
+def db():
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE licenses (id INTEGER PRIMARY KEY, price INT, rating FLOAT, program_name TEXT)")
+    db.executemany("INSERT INTO licenses VALUES (?, ?, ?, ?)", ROWS)
+    return db
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("limit", [1, 3, 7])
+def test_keyset_paging_across_null_sort_values(db, descending, limit):
+    row_filter = RowFilter(sort_column="rating", descending=descending)
+    direction = "DESC" if descending else "ASC"
+    expected = db.execute(f"SELECT * FROM licenses ORDER BY rating {direction}, id {direction}").fetchall()
+    rows, after_row = [], None
+    while True:
+        query, params = page_query("licenses", COLUMNS, row_filter, after_row, limit, placeholder="?")
+        chunk = db.execute(query, params).fetchall()
+        if not chunk:
+            break
+        rows.extend(chunk)
+        after_row = chunk[-1]
+    assert rows == expected
+
+
+def test_keyset_paging_with_range_filter(db):
+    row_filter = RowFilter(range_min=50, range_max=150, sort_column="price", descending=True)
+    query, params = page_query("licenses", COLUMNS, row_filter, None, 100, placeholder="?")
+    assert [row[1] for row in db.execute(query, params)] == list(range(150, 40, -10))
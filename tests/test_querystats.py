@@ -0,0 +1,67 @@
+import random
+import time
+
+from QueryStats import QueryStats, normalize_sql, statement_type, MAX_KEY_CHARS
+
+UPSERT_PREFIX = "INSERT INTO internet_store_licenses (id, price, rating, program_name, is_unlimited_license) VALUES "
+UPSERT_SUFFIX = " ON CONFLICT (id) DO UPDATE SET price = EXCLUDED.price, rating = EXCLUDED.rating"
+
+
+def values_page(seed, rows):
+    """Сторінка значень у тому вигляді, в якому її формує execute_values"""
+    generator = random.Random(seed)
+    return ",".join(
+        f"({i},{generator.randint(-5, 5000)},{generator.choice(['NULL', '4.5', '-1e-05'])},"
+        f"'name ''{i}'', (x)',{generator.choice(['true', 'false'])})"
+        for i in range(seed * rows, (seed + 1) * rows)
+    )
+
+
+def test_literals_and_parameters():
+    assert normalize_sql("SELECT * FROM t WHERE a = 'x' AND b = 10 AND c = %s") == \
+        "SELECT * FROM t WHERE a = ? AND b = ? AND c = ?"
+    assert normalize_sql("SELECT id FROM t1 WHERE x IS NULL") == "SELECT id FROM t1 WHERE x IS NULL"
+
+
+def test_value_rows_with_keyword_literals_collapse():
+    assert normalize_sql("INSERT INTO t (a, b, c) VALUES (1, true, NULL), (-2, FALSE, 'x')") == \
+        "INSERT INTO t (a, b, c) VALUES (...), ..."
+
+
+def test_execute_values_pages_share_one_key():
+    first = UPSERT_PREFIX + values_page(1, 10000) + UPSERT_SUFFIX
+    second = UPSERT_PREFIX + values_page(2, 9000) + UPSERT_SUFFIX
+    key = normalize_sql(first)
+    assert key == normalize_sql(second) == normalize_sql(second.encode())
+    assert key == "INSERT INTO internet_store_licenses (id, price, rating, program_name, is_unlimited_license) " \
+                  "VALUES (...), ... ON CONFLICT (id) DO UPDATE SET price = EXCLUDED.price, rating = EXCLUDED.rating"
+    #   Сторінка з кількох рядків нормалізується так само, як і повна
+    assert normalize_sql(UPSERT_PREFIX + values_page(3, 2) + UPSERT_SUFFIX) == key
+
+
+def test_long_sql_is_fast_and_capped():
+    page = UPSERT_PREFIX + values_page(1, 10000) + UPSERT_SUFFIX
+    started = time.perf_counter()
+    for _ in range(10):
+        normalize_sql(page)
+    assert (time.perf_counter() - started) / 10 < 0.005
+    assert len(normalize_sql("SELECT " + ", ".join(f"column_{i}" for i in range(1000)) + " FROM t")) <= MAX_KEY_CHARS
+
+
+def test_statements_aggregate_and_slow_log():
+    stats = QueryStats(slow_query_ms=100, slow_log_size=2)
+    for page in range(3):
+        stats.record("PostgreSQL", UPSERT_PREFIX + values_page(page, 500) + UPSERT_SUFFIX, 0.2, 500)
+    key = stats.record("PostgreSQL", "SELECT * FROM t WHERE id = 5", 0.001, 1)
+    stats.record_fetch(key, 0.002, 1)
+    snapshot = stats.snapshot()
+    assert len(snapshot["statements"]) == 2
+    insert = snapshot["statements"][0]
+    assert insert["type"] == "INSERT"
+    assert insert["count"] == 3 and insert["rows_affected"] == 1500
+    assert snapshot["statements"][1]["rows_fetched"] == 1
+    assert len(snapshot["slow_queries"]) == 2
+
+
+def test_statement_type():
+    assert statement_type("(SELECT 1) UNION (SELECT 2)") == "SELECT"
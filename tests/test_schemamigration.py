@@ -0,0 +1,27 @@
+from schemamigration import TableDefinition, ForeignKeyInfo, dependency_order
+from SchemaCatalog import TableSchema
+
+
+def table(name, *references):
+    foreign_keys = [ForeignKeyInfo(f"fk_{name}_{reference}", ["ref_id"], reference, ["id"]) for reference in references]
+    return TableDefinition(name, TableSchema([]), foreign_keys=foreign_keys)
+
+
+def names(tables):
+    return [table.name for table in tables]
+
+
+def test_tables_follow_their_references():
+    tables = [table("orders", "customers", "products"), table("products", "vendors"), table("customers"),
+              table("vendors"), table("order_items", "orders", "products")]
+    assert names(dependency_order(tables)) == ["customers", "vendors", "products", "orders", "order_items"]
+
+
+def test_self_and_unknown_references_are_ignored():
+    tables = [table("employees", "employees", "departments"), table("audit", "missing")]
+    assert names(dependency_order(tables)) == ["audit", "employees"]
+
+
+def test_cycles_are_appended_last():
+    tables = [table("a", "b"), table("b", "a"), table("c", "a"), table("d")]
+    assert names(dependency_order(tables)) == ["d", "a", "b", "c"]
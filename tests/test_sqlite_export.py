@@ -0,0 +1,123 @@
+import sqlite3
+
+import pytest
+
+from benchmark import SQLiteSource, create_sqlite_source, BENCHMARK_TABLE, COLUMN_NAMES
+from config import MIGRATION
+from ConsoleLogger import ConsoleLogger
+from DatabaseSQLite import DatabaseSQLite
+
+ROWS = 3000
+
+
+@pytest.fixture
+def source(tmp_path):
+    """Джерело з пропусками в id, як після видалення рядків у PostgreSQL"""
+    filename = str(tmp_path / "source.db")
+    create_sqlite_source(filename, ROWS, 20, 1000)
+    db = sqlite3.connect(filename)
+    db.execute(f"DELETE FROM {BENCHMARK_TABLE} WHERE id % 7 = 0 OR id BETWEEN 100 AND 400")
+    db.commit()
+    db.close()
+    return SQLiteSource(filename)
+
+
+def export(source, filename, workers, monkeypatch):
+    monkeypatch.setitem(MIGRATION, "parallel_workers", workers)
+    target = DatabaseSQLite(filename=filename, logger=ConsoleLogger())
+    target.table_name = BENCHMARK_TABLE
+    target.migrate_from_postgresql(source, [name for name in COLUMN_NAMES if name != "id"])
+    return target
+
+
+def table_rows(db):
+    return db.execute(f"SELECT * FROM {BENCHMARK_TABLE} ORDER BY id").fetchall()
+
+
+def test_export_keeps_source_ids_in_every_mode(source, tmp_path, monkeypatch):
+    single = export(source, str(tmp_path / "single.db"), 1, monkeypatch)
+    parallel = export(source, str(tmp_path / "parallel.db"), 3, monkeypatch)
+    source_ids = [row[0] for row in source.db.execute(f"SELECT id FROM {BENCHMARK_TABLE} ORDER BY id")]
+    assert [row[0] for row in table_rows(single.db)] == source_ids
+    assert table_rows(single.db) == table_rows(parallel.db)
+
+
+def test_verify_after_default_export(source, tmp_path, monkeypatch):
+    target = export(source, str(tmp_path / "target.db"), 1, monkeypatch)
+    stats = target.verify_against_postgresql(source)
+    assert stats.ok, str(stats)
+    target.db.execute(f"UPDATE {BENCHMARK_TABLE} SET price = price + 1 WHERE id = 2")
+    target.db.execute(f"DELETE FROM {BENCHMARK_TABLE} WHERE id = 3")
+    target.db.commit()
+    stats = target.verify_against_postgresql(source)
+    assert (stats.changed_ids, stats.missing_ids, stats.extra_ids) == ([2], [3], [])
+
+
+def test_bulk_load_restores_journal_mode(source, tmp_path, monkeypatch):
+    target = export(source, str(tmp_path / "target.db"), 1, monkeypatch)
+    assert target.db.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    monkeypatch.setitem(MIGRATION, "sqlite_journal_mode", "OFF")
+    with pytest.raises(ValueError):
+        target.migrate_from_postgresql(source, ["price"])
+    assert len(table_rows(target.db)) == len(table_rows(source.db))
+
+
+@pytest.mark.parametrize("staging, publish", [("memory", "backup"), ("file", "vacuum")])
+def test_staged_export_publishes_same_table(source, tmp_path, monkeypatch, staging, publish):
+    direct = export(source, str(tmp_path / "direct.db"), 1, monkeypatch)
+    monkeypatch.setitem(MIGRATION, "sqlite_staging", staging)
+    monkeypatch.setitem(MIGRATION, "sqlite_publish", publish)
+    staged = export(source, str(tmp_path / "staged.db"), 1, monkeypatch)
+    assert table_rows(staged.db) == table_rows(direct.db)
+    assert sorted(path.name for path in tmp_path.iterdir() if path.name.startswith("staged")) == ["staged.db"]
+
+
+@pytest.mark.parametrize("fields", [["price", "id", "program_name"], ["price", "program_name"]])
+def test_sync_with_id_in_any_position(source, tmp_path, fields):
+    target = DatabaseSQLite(filename=str(tmp_path / "target.db"), logger=ConsoleLogger())
+    target.table_name = BENCHMARK_TABLE
+    target.sync_from_postgresql(source, fields)
+    source.db.execute(f"UPDATE {BENCHMARK_TABLE} SET price = -1 WHERE id = 2")
+    source.db.execute(f"DELETE FROM {BENCHMARK_TABLE} WHERE id = 3")
+    source.db.commit()
+    stats = target.sync_from_postgresql(source, fields)
+    assert 0 < stats.rows < ROWS
+    columns = ", ".join(["id"] + [field for field in fields if field != "id"])
+    query = f"SELECT {columns} FROM {BENCHMARK_TABLE} ORDER BY id"
+    assert target.db.execute(query).fetchall() == source.db.execute(query).fetchall()
+
+
+def test_bulk_load_restores_connection_pragmas(tmp_path):
+    target = DatabaseSQLite(filename=str(tmp_path / "target.db"), logger=ConsoleLogger())
+    target.db.execute("PRAGMA synchronous=NORMAL")
+    target.db.execute("PRAGMA cache_size=-4096")
+    pragmas = ("journal_mode", "synchronous", "cache_size", "temp_store")
+    before = [target.db.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in pragmas]
+    with target.bulk_load_mode():
+        assert target.db.execute("PRAGMA synchronous").fetchone()[0] == 0
+    assert [target.db.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in pragmas] == before
+
+
+class RecordingLogger(ConsoleLogger):
+    def __init__(self):
+        super().__init__()
+        self.warnings = []
+
+    def log(self, message, tag="INFO"):
+        if tag == "WARNING":
+            self.warnings.append(message)
+
+
+def test_sync_checkpoints_do_not_depend_on_chunk_size(source, tmp_path, monkeypatch):
+    logger = RecordingLogger()
+    target = DatabaseSQLite(filename=str(tmp_path / "target.db"), logger=logger)
+    target.table_name = BENCHMARK_TABLE
+    fields = ["price", "program_name"]
+    target.sync_from_postgresql(source, fields)
+    monkeypatch.setitem(MIGRATION, "chunk_size", 123)
+    assert target.sync_from_postgresql(source, fields).rows == 0
+    assert logger.warnings == []
+    #   Інший розмір блоку робить збережені контрольні точки недійсними
+    monkeypatch.setitem(MIGRATION, "sync_bucket_size", 500)
+    assert target.sync_from_postgresql(source, fields).rows == len(table_rows(source.db))
+    assert len(logger.warnings) == 1
@@ -1,32 +1,87 @@
-def is_number(n):
-    """Перевірка на числове значення"""
-    try:
-        float(n)
-    except ValueError:
-        return False
-    return True
-
-def sql_query_field_names(column_names, id_index, with_id_field=True):
-    """Назви полів у SQL формат"""
-    sql_query = ""
-    for i, column_name in enumerate(column_names):
-        if not with_id_field and i == id_index:
-            continue
-        sql_query = sql_query + column_name
-        if not i + 1 == len(column_names):
-            sql_query = sql_query + ", "
-    return sql_query
-
-def sql_query_values(field_values, id_index, column_types, str_to_sql_typo, with_id_field=True):
-    """Значення полів у SQL формат"""
-    sql_query = ""
-    for i, field_value in enumerate(field_values):
-        if not with_id_field and i == id_index:
-            continue
-        sql_query = sql_query + str_to_sql_typo(field_value, column_types[i])
-        if not i + 1 == len(field_values):
-            sql_query = sql_query + ", "
-    return sql_query
+#   Стовпці з B-деревом (стовпець, id) для фільтрів та сортування і текстові стовпці для пошуку
+INDEXED_COLUMNS = ("price", "rating")
+SEARCH_COLUMNS = ("program_name", "program_description")
+
+
+class RowFilter:
+    """Фільтр, пошук та сортування рядків таблиці, що виконуються на сервері"""
+    def __init__(self, range_column="price", range_min=None, range_max=None, search="", sort_column="id",
+                 descending=False):
+        self.range_column = range_column
+        self.range_min = range_min
+        self.range_max = range_max
+        #   Підрядок для пошуку в текстових полях
+        self.search = search
+        self.sort_column = sort_column
+        self.descending = descending
+
+    @property
+    def is_default(self):
+        """Без фільтрів, рядки впорядковані за зростанням id"""
+        return self.range_min is None and self.range_max is None and not self.search \
+            and self.sort_column == "id" and not self.descending
+
+    @property
+    def key(self):
+        """Незмінне подання фільтра для ключів кешу сторінок"""
+        return self.range_column, self.range_min, self.range_max, self.search, self.sort_column, self.descending
+
+    @property
+    def columns(self):
+        """Стовпці, від значень яких залежить, які рядки і в якому порядку потрапляють на сторінку"""
+        columns = {self.sort_column}
+        if self.range_min is not None or self.range_max is not None:
+            columns.add(self.range_column)
+        if self.search:
+            columns.update(SEARCH_COLUMNS)
+        return columns
+
+
+def like_pattern(text: str):
+    """Шаблон LIKE для пошуку підрядка (символи шаблону екрануються знаком !)"""
+    return "%" + text.replace("!", "!!").replace("%", "!%").replace("_", "!_") + "%"
+
+
+def page_query(table_name, column_names, row_filter: RowFilter | None, after_row, limit, placeholder="%s",
+               search_condition=None, nulls_low=True):
+    """Запит наступної сторінки рядків з фільтром та сортуванням (keyset-пагінація по (стовпець, id)).
+    after_row - останній завантажений рядок; search_condition(text) повертає умову пошуку та її параметри;
+    nulls_low - NULL менший за будь-яке значення (MySQL, SQLite), інакше більший (PostgreSQL)"""
+    row_filter = row_filter if row_filter is not None else RowFilter()
+    p = placeholder
+    conditions = []
+    params = []
+    if row_filter.range_min is not None:
+        conditions.append(f"{row_filter.range_column} >= {p}")
+        params.append(row_filter.range_min)
+    if row_filter.range_max is not None:
+        conditions.append(f"{row_filter.range_column} <= {p}")
+        params.append(row_filter.range_max)
+    if row_filter.search and search_condition is not None:
+        search_sql, search_params = search_condition(row_filter.search)
+        conditions.append(f"({search_sql})")
+        params.extend(search_params)
+    column = row_filter.sort_column
+    direction, compare = ("DESC", "<") if row_filter.descending else ("ASC", ">")
+    if after_row is not None:
+        value = after_row[column_names.index(column)]
+        field_id = after_row[column_names.index("id")]
+        #   Чи йдуть NULL після всіх значень у вибраному напрямку сортування
+        nulls_after = nulls_low == row_filter.descending
+        if column == "id":
+            conditions.append(f"id {compare} {p}")
+            params.append(field_id)
+        elif value is None:
+            conditions.append(f"({column} IS NULL AND id {compare} {p}"
+                              f"{'' if nulls_after else f' OR {column} IS NOT NULL'})")
+            params.append(field_id)
+        else:
+            conditions.append(f"(({column}, id) {compare} ({p}, {p}){f' OR {column} IS NULL' if nulls_after else ''})")
+            params.extend([value, field_id])
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    order = f"id {direction}" if column == "id" else f"{column} {direction}, id {direction}"
+    params.append(limit)
+    return f"SELECT * FROM {table_name}{where} ORDER BY {order} LIMIT {p}", tuple(params)
 
 
 def connector_decorator(func):
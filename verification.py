@@ -0,0 +1,147 @@
+#   Перевірка копії таблиці: контрольні суми діапазонів id обчислюються на обох серверах, а неспівпадаючі
+#   діапазони діляться на менші, доки не залишаться окремі рядки. По мережі передаються лише суми
+import hashlib
+
+from config import VERIFICATION
+from converters import INTEGER, FLOAT, BOOLEAN, TEXT
+from migration import MigrationStats
+
+#   Рядок для хешу: значення стовпців через '|', NULL - \N, логічні значення - 0 та 1,
+#   дійсні числа округлюються до float_digits знаків (FLOAT MySQL має одинарну точність)
+ROW_SEPARATOR = "|"
+NULL_TEXT = "\\N"
+#   Хеш рядка - перші 15 шістнадцяткових цифр MD5 (60 біт), тож він додатний в усіх БД,
+#   а сума хешів діапазону обчислюється точно (DECIMAL у MySQL, numeric у PostgreSQL)
+HASH_DIGITS = 15
+
+
+def verify_kind(source_kind, target_kind):
+    """Спільний вид стовпця для хешування: цілі та логічні значення хешуються однаково"""
+    kinds = {source_kind, target_kind}
+    if TEXT in kinds:
+        return TEXT
+    if FLOAT in kinds:
+        return FLOAT
+    return INTEGER
+
+
+def canonical_value(value, kind, float_digits):
+    """Текст значення для хешу, такий самий, як у SQL-виразах MySQL та PostgreSQL"""
+    if value is None:
+        return NULL_TEXT
+    if kind == FLOAT:
+        return str(int(round(float(value) * 10 ** float_digits)))
+    if kind in (INTEGER, BOOLEAN):
+        return str(int(value))
+    return value if isinstance(value, str) else str(value)
+
+
+def row_hash(values, kinds, float_digits):
+    """Хеш рядка для БД без MD5 на сервері (SQLite)"""
+    text = ROW_SEPARATOR.join(canonical_value(value, kind, float_digits) for value, kind in zip(values, kinds))
+    return int(hashlib.md5(text.encode()).hexdigest()[:HASH_DIGITS], 16)
+
+
+class HashSum:
+    """Агрегатна функція SQLite: точна сума хешів, яка не переповнює 64-бітні цілі SQLite"""
+    def __init__(self):
+        self.total = 0
+
+    def step(self, value):
+        self.total += value
+
+    def finalize(self):
+        return str(self.total)
+
+
+class VerificationStats(MigrationStats):
+    """Результат перевірки: кількість рядків джерела, обмін сумами та знайдені відмінності"""
+    def __init__(self):
+        super(VerificationStats, self).__init__()
+        self.target_rows = 0
+        self.queries = 0
+        #   Кількість контрольних сум, отриманих з обох БД
+        self.checksums = 0
+        self.missing_ids = []
+        self.extra_ids = []
+        self.changed_ids = []
+        #   Пошук зупинено після max_differences відмінностей
+        self.truncated = False
+
+    @property
+    def differences(self):
+        return len(self.missing_ids) + len(self.extra_ids) + len(self.changed_ids)
+
+    @property
+    def ok(self):
+        return self.differences == 0 and self.rows == self.target_rows
+
+    def __str__(self):
+        summary = f"{self.rows} source rows, {self.target_rows} target rows checked with {self.checksums} checksums " \
+                  f"in {self.queries} queries, {self.elapsed:.2f}s"
+        if self.ok:
+            return f"tables match: {summary}"
+        more = " (search stopped, more differences possible)" if self.truncated else ""
+        return f"tables differ: {summary}; missing ids {self.missing_ids[:20]}, extra ids {self.extra_ids[:20]}, " \
+               f"changed ids {self.changed_ids[:20]}{more}"
+
+
+def combined_id_range(*id_ranges):
+    """Півінтервал [low, high), що охоплює id обох таблиць; (None, None), якщо обидві порожні"""
+    bounds = [id_range for id_range in id_ranges if id_range and id_range[0] is not None]
+    if not bounds:
+        return None, None
+    return min(low for low, _ in bounds), max(high for _, high in bounds) + 1
+
+
+def verify_ranges(read_source, read_target, id_range, on_chunk=None) -> VerificationStats:
+    """Порівняння контрольних сум. read_source(low, high, step) та read_target(...) повертають
+    {номер блоку: (кількість рядків, сума хешів)} для id з [low, high), згрупованих по step id;
+    блоки з кроком 1 - це окремі рядки"""
+    fanout = VERIFICATION["fanout"]
+    leaf_rows = VERIFICATION["leaf_rows"]
+    max_differences = VERIFICATION["max_differences"]
+    stats = VerificationStats()
+    low, high = id_range
+    if low is None:
+        stats.finish()
+        return stats
+    pending = [(low, high)]
+    step = max(VERIFICATION["bucket_size"], 1)
+    first_level = True
+    while pending:
+        next_pending = []
+        for range_low, range_high in pending:
+            with stats.phase("source"):
+                source = read_source(range_low, range_high, step)
+            with stats.phase("target"):
+                target = read_target(range_low, range_high, step)
+            stats.queries += 2
+            stats.checksums += len(source) + len(target)
+            if first_level:
+                stats.add(sum(count for count, _ in source.values()))
+                stats.target_rows += sum(count for count, _ in target.values())
+            for bucket in sorted(source.keys() | target.keys()):
+                if source.get(bucket) == target.get(bucket):
+                    continue
+                bucket_low = range_low + bucket * step
+                if step > 1:
+                    next_pending.append((bucket_low, min(bucket_low + step, range_high)))
+                elif bucket not in target:
+                    stats.missing_ids.append(bucket_low)
+                elif bucket not in source:
+                    stats.extra_ids.append(bucket_low)
+                else:
+                    stats.changed_ids.append(bucket_low)
+            if on_chunk is not None:
+                on_chunk(stats)
+            if stats.differences >= max_differences:
+                stats.truncated = True
+                stats.finish()
+                return stats
+        first_level = False
+        pending = next_pending
+        #   Діапазони до leaf_rows рядків порівнюються вже по рядках
+        step = step // fanout if step // fanout > leaf_rows else 1
+    stats.finish()
+    return stats